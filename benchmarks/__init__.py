@@ -0,0 +1,28 @@
+"""Micro-benchmarks for hot paths of the ``contextvars_registry`` package.
+
+The benchmarks measure the per-call overhead of :class:`ContextVarDescriptor`
+and :class:`ContextVarsRegistry` operations, next to the raw :class:`contextvars.ContextVar`,
+:class:`threading.local` and plain Python attributes (these are here as reference points).
+
+Usage::
+
+    # run all benchmarks, and print results
+    python -m benchmarks
+
+    # run only benchmarks with "registry" in the name
+    python -m benchmarks -k registry
+
+    # save results as a baseline (e.g., before upgrading the package)
+    python -m benchmarks --save baseline.json
+
+    # compare the current results against the saved baseline
+    # (exits with non-zero status if some benchmark got slower than the threshold)
+    python -m benchmarks --compare baseline.json --threshold 0.15
+
+``benchmarks/baseline.json`` contains results of the original (not yet optimized) version
+of the package, that were used as the reference point for later optimizations.
+Absolute numbers depend on the machine, so re-run the baseline on your machine
+(``git checkout`` the version, and ``--save`` it) for precise comparisons.
+
+Benchmarks of integrations (Flask, gevent) are skipped when these packages are not installed.
+"""
@@ -0,0 +1,71 @@
+"""Command-line entry point: ``python -m benchmarks --help``."""
+
+import argparse
+import importlib
+import sys
+from typing import List, Optional
+
+# Modules with benchmarks. They register benchmarks on import.
+import benchmarks.bench_context_management  # noqa: F401
+import benchmarks.bench_context_pool  # noqa: F401
+import benchmarks.bench_descriptor  # noqa: F401
+import benchmarks.bench_executors  # noqa: F401
+import benchmarks.bench_queues  # noqa: F401
+import benchmarks.bench_registry  # noqa: F401
+from benchmarks.runner import (
+    BENCHMARKS,
+    compare_results,
+    load_results,
+    run_benchmarks,
+    save_results,
+)
+
+# Benchmarks of integrations, and optional packages they need (they're skipped if missing).
+OPTIONAL_BENCHMARK_MODULES = {
+    "benchmarks.bench_flask": "flask",
+    "benchmarks.bench_gevent": "gevent",
+}
+
+for _module_name, _package_name in OPTIONAL_BENCHMARK_MODULES.items():
+    try:
+        importlib.import_module(_module_name)
+    except ModuleNotFoundError as _err:
+        if _err.name != _package_name:
+            raise
+        print(f"skipping {_module_name}: {_package_name} is not installed", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:  # noqa: D103
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument(
+        "-k", "--filter", default="", help="run only benchmarks that contain this substring"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="number of timing rounds")
+    parser.add_argument("--save", metavar="PATH", help="save results to a JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare with a saved JSON baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="relative slowdown treated as a regression when comparing (default: 0.10)",
+    )
+    args = parser.parse_args(argv)
+
+    selected = [bench for name, bench in BENCHMARKS.items() if args.filter in name]
+    results = run_benchmarks(selected, repeat=args.repeat)
+
+    if args.save:
+        save_results(args.save, results)
+
+    if args.compare:
+        print()
+        regressions = compare_results(load_results(args.compare), results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,18 @@
+"""Benchmarks for context_management helpers."""
+
+import itertools
+from contextvars import copy_context
+
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry.context_management import bind_generator_to_context
+
+
+@benchmark("reference: next(generator)", stmt="next(generator)")
+def _setup_plain_generator() -> Namespace:
+    return {"generator": (item for item in itertools.count())}
+
+
+@benchmark("next(bind_generator_to_context(generator))", stmt="next(generator)")
+def _setup_bound_generator() -> Namespace:
+    generator = (item for item in itertools.count())
+    return {"generator": bind_generator_to_context(generator, copy_context())}
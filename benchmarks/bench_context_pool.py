@@ -0,0 +1,29 @@
+"""Benchmarks for ContextPool, compared with running each task in a fresh context."""
+
+import json
+from contextvars import Context
+
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry import ContextVarDescriptor, ContextVarsRegistry
+from contextvars_registry.context_pool import ContextPool
+
+# A moderately expensive deferred default (like parsing a config file).
+CONFIG_JSON = json.dumps({f"option_{i}": list(range(10)) for i in range(100)})
+
+
+class ConfigVars(ContextVarsRegistry):
+    config = ContextVarDescriptor(deferred_default=lambda: json.loads(CONFIG_JSON))
+
+
+def _task() -> object:
+    return ConfigVars.config.get()
+
+
+@benchmark("reference: Context().run(task)", stmt="Context().run(task)")
+def _setup_fresh_context() -> Namespace:
+    return {"Context": Context, "task": _task}
+
+
+@benchmark("context_pool.run(task)", stmt="pool.run(task)")
+def _setup_context_pool() -> Namespace:
+    return {"pool": ContextPool(ConfigVars()), "task": _task}
@@ -0,0 +1,141 @@
+"""Benchmarks for ContextVarDescriptor methods, and reference points to compare them with."""
+
+import threading
+from contextvars import Context, ContextVar
+
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry import ContextVarDescriptor, ContextVarsRegistry
+from contextvars_registry.context_vars_registry import seal_context_vars_registry
+
+# Reference points: the fastest things we can compare the descriptor with.
+
+
+@benchmark("reference: plain attribute get", stmt="obj.timezone")
+def _setup_plain_attribute() -> Namespace:
+    class Obj:
+        timezone = "UTC"
+
+    return {"obj": Obj()}
+
+
+@benchmark("reference: threading.local attribute get", stmt="local.timezone")
+def _setup_threading_local() -> Namespace:
+    local = threading.local()
+    local.timezone = "UTC"
+    return {"local": local}
+
+
+@benchmark("reference: ContextVar.get()", stmt="var.get()")
+def _setup_context_var_get() -> Namespace:
+    var: ContextVar[str] = ContextVar("var")
+    var.set("UTC")
+    return {"var": var}
+
+
+@benchmark("reference: ContextVar.set()", stmt="var.set('UTC')")
+def _setup_context_var_set() -> Namespace:
+    return {"var": ContextVar("var")}
+
+
+# ContextVarDescriptor methods, called directly.
+
+
+def _new_descriptor(kind: str) -> ContextVarDescriptor:
+    if kind == "strict":
+        descriptor: ContextVarDescriptor = ContextVarDescriptor("descriptor", strict=True)
+        descriptor.set("UTC")
+    elif kind == "no default":
+        descriptor = ContextVarDescriptor("descriptor")
+        descriptor.set("UTC")
+    elif kind == "default":
+        descriptor = ContextVarDescriptor("descriptor", default="UTC")
+    else:
+        assert kind == "deferred default"
+        descriptor = ContextVarDescriptor("descriptor", deferred_default=lambda: "UTC")
+    return descriptor
+
+
+for _kind in ("no default", "default", "deferred default", "strict"):
+
+    @benchmark(f"descriptor({_kind}).get()", stmt="descriptor.get()")
+    @benchmark(f"descriptor({_kind}).get(fallback)", stmt="descriptor.get('GMT')")
+    @benchmark(f"descriptor({_kind}).get_raw()", stmt="descriptor.get_raw(None)")
+    @benchmark(f"descriptor({_kind}).is_set()", stmt="descriptor.is_set()")
+    @benchmark(f"descriptor({_kind}).is_gettable()", stmt="descriptor.is_gettable()")
+    def _setup_descriptor(kind: str = _kind) -> Namespace:
+        return {"descriptor": _new_descriptor(kind)}
+
+
+@benchmark("descriptor.set()", stmt="descriptor.set('GMT')")
+@benchmark("descriptor.delete()", stmt="descriptor.delete()")
+@benchmark("descriptor.reset_to_default()", stmt="descriptor.reset_to_default()")
+def _setup_descriptor_write() -> Namespace:
+    return {"descriptor": ContextVarDescriptor("descriptor", default="UTC")}
+
+
+# ContextVarDescriptor used as a registry attribute (via the Python's descriptor protocol).
+
+
+def _new_registry() -> ContextVarsRegistry:
+    class CurrentVars(ContextVarsRegistry):
+        timezone: str = "UTC"
+        locale: str
+
+    current = CurrentVars()
+    current.locale = "en"
+    return current
+
+
+def _new_strict_registry() -> ContextVarsRegistry:
+    class StrictVars(ContextVarsRegistry):
+        _registry_strict = True
+        locale: str
+
+    current = StrictVars()
+    current.locale = "en"
+    return current
+
+
+@benchmark("strict registry attribute get", stmt="current.locale")
+def _setup_strict_registry_attribute() -> Namespace:
+    return {"current": _new_strict_registry()}
+
+
+@benchmark("registry attribute get (default)", stmt="current.timezone")
+@benchmark("registry attribute get (set)", stmt="current.locale")
+@benchmark("registry attribute set", stmt="current.locale = 'en_GB'")
+@benchmark("registry attribute hasattr()", stmt="hasattr(current, 'locale')")
+def _setup_registry_attribute() -> Namespace:
+    return {"current": _new_registry()}
+
+
+@benchmark("sealed registry attribute set", stmt="current.locale = 'en_GB'")
+def _setup_sealed_registry_attribute() -> Namespace:
+    current = _new_registry()
+    seal_context_vars_registry(current.__class__)
+    return {"current": current}
+
+
+@benchmark("registry attribute del+set", stmt="del current.locale; current.locale = 'en'")
+def _setup_registry_attribute_delete() -> Namespace:
+    return {"current": _new_registry()}
+
+
+# The 1st get() in a short-lived context, where the deferred default is expensive.
+
+_EXPENSIVE_DEFAULT = list(range(1000))
+
+
+for _scope in ("context", "thread", "process"):
+
+    @benchmark(
+        f"Context().run(descriptor(deferred_default_scope={_scope}).get)",
+        stmt="Context().run(descriptor.get)",
+    )
+    def _setup_scoped_deferred_default(scope: str = _scope) -> Namespace:
+        descriptor = ContextVarDescriptor(
+            "descriptor",
+            deferred_default=_EXPENSIVE_DEFAULT.copy,
+            deferred_default_scope=scope,  # type: ignore[arg-type]
+        )
+        return {"Context": Context, "descriptor": descriptor}
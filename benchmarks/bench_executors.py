@@ -0,0 +1,119 @@
+"""Benchmarks for ContextVarsThreadPoolExecutor, compared with manually bound tasks."""
+
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench_registry import _new_big_registry
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry.context_management import bind_to_snapshot_context
+from contextvars_registry.context_vars_registry import save_context_vars_registry
+from contextvars_registry.executors import (
+    ContextVarsProcessPoolExecutor,
+    ContextVarsThreadPoolExecutor,
+)
+from contextvars_registry.serialization import (
+    decode_context_vars_registries,
+    encode_context_vars_registries,
+)
+
+# Number of tasks in a map() batch.
+BATCH_SIZE = 100
+
+
+def _task(item: int = 0) -> int:
+    return item
+
+
+@benchmark(
+    "reference: executor.submit(bind_to_snapshot_context(fn))",
+    stmt="executor.submit(bind_to_snapshot_context(task, 1)).result()",
+)
+@benchmark(
+    "reference: executor.map(bind_to_snapshot_context(fn), batch)",
+    stmt="for _ in executor.map(bind_to_snapshot_context(task), batch): pass",
+)
+def _setup_bound_tasks() -> Namespace:
+    return {
+        "executor": ThreadPoolExecutor(max_workers=4),
+        "bind_to_snapshot_context": bind_to_snapshot_context,
+        "task": _task,
+        "batch": range(BATCH_SIZE),
+    }
+
+
+@benchmark("context executor.submit(fn)", stmt="executor.submit(task, 1).result()")
+@benchmark("context executor.map(fn, batch)", stmt="for _ in executor.map(task, batch): pass")
+def _setup_context_executor() -> Namespace:
+    return {
+        "executor": ContextVarsThreadPoolExecutor(max_workers=4),
+        "task": _task,
+        "batch": range(BATCH_SIZE),
+    }
+
+
+@benchmark(
+    "context executor(share_snapshot).map(fn, batch)",
+    stmt="for _ in executor.map(task, batch): pass",
+)
+def _setup_context_executor_shared() -> Namespace:
+    return {
+        "executor": ContextVarsThreadPoolExecutor(max_workers=4, share_snapshot=True),
+        "task": _task,
+        "batch": range(BATCH_SIZE),
+    }
+
+
+# Process pool: only the cost of encoding the context is measured here (no processes started).
+
+
+@benchmark(
+    "reference: pickle.dumps(save_context_vars_registry(registry(big)))",
+    stmt="pickle.dumps(save_context_vars_registry(current))",
+)
+@benchmark("reference: pickle.loads(pickled state of registry(big))", stmt="pickle.loads(data)")
+def _setup_pickled_saved_registry() -> Namespace:
+    current = _new_big_registry()
+    current.update(field_0=0, field_10=10, field_20=20)
+    return {
+        "pickle": pickle,
+        "save_context_vars_registry": save_context_vars_registry,
+        "current": current,
+        "data": pickle.dumps(save_context_vars_registry(current)),
+    }
+
+
+# Registry classes are encoded by reference, so the class must be importable from this module.
+BigVars = type(_new_big_registry(__module__=__name__))
+
+
+@benchmark(
+    "encode_context_vars_registries([registry(big)])",
+    stmt="encode_context_vars_registries(registries)",
+)
+@benchmark(
+    "decode_context_vars_registries(encoded registry(big))",
+    stmt="decode_context_vars_registries(data)",
+)
+def _setup_encoded_registry() -> Namespace:
+    current = BigVars()
+    current.update(field_0=0, field_10=10, field_20=20)
+    return {
+        "encode_context_vars_registries": encode_context_vars_registries,
+        "decode_context_vars_registries": decode_context_vars_registries,
+        "registries": [current],
+        "data": encode_context_vars_registries([current]),
+    }
+
+
+@benchmark("process executor payload, registry(big), cached", stmt="executor._get_payload()")
+@benchmark(
+    "process executor payload, registry(big), changed",
+    stmt="current['field_0'] = object(); executor._get_payload()",
+)
+def _setup_process_executor_payload() -> Namespace:
+    current = BigVars()
+    current.update(field_0=0, field_10=10, field_20=20)
+    return {
+        "current": current,
+        "executor": ContextVarsProcessPoolExecutor(registries=[current]),
+    }
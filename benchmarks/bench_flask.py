@@ -0,0 +1,31 @@
+"""Benchmarks for the Flask integration, compared with ``flask.g``."""
+
+import flask
+
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.integrations.flask import RequestGlobals
+
+
+class RequestVars(ContextVarsRegistry):
+    user_id: int
+
+
+@benchmark("reference: flask.g attribute get", stmt="g.user_id")
+@benchmark("reference: flask.g attribute set", stmt="g.user_id = 42")
+def _setup_flask_g() -> Namespace:
+    app = flask.Flask(__name__)
+    app.app_context().push()  # never popped: the benchmark runs in its own Context
+    flask.g.user_id = 42
+    return {"g": flask.g}
+
+
+@benchmark("RequestGlobals attribute get", stmt="g.user_id")
+@benchmark("RequestGlobals attribute set", stmt="g.user_id = 42")
+def _setup_request_globals() -> Namespace:
+    app = flask.Flask(__name__)
+    g = RequestVars()
+    RequestGlobals(g, app)
+    app.app_context().push()
+    g.user_id = 42
+    return {"g": g}
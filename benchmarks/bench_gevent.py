@@ -0,0 +1,28 @@
+"""Benchmarks for the gevent integration, compared with manually bound greenlets."""
+
+import gevent
+
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry.context_management import bind_to_snapshot_context
+from contextvars_registry.integrations.gevent import spawn
+
+
+def _task() -> None:
+    pass
+
+
+@benchmark(
+    "reference: gevent.spawn(bind_to_snapshot_context(fn)).join()",
+    stmt="gevent_spawn(bind_to_snapshot_context(task)).join()",
+)
+def _setup_bound_greenlet() -> Namespace:
+    return {
+        "gevent_spawn": gevent.spawn,
+        "bind_to_snapshot_context": bind_to_snapshot_context,
+        "task": _task,
+    }
+
+
+@benchmark("context greenlet spawn(fn).join()", stmt="spawn(task).join()")
+def _setup_context_greenlet() -> Namespace:
+    return {"spawn": spawn, "task": _task}
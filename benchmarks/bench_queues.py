@@ -0,0 +1,36 @@
+"""Benchmarks for ContextQueue, compared with the plain queue.Queue."""
+
+import queue
+
+from benchmarks.bench_registry import _new_big_registry
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry.queues import ContextQueue
+
+
+@benchmark("reference: queue.put(item); queue.get()", stmt="items.put(1); items.get()")
+def _setup_plain_queue() -> Namespace:
+    return {"items": queue.Queue()}
+
+
+@benchmark(
+    "context queue.put(item); queue.get(), registry(big) unchanged",
+    stmt="items.put(1); items.get()",
+)
+@benchmark(
+    "context queue.put(item); queue.handle_next(fn), registry(big) unchanged",
+    stmt="items.put(1); items.handle_next(handler)",
+)
+def _setup_context_queue() -> Namespace:
+    current = _new_big_registry()
+    current.update(field_0=0, field_10=10, field_20=20)
+    return {"items": ContextQueue(), "handler": str}
+
+
+@benchmark(
+    "context queue.put(item); queue.get(), registry(big) changed",
+    stmt="current.field_0 = object(); items.put(1); items.get()",
+)
+def _setup_context_queue_changed() -> Namespace:
+    current = _new_big_registry()
+    current.update(field_0=0, field_10=10, field_20=20)
+    return {"items": ContextQueue(), "current": current}
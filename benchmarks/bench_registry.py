@@ -0,0 +1,101 @@
+"""Benchmarks for ContextVarsRegistry as a MutableMapping (dict-like methods)."""
+
+from typing import Any, Dict
+
+from benchmarks.runner import Namespace, benchmark
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_vars_registry import (
+    restore_context_vars_registry,
+    save_context_vars_registry,
+)
+
+# Number of declared fields in the "big" registry (only 3 of them are set).
+BIG_REGISTRY_SIZE = 60
+
+
+def _new_small_registry() -> ContextVarsRegistry:
+    class SmallVars(ContextVarsRegistry):
+        locale: str = "en"
+        timezone: str = "UTC"
+        user_id: int
+
+    current = SmallVars()
+    current.user_id = 42
+    return current
+
+
+def _new_big_registry(**registry_settings: Any) -> ContextVarsRegistry:
+    # Equivalent of:
+    #   class BigVars(ContextVarsRegistry):
+    #       <registry_settings>
+    #       field_0: Any
+    #       field_1: Any
+    #       ...
+    annotations: Dict[str, Any] = {f"field_{i}": Any for i in range(BIG_REGISTRY_SIZE)}
+    big_vars_cls: Any = type(
+        "BigVars",
+        (ContextVarsRegistry,),
+        {"__annotations__": annotations, **registry_settings},
+    )
+
+    current: ContextVarsRegistry = big_vars_cls()
+    current["field_0"] = 0
+    current["field_10"] = 10
+    current["field_20"] = 20
+    return current
+
+
+for _size, _new_registry in (("small", _new_small_registry), ("big", _new_big_registry)):
+    _key = "user_id" if _size == "small" else "field_10"
+
+    @benchmark(f"registry({_size})[key]", stmt=f"current[{_key!r}]")
+    @benchmark(f"registry({_size})[key] = value", stmt=f"current[{_key!r}] = 1")
+    @benchmark(f"registry({_size}).get(key)", stmt=f"current.get({_key!r})")
+    @benchmark(f"key in registry({_size})", stmt=f"{_key!r} in current")
+    @benchmark(f"iter(registry({_size}))", stmt="for _ in current: pass")
+    @benchmark(f"len(registry({_size}))", stmt="len(current)")
+    @benchmark(f"dict(registry({_size}))", stmt="dict(current)")
+    @benchmark(f"registry({_size}).items()", stmt="for _ in current.items(): pass")
+    @benchmark(f"registry({_size}).update(...)", stmt=f"current.update({_key}=1)")
+    @benchmark(f"with registry({_size})(...)", stmt=f"with current({_key}=1): pass")
+    def _setup_registry(new_registry=_new_registry) -> Namespace:
+        return {"current": new_registry()}
+
+
+for _size, _new_registry in (("small", _new_small_registry), ("big", _new_big_registry)):
+
+    @benchmark(
+        f"save+restore registry({_size})",
+        stmt="restore_context_vars_registry(current, save_context_vars_registry(current))",
+    )
+    @benchmark(f"snapshot+restore registry({_size})", stmt="current.restore(current.snapshot())")
+    def _setup_save_restore(new_registry=_new_registry) -> Namespace:
+        return {
+            "current": new_registry(),
+            "save_context_vars_registry": save_context_vars_registry,
+            "restore_context_vars_registry": restore_context_vars_registry,
+        }
+
+
+@benchmark("registry(big, packed)[key]", stmt="current['field_10']")
+@benchmark("registry(big, packed)[key] = value", stmt="current['field_10'] = 1")
+@benchmark("dict(registry(big, packed))", stmt="dict(current)")
+@benchmark("snapshot+restore registry(big, packed)", stmt="current.restore(current.snapshot())")
+@benchmark(
+    "save+restore registry(big, packed)",
+    stmt="restore_context_vars_registry(current, save_context_vars_registry(current))",
+)
+def _setup_big_packed_registry() -> Namespace:
+    return {
+        "current": _new_big_registry(_registry_packed=True),
+        "save_context_vars_registry": save_context_vars_registry,
+        "restore_context_vars_registry": restore_context_vars_registry,
+    }
+
+
+@benchmark("registry(big, tracked)[key] = value", stmt="current['field_10'] = 1")
+@benchmark("iter(registry(big, tracked))", stmt="for _ in current: pass")
+@benchmark("len(registry(big, tracked))", stmt="len(current)")
+@benchmark("dict(registry(big, tracked))", stmt="dict(current)")
+def _setup_big_tracked_registry() -> Namespace:
+    return {"current": _new_big_registry(_registry_track_set_fields=True)}
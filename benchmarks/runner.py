@@ -0,0 +1,135 @@
+"""Benchmark runner: registration, timing, JSON baselines and comparison reports."""
+
+import json
+import platform
+import sys
+import timeit
+from contextvars import Context
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, TextIO
+
+Namespace = Dict[str, Any]
+SetupFn = Callable[[], Namespace]
+Results = Dict[str, float]
+
+
+class Benchmark(NamedTuple):
+    """A single benchmark case.
+
+    The ``stmt`` is a Python statement (a string), timed by the :mod:`timeit` module.
+
+    The ``setup`` is a function that prepares objects used by ``stmt``,
+    and returns them as a dict (that becomes global namespace for the ``stmt``).
+
+    The statement is passed as a string (not as a function), because :mod:`timeit`
+    compiles it into the timing loop, so the measurement doesn't include an extra function call.
+    """
+
+    name: str
+    stmt: str
+    setup: SetupFn
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+"""All registered benchmarks, by name (in the order of registration)."""
+
+
+def benchmark(name: str, stmt: str) -> Callable[[SetupFn], SetupFn]:
+    """Register a benchmark (decorator for a setup function).
+
+    Example::
+
+        @benchmark("ContextVar.get()", stmt="var.get()")
+        def _setup():
+            var = ContextVar("var", default=42)
+            return {"var": var}
+    """
+    assert name not in BENCHMARKS, f"Duplicate benchmark name: {name!r}"
+
+    def _register_benchmark(setup: SetupFn) -> SetupFn:
+        BENCHMARKS[name] = Benchmark(name, stmt, setup)
+        return setup
+
+    return _register_benchmark
+
+
+def run_benchmark(bench: Benchmark, repeat: int = 5) -> float:
+    """Run a benchmark, and return the best time of a single call (in nanoseconds).
+
+    Each benchmark is executed in its own empty :class:`contextvars.Context`,
+    so benchmarks can't affect each other (and the caller) via context variables.
+    """
+    return Context().run(_run_benchmark_in_current_context, bench, repeat)
+
+
+def _run_benchmark_in_current_context(bench: Benchmark, repeat: int) -> float:
+    namespace = bench.setup()
+    timer = timeit.Timer(bench.stmt, globals=namespace)
+    number, _ = timer.autorange()
+    timings = timer.repeat(repeat=repeat, number=number)
+    return min(timings) / number * 1e9
+
+
+def run_benchmarks(
+    benchmarks: Iterable[Benchmark], repeat: int = 5, out: TextIO = sys.stdout
+) -> Results:
+    """Run benchmarks, printing progress, and return results as ``{name: nanoseconds}`` dict."""
+    results: Results = {}
+    for bench in benchmarks:
+        results[bench.name] = run_benchmark(bench, repeat)
+        print(f"{bench.name:<60} {results[bench.name]:>10.1f} ns", file=out)
+    return results
+
+
+def save_results(path: str, results: Results) -> None:
+    """Save results as a JSON file (that can be used later as a baseline)."""
+    data = {
+        "meta": {
+            "python": sys.version,
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=2)
+        file.write("\n")
+
+
+def load_results(path: str) -> Results:
+    """Load results previously saved by :func:`save_results`."""
+    with open(path, encoding="utf-8") as file:
+        data = json.load(file)
+    return {name: float(ns) for name, ns in data["results"].items()}
+
+
+def compare_results(
+    baseline: Results,
+    results: Results,
+    threshold: float,
+    out: TextIO = sys.stdout,
+) -> List[str]:
+    """Print a comparison table, and return names of benchmarks that regressed.
+
+    A benchmark is a regression if it got slower than ``baseline * (1 + threshold)``.
+    Benchmarks missing in the baseline are reported, but not treated as regressions.
+    """
+    regressions = []
+
+    print(f"{'benchmark':<60} {'baseline':>10} {'current':>10} {'ratio':>7}", file=out)
+    for name, current_ns in results.items():
+        baseline_ns: Optional[float] = baseline.get(name)
+        if baseline_ns is None:
+            print(f"{name:<60} {'-':>10} {current_ns:>10.1f} {'new':>7}", file=out)
+            continue
+
+        ratio = current_ns / baseline_ns
+        mark = ""
+        if ratio > 1 + threshold:
+            mark = "  <-- REGRESSION"
+            regressions.append(name)
+        print(
+            f"{name:<60} {baseline_ns:>10.1f} {current_ns:>10.1f} {ratio:>7.2f}{mark}",
+            file=out,
+        )
+
+    return regressions
@@ -1,11 +1,15 @@
 """Tools for manual context management."""
 
 import asyncio
+from concurrent.futures import Executor
 from contextvars import Context, copy_context
 from functools import partial, wraps
-from typing import Callable, Coroutine, TypeVar
+from inspect import isasyncgenfunction, iscoroutinefunction, isgeneratorfunction
+from typing import Any, AsyncGenerator, Callable, Coroutine, Generator, Optional, TypeVar
 
 _ReturnT = TypeVar("_ReturnT")
+_YieldT = TypeVar("_YieldT")
+_SendT = TypeVar("_SendT")
 
 
 def bind_to_snapshot_context(
@@ -152,8 +156,13 @@ def bind_to_snapshot_context(
 
     snapshot_ctx = copy_context()
 
+    # Coroutines and generators need their whole body (not just the call) to run in the context.
+    async_or_generator_wrapper = _bind_async_or_generator_function(fn, snapshot_ctx.copy)
+    if async_or_generator_wrapper is not None:
+        return async_or_generator_wrapper
+
     @wraps(fn)
-    def _wrapper__bind_to_snapshot_context(*arg, **kwargs) -> _ReturnT:
+    def _wrapper__bind_to_snapshot_context(*args, **kwargs) -> _ReturnT:
         # Each function call receives its own isolated copy of the snapshot.
         # This may not always be what you want, but this id done due to the Principle of Least
         # Astonishment: if you spawn N threads, you don't want them to have the shared context.
@@ -206,6 +215,11 @@ def bind_to_empty_context(fn: Callable[..., _ReturnT], *args, **kwargs) -> Calla
     # Use functools.partial() if args/kwargs passed.
     fn = _partial(fn, *args, **kwargs)
 
+    # Coroutines and generators need their whole body (not just the call) to run in the context.
+    async_or_generator_wrapper = _bind_async_or_generator_function(fn, Context)
+    if async_or_generator_wrapper is not None:
+        return async_or_generator_wrapper
+
     @wraps(fn)
     def _wrapper__bind_to_empty_context(*args, **kwargs) -> _ReturnT:
         empty_context = Context()
@@ -264,10 +278,37 @@ def bind_to_sandbox_context(
     This is also useful for unit tests, where you need to isolate tests from each other.
     Just decorate test with ``@bind_to_sandbox_context``, and then all changes made to context
     variables become local to the test.
+
+    It also works with ``async def`` functions. In that case, the whole coroutine body
+    (not only creation of the coroutine object) runs in the sandbox context,
+    without spawning an extra :class:`asyncio.Task` (see :func:`run_coroutine_in_context`)::
+
+        >>> from asyncio import run
+
+        >>> @bind_to_sandbox_context
+        ... async def modify_and_print_current_vars_async():
+        ...     current.timezone = 'Antarctica/Troll'
+        ...     print_current_vars()
+
+        >>> run(modify_and_print_current_vars_async())
+        {'timezone': 'Antarctica/Troll'}
+
+        >>> print_current_vars()
+        {'timezone': 'GMT'}
+
+    Generator functions (both sync and ``async``) are handled in a similar way: each step of the
+    generator runs in the sandbox context (see :func:`bind_generator_to_context`).
+
+    The same applies to :func:`bind_to_snapshot_context` and :func:`bind_to_empty_context`.
     """
     # Use functools.partial() if args/kwargs passed.
     fn = _partial(fn, *args, **kwargs)
 
+    # Coroutines and generators need their whole body (not just the call) to run in the context.
+    async_or_generator_wrapper = _bind_async_or_generator_function(fn, copy_context)
+    if async_or_generator_wrapper is not None:
+        return async_or_generator_wrapper
+
     @wraps(fn)
     def _wrapper__bind_to_sandbox_context(*args, **kwargs) -> _ReturnT:
         sandbox_context = copy_context()
@@ -289,6 +330,262 @@ def _partial(fn: Callable[..., _ReturnT], *args, **kwargs) -> Callable[..., _Ret
     return fn
 
 
+def _bind_async_or_generator_function(
+    fn: Callable[..., Any], new_context: Callable[[], Context]
+) -> Optional[Callable[..., Any]]:
+    # Wrap coroutine/generator function, so that its body runs in a new context
+    # (created by the ``new_context`` factory on each call).
+    # Returns None for regular functions (they're wrapped by the caller).
+    if iscoroutinefunction(fn):
+
+        @wraps(fn)
+        async def _wrapper__bind_coroutine_function(*args, **kwargs):
+            return await run_coroutine_in_context(fn(*args, **kwargs), new_context())
+
+        return _wrapper__bind_coroutine_function
+
+    if isgeneratorfunction(fn):
+
+        @wraps(fn)
+        def _wrapper__bind_generator_function(*args, **kwargs):
+            return bind_generator_to_context(fn(*args, **kwargs), new_context())
+
+        return _wrapper__bind_generator_function
+
+    if isasyncgenfunction(fn):
+
+        @wraps(fn)
+        def _wrapper__bind_async_generator_function(*args, **kwargs):
+            return bind_async_generator_to_context(fn(*args, **kwargs), new_context())
+
+        return _wrapper__bind_async_generator_function
+
+    return None
+
+
+def run_coroutine_in_context(
+    coro: Coroutine[Any, Any, _ReturnT], context: Context
+) -> Coroutine[Any, Any, _ReturnT]:
+    """Make the whole coroutine run in the given context.
+
+    :returns: A coroutine object that drives the original ``coro``,
+              and performs each step of it (``send()``/``throw()``) inside the ``context``.
+
+    The problem with coroutines is that they don't have their own context:
+    the body of a coroutine runs in the context of whoever awaits it.
+    So, calling a coroutine function inside :meth:`contextvars.Context.run`
+    is useless: it only creates the coroutine object, and the body runs later, outside of the
+    context.
+
+    The usual workaround is to wrap the coroutine with :class:`asyncio.Task`
+    (that has its own context), but that costs a round trip through the event loop scheduler.
+
+    This function does the same without a Task: it just enters the context for each step::
+
+        >>> from asyncio import run
+        >>> from contextvars import copy_context
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import run_coroutine_in_context
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+
+        >>> async def set_locale(locale):
+        ...     current.locale = locale
+        ...     return current.locale
+
+        >>> async def main():
+        ...     print(await run_coroutine_in_context(set_locale('nb'), copy_context()))
+        ...     print(current.locale)
+
+        >>> run(main())
+        nb
+        en
+
+    The returned object is a regular :class:`collections.abc.Coroutine`,
+    so it can also be passed to :func:`asyncio.create_task`, :func:`asyncio.gather`, etc.
+
+    The context must not be entered by anything else while the coroutine is running
+    (so normally, you pass a fresh copy of a context here).
+    """
+    return _CoroutineInContext(coro, context)
+
+
+class _CoroutineInContext(Coroutine[Any, Any, Any]):
+    # The driver returned by run_coroutine_in_context().
+    #
+    # An object (and not a generator-based coroutine), because each step is just one
+    # Context.run() call here, and because asyncio.create_task() accepts only real coroutines.
+    __slots__ = ("coro", "context")
+
+    def __init__(self, coro: Coroutine, context: Context) -> None:
+        self.coro = coro
+        self.context = context
+
+    def send(self, value: Any) -> Any:
+        return self.context.run(self.coro.send, value)
+
+    def throw(self, *args: Any) -> Any:
+        return self.context.run(self.coro.throw, *args)
+
+    def close(self) -> None:
+        self.context.run(self.coro.close)
+
+    def __next__(self) -> Any:
+        return self.context.run(self.coro.send, None)
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        return self  # type: ignore[return-value]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.coro!r}>"
+
+
+def bind_generator_to_context(
+    generator: Generator[_YieldT, _SendT, _ReturnT], context: Optional[Context] = None
+) -> Generator[_YieldT, _SendT, _ReturnT]:
+    """Make each step of the generator run in the given context.
+
+    :param generator: A generator object.
+    :param context: A context, where the generator is resumed.
+                    If not given, a copy of the current context is used.
+
+    :returns: A generator that wraps the original one, and performs each its step
+              (``next()``/``send()``/``throw()``/``close()``) inside the ``context``.
+
+    Normally, a generator has no context of its own: its code is resumed in the context
+    of whoever calls ``next()``. So, for example, a generator produced by a function wrapped with
+    :func:`bind_to_sandbox_context` is created in the sandbox, but iterated outside of it.
+
+    This function pins the generator to one :class:`~contextvars.Context` object
+    (that is entered on each step, but never copied)::
+
+        >>> from contextvars import copy_context
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import bind_generator_to_context
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     stream_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> def generate_rows():
+        ...     current.stream_id = 1
+        ...     while True:
+        ...         yield f"stream_id={current.stream_id}"
+
+        >>> rows = bind_generator_to_context(generate_rows())
+
+        # The value set inside the generator stays inside it.
+        >>> next(rows)
+        'stream_id=1'
+        >>> print(current.stream_id)
+        None
+
+        # And changes made outside are not visible to the generator.
+        >>> current.stream_id = 2
+        >>> next(rows)
+        'stream_id=1'
+
+    The context must not be entered by anything else while the generator is iterated.
+    """
+    if context is None:
+        context = copy_context()
+    return _GeneratorInContext(generator, context)
+
+
+class _GeneratorInContext(Generator[Any, Any, Any]):
+    # The wrapper returned by bind_generator_to_context().
+    #
+    # Bound methods are cached in slots, so that the hot path (__next__) costs only
+    # one Context.run() call per item.
+    __slots__ = ("generator", "context", "_run", "_next")
+
+    def __init__(self, generator: Generator[Any, Any, Any], context: Context) -> None:
+        self.generator = generator
+        self.context = context
+        self._run = context.run
+        self._next = generator.__next__
+
+    def __next__(self) -> Any:
+        return self._run(self._next)
+
+    def send(self, value: Any) -> Any:
+        return self._run(self.generator.send, value)
+
+    def throw(self, *args: Any) -> Any:
+        return self._run(self.generator.throw, *args)
+
+    def close(self) -> None:
+        self._run(self.generator.close)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.generator!r}>"
+
+
+def bind_async_generator_to_context(
+    async_generator: AsyncGenerator[_YieldT, _SendT], context: Optional[Context] = None
+) -> AsyncGenerator[_YieldT, _SendT]:
+    """Make each step of the async generator run in the given context.
+
+    The same as :func:`bind_generator_to_context`, but for asynchronous generators::
+
+        >>> from asyncio import run, sleep
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import bind_async_generator_to_context
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     stream_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> async def generate_rows():
+        ...     current.stream_id = 1
+        ...     for _ in range(2):
+        ...         await sleep(0)
+        ...         yield f"stream_id={current.stream_id}"
+
+        >>> async def main():
+        ...     async for row in bind_async_generator_to_context(generate_rows()):
+        ...         current.stream_id = 2
+        ...         print(row)
+
+        >>> run(main())
+        stream_id=1
+        stream_id=1
+    """
+    if context is None:
+        context = copy_context()
+    return _AsyncGeneratorInContext(async_generator, context)
+
+
+class _AsyncGeneratorInContext(AsyncGenerator[Any, Any]):
+    # The wrapper returned by bind_async_generator_to_context().
+    # Each awaitable returned by the async generator is driven by a _CoroutineInContext.
+    __slots__ = ("async_generator", "context")
+
+    def __init__(self, async_generator: AsyncGenerator[Any, Any], context: Context) -> None:
+        self.async_generator = async_generator
+        self.context = context
+
+    def __anext__(self) -> Any:
+        return _CoroutineInContext(self.async_generator.__anext__(), self.context)
+
+    def asend(self, value: Any) -> Any:
+        return _CoroutineInContext(self.async_generator.asend(value), self.context)
+
+    def athrow(self, *args: Any) -> Any:
+        return _CoroutineInContext(self.async_generator.athrow(*args), self.context)
+
+    def aclose(self) -> Any:
+        return _CoroutineInContext(self.async_generator.aclose(), self.context)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} {self.async_generator!r}>"
+
+
 def create_async_task_in_empty_context(coro: Coroutine) -> asyncio.Task:
     """Create asyncio Task in empty context (where all context vars are set to default values).
 
@@ -342,3 +639,153 @@ def create_async_task_in_empty_context(coro: Coroutine) -> asyncio.Task:
     empty_context = Context()
     task = empty_context.run(asyncio.create_task, coro)
     return task
+
+
+def run_in_executor_in_snapshot_context(
+    executor: Optional[Executor], fn: Callable[..., _ReturnT], *args
+) -> "asyncio.Future[_ReturnT]":
+    """Run a blocking function in executor, in a snapshot of the current context.
+
+    This is a replacement for :meth:`asyncio.loop.run_in_executor`.
+
+    The problem with :meth:`~asyncio.loop.run_in_executor` is that it doesn't propagate
+    context variables: the function runs in a worker thread, that has its own context.
+    This helper takes a snapshot of the current context, and runs the function in it
+    (no wrapper function is created: the snapshot's :meth:`~contextvars.Context.run`
+    is passed to the executor directly).
+
+    Example::
+
+        >>> from asyncio import get_running_loop, run
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import (
+        ...     run_in_executor_in_snapshot_context,
+        ... )
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     request_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> def get_request_id():
+        ...     return current.request_id
+
+        >>> async def main():
+        ...     current.request_id = 42
+        ...
+        ...     # Normally, the function doesn't see context variables of the caller.
+        ...     print(await get_running_loop().run_in_executor(None, get_request_id))
+        ...
+        ...     # But, this helper runs the function in a snapshot of the caller's context.
+        ...     print(await run_in_executor_in_snapshot_context(None, get_request_id))
+
+        >>> run(main())
+        None
+        42
+
+    :param executor: An instance of :class:`concurrent.futures.Executor`,
+                     or ``None`` to use the loop's default executor.
+    :param fn: A function to call.
+    :param args: Positional arguments for the function (use :func:`functools.partial`
+                 to pass keyword arguments, like with :meth:`~asyncio.loop.run_in_executor`).
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, copy_context().run, fn, *args)
+
+
+def run_in_executor_in_empty_context(
+    executor: Optional[Executor], fn: Callable[..., _ReturnT], *args
+) -> "asyncio.Future[_ReturnT]":
+    """Run a blocking function in executor, in an empty context.
+
+    Like :func:`run_in_executor_in_snapshot_context`, but the function runs in an empty context
+    (where all context variables take their default values), regardless of the executor
+    (even if the executor itself propagates context variables).
+
+    Example::
+
+        >>> from asyncio import run
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import run_in_executor_in_empty_context
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     request_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> async def main():
+        ...     current.request_id = 42
+        ...     print(await run_in_executor_in_empty_context(None, lambda: current.request_id))
+
+        >>> run(main())
+        None
+    """
+    loop = asyncio.get_running_loop()
+    return loop.run_in_executor(executor, Context().run, fn, *args)
+
+
+def call_soon_in_empty_context(callback: Callable[..., Any], *args) -> asyncio.Handle:
+    """Schedule a callback (like :meth:`asyncio.loop.call_soon`), to be called in empty context.
+
+    By default, :meth:`~asyncio.loop.call_soon` runs the callback in a copy of the current context
+    (so there is no need for a "snapshot" variant of this function).
+
+    This helper uses the native ``context=`` parameter of :meth:`~asyncio.loop.call_soon`
+    to run the callback in an empty context (where all context variables take default values).
+
+    Example::
+
+        >>> from asyncio import get_running_loop, run, sleep
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import call_soon_in_empty_context
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     request_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> def print_request_id(prefix):
+        ...     print(prefix, current.request_id)
+
+        >>> async def main():
+        ...     current.request_id = 42
+        ...     get_running_loop().call_soon(print_request_id, "call_soon():")
+        ...     call_soon_in_empty_context(print_request_id, "call_soon_in_empty_context():")
+        ...     await sleep(0)
+
+        >>> run(main())
+        call_soon(): 42
+        call_soon_in_empty_context(): None
+    """
+    loop = asyncio.get_running_loop()
+    return loop.call_soon(callback, *args, context=Context())
+
+
+def call_later_in_empty_context(
+    delay: float, callback: Callable[..., Any], *args
+) -> asyncio.TimerHandle:
+    """Schedule a delayed callback (like :meth:`asyncio.loop.call_later`), in empty context.
+
+    The same as :func:`call_soon_in_empty_context`, but for :meth:`~asyncio.loop.call_later`.
+
+    Example::
+
+        >>> from asyncio import run, sleep
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.context_management import call_later_in_empty_context
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     request_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> async def main():
+        ...     current.request_id = 42
+        ...     call_later_in_empty_context(0.001, lambda: print(current.request_id))
+        ...     await sleep(0.01)
+
+        >>> run(main())
+        None
+    """
+    loop = asyncio.get_running_loop()
+    return loop.call_later(delay, callback, *args, context=Context())
@@ -0,0 +1,203 @@
+"""A pool of pre-warmed contexts, where deferred default values are already materialized."""
+
+import threading
+from contextlib import contextmanager
+from contextvars import Context
+from typing import Any, Callable, Iterator, List, Optional, Tuple, TypeVar
+
+from contextvars_registry.context_vars_registry import ContextVarsRegistry
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class ContextPool:
+    """A pool of warm :class:`~contextvars.Context` objects, for tasks that run in fresh contexts.
+
+    A :attr:`~contextvars_registry.context_var_descriptor.ContextVarDescriptor.deferred_default`
+    function is called once per context. So, when each task gets its own fresh context
+    (like in a thread pool), expensive defaults (DB sessions, parsed configs, etc)
+    are produced again for every task.
+
+    This pool keeps contexts, where such defaults are already produced.
+    A task checks out a warm context, runs in a copy of it (so the task's own changes of
+    context variables stay isolated), and then the warm context is returned to the pool::
+
+        >>> from concurrent.futures import ThreadPoolExecutor
+        >>> from contextvars_registry import ContextVarDescriptor, ContextVarsRegistry
+        >>> from contextvars_registry.context_pool import ContextPool
+
+        >>> def new_db_session():
+        ...     print("new DB session")
+        ...     return object()
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     db_session: object = ContextVarDescriptor(deferred_default=new_db_session)
+        ...     user_id: int = None
+
+        >>> current = CurrentVars()
+        >>> pool = ContextPool(current, max_size=1)
+
+        >>> def task(user_id):
+        ...     current.user_id = user_id
+        ...     return current.db_session
+
+        >>> with ThreadPoolExecutor(max_workers=1) as executor:
+        ...     sessions = [executor.submit(pool.run, task, i).result() for i in [1, 2, 3]]
+        new DB session
+
+        >>> sessions[0] is sessions[1] is sessions[2]
+        True
+
+        # Changes made by tasks are not saved in the pool.
+        >>> pool.run(lambda: current.user_id) is None
+        True
+
+    Deferred defaults of the given registries are materialized when a new context is created
+    (and you can do additional preparations in the ``warm_up`` function).
+
+    Each warm context is used by only one task at a time. When all warm contexts are checked out,
+    a new one is created, so tasks never wait for each other. But no more than :attr:`max_size`
+    contexts are kept in the pool: when a context is returned to a full pool,
+    the least recently used context is evicted (and also, a context is evicted after
+    :attr:`max_uses` tasks, if the limit is set). So the factory cost is paid once per pool slot,
+    instead of once per task.
+    """
+
+    registries: Tuple[ContextVarsRegistry, ...]
+    """Registries, whose deferred defaults are materialized in each new context."""
+
+    warm_up: Optional[Callable[[], Any]]
+    """A function that is called in each new context (after materializing deferred defaults)."""
+
+    tear_down: Optional[Callable[[], Any]]
+    """A function that is called in a context that is evicted from the pool."""
+
+    max_size: int
+    """The maximum number of idle contexts kept in the pool."""
+
+    max_uses: Optional[int]
+    """The number of tasks, after which a context is evicted (``None`` means no limit)."""
+
+    def __init__(
+        self,
+        *registries: ContextVarsRegistry,
+        warm_up: Optional[Callable[[], Any]] = None,
+        tear_down: Optional[Callable[[], Any]] = None,
+        max_size: int = 8,
+        max_uses: Optional[int] = None,
+    ) -> None:
+        """Initialize the pool.
+
+        :param registries: Registries, whose deferred defaults are materialized in new contexts.
+        :param warm_up: A function that is called in each new context.
+        :param tear_down: A function that is called in each evicted context
+                          (for example, to close DB sessions that were opened by ``warm_up``).
+        :param max_size: The maximum number of idle contexts kept in the pool.
+        :param max_uses: Evict a context after this number of tasks.
+        """
+        self.registries = registries
+        self.warm_up = warm_up
+        self.tear_down = tear_down
+        self.max_size = max_size
+        self.max_uses = max_uses
+
+        # Idle contexts with their use counters, from the least to the most recently used.
+        self._idle_contexts: List[Tuple[Context, int]] = []
+        self._lock = threading.Lock()
+
+    def run(self, fn: Callable[..., _ReturnT], /, *args: Any, **kwargs: Any) -> _ReturnT:
+        """Call ``fn(*args, **kwargs)`` in a copy of a warm context.
+
+        :returns: Result of the ``fn`` call.
+        """
+        warm_context, uses = self._check_out()
+        try:
+            return warm_context.copy().run(fn, *args, **kwargs)
+        finally:
+            self._check_in(warm_context, uses + 1)
+
+    @contextmanager
+    def check_out(self) -> Iterator[Context]:
+        """Check out a warm context, for running several calls in it.
+
+        :returns: A context manager, that provides a copy of a warm context
+                  (and returns the warm context back to the pool on exit).
+
+        Example::
+
+            >>> from contextvars_registry import ContextVarsRegistry
+            >>> from contextvars_registry.context_pool import ContextPool
+
+            >>> class CurrentVars(ContextVarsRegistry):
+            ...     user_id: int = None
+
+            >>> current = CurrentVars()
+            >>> pool = ContextPool(current)
+
+            >>> with pool.check_out() as context:
+            ...     context.run(setattr, current, 'user_id', 42)
+            ...     context.run(getattr, current, 'user_id')
+            42
+        """
+        warm_context, uses = self._check_out()
+        try:
+            yield warm_context.copy()
+        finally:
+            self._check_in(warm_context, uses + 1)
+
+    def clear(self) -> None:
+        """Evict all idle contexts from the pool."""
+        with self._lock:
+            evicted_contexts = self._idle_contexts
+            self._idle_contexts = []
+        for context, _ in evicted_contexts:
+            self._evict(context)
+
+    def __len__(self) -> int:
+        """Return the number of idle contexts in the pool."""
+        return len(self._idle_contexts)
+
+    def _check_out(self) -> Tuple[Context, int]:
+        with self._lock:
+            if self._idle_contexts:
+                # The most recently used context is the warmest one.
+                return self._idle_contexts.pop()
+
+        # Warming up may be slow, so it is done without holding the lock.
+        return self._new_warm_context(), 0
+
+    def _check_in(self, context: Context, uses: int) -> None:
+        evicted_context: Optional[Context] = context
+        if (self.max_uses is None) or (uses < self.max_uses):
+            with self._lock:
+                self._idle_contexts.append((context, uses))
+                if len(self._idle_contexts) > self.max_size:
+                    evicted_context = self._idle_contexts.pop(0)[0]
+                else:
+                    evicted_context = None
+
+        if evicted_context is not None:
+            self._evict(evicted_context)
+
+    def _new_warm_context(self) -> Context:
+        context = Context()
+        context.run(self._warm_up_current_context)
+        return context
+
+    def _warm_up_current_context(self) -> None:
+        for registry in self.registries:
+            _materialize_deferred_defaults(registry)
+        if self.warm_up is not None:
+            self.warm_up()
+
+    def _evict(self, context: Context) -> None:
+        if self.tear_down is not None:
+            context.run(self.tear_down)
+
+
+def _materialize_deferred_defaults(registry: ContextVarsRegistry) -> None:
+    # .get() calls the deferred_default function, and stores its result in the current context.
+    # pylint: disable=protected-access
+    for descriptor in registry._registry_var_descriptors.values():
+        if descriptor.deferred_default is not None:
+            descriptor.get()
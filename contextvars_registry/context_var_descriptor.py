@@ -1,7 +1,21 @@
 """ContextVarDescriptor - extension for the built-in ContextVar that behaves like @property."""
 
+import os
+import threading
 from contextvars import ContextVar, Token
-from typing import Any, Callable, Generic, Optional, Type, TypeVar, Union, overload
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    overload,
+)
+from weakref import WeakSet
 
 from sentinel_value import SentinelValue
 
@@ -20,6 +34,9 @@ _DescriptorT = TypeVar("_DescriptorT", bound="ContextVarDescriptor[Any]")
 # descriptor's owner (an object that contains descriptor as attribute)
 _OwnerT = TypeVar("_OwnerT")
 
+DeferredDefaultScope = Literal["context", "thread", "process"]
+"""Possible values of :attr:`ContextVarDescriptor.deferred_default_scope`."""
+
 
 class NoDefault(SentinelValue):
     """Special sentinel object that means: "default value is not set".
@@ -186,12 +203,108 @@ class ContextVarDescriptor(Generic[_VarValueT]):
        setting it has no effect, and may cause bugs. So don't try to set it.
     """
 
+    deferred_default_scope: DeferredDefaultScope
+    """How often the :attr:`deferred_default` function is called.
+
+    - ``"context"`` (default): once per context. Each context gets its own value.
+
+    - ``"thread"``: once per thread. All contexts in the thread share the same value.
+
+    - ``"process"``: once per process. All contexts in all threads share the same value.
+      The value is produced under a lock, so concurrent threads don't call the function twice.
+
+    Thread and process scopes are for values that are expensive to create,
+    and safe to share (like API clients, or compiled regular expressions),
+    where creating them in every short-lived context would be a waste::
+
+        >>> import re
+        >>> from contextvars import Context
+
+        >>> def compile_patterns():
+        ...     print("compiling patterns")
+        ...     return [re.compile("[0-9]+"), re.compile("[a-z]+")]
+
+        >>> patterns_var = ContextVarDescriptor(
+        ...     "patterns_var", deferred_default=compile_patterns, deferred_default_scope="process"
+        ... )
+
+        >>> patterns = Context().run(patterns_var.get)
+        compiling patterns
+        >>> Context().run(patterns_var.get) is patterns
+        True
+
+    Anyway, the value is stored in the current context when :meth:`get` is called,
+    so the rest of the API (like :meth:`is_set`) works the same way for all scopes.
+
+    In a process that is created via ``fork()``, thread and process scoped values are
+    produced again (since things like network connections can't be shared with a child process).
+
+    .. Note::
+
+       This attribute is read-only.
+
+       It can only be set when the object is created (via :meth:`__init__` parameters).
+
+       Although technically this attribute is writable (for performance purposes),
+       setting it has no effect, and may cause bugs. So don't try to set it.
+    """
+
+    strict: bool
+    """Is this a strict context variable (that can't be deleted)?
+
+    A strict variable behaves like a plain :class:`contextvars.ContextVar`:
+    it can be set, and reset via a :class:`~contextvars.Token`, but it cannot be erased,
+    so :meth:`delete` and :meth:`reset_to_default` raise :class:`DeleteStrictContextVarError`.
+
+    In exchange, a strict variable never contains special :class:`DeletionMark` objects,
+    and thus doesn't need to check for them, so its :meth:`get` method is a direct reference to
+    the built-in :meth:`contextvars.ContextVar.get` method (no Python-level wrappers at all)::
+
+        >>> timezone_var = ContextVarDescriptor("timezone_var", default="UTC", strict=True)
+
+        >>> timezone_var.get
+        <built-in method get of ...ContextVar object ...>
+
+        >>> timezone_var.delete()
+        Traceback (most recent call last):
+        ...
+        contextvars_registry.context_var_descriptor.DeleteStrictContextVarError: ...
+
+    (the only exception is :attr:`deferred_default`, which still requires a Python-level wrapper)
+
+    .. Warning::
+
+       Because of that, the ``default`` argument of :meth:`get` is positional-only
+       for strict variables (the built-in method doesn't accept keyword arguments)::
+
+           >>> timezone_var.get('GMT')
+           'GMT'
+
+           >>> timezone_var.get(default='GMT')
+           Traceback (most recent call last):
+           ...
+           TypeError: ...get() takes no keyword arguments
+
+       So, when you write code that works with any kind of variables, pass it positionally.
+
+    .. Note::
+
+       This attribute is read-only.
+
+       It can only be set when the object is created (via :meth:`__init__` parameters).
+
+       Although technically this attribute is writable (for performance purposes),
+       setting it has no effect, and may cause bugs. So don't try to set it.
+    """
+
     def __init__(
         self,
         name: Optional[str] = None,
         default: Union[_VarValueT, NoDefault] = NO_DEFAULT,
         deferred_default: Optional[Callable[[], _VarValueT]] = None,
         _context_var: Optional[ContextVar[_VarValueT]] = None,
+        strict: bool = False,
+        deferred_default_scope: DeferredDefaultScope = "context",
     ) -> None:
         """Initialize ContextVarDescriptor object.
 
@@ -211,13 +324,26 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         :param _context_var: A reference to an existing :class:`contextvars.ContextVar` object.
                              This parameter is for internal purposes, and you shouldn't use it.
                              Instead, use :meth:`ContextVarDescriptor.from_existing_var` constructor.
+
+        :param strict: Forbid deletion of the variable (and make :meth:`get` faster in exchange).
+                       See :attr:`strict` for details.
+
+        :param deferred_default_scope: Call ``deferred_default`` once per context (default),
+                                       once per thread, or once per process.
+                                       See :attr:`deferred_default_scope` for details.
         """
         if not name:
             # postpone init until __set_name__() method is called
-            self._postponed_init_args = (default, deferred_default, _context_var)
+            self._postponed_init_args = (
+                default,
+                deferred_default,
+                _context_var,
+                strict,
+                deferred_default_scope,
+            )
             return
 
-        self._init(name, default, deferred_default, _context_var)
+        self._init(name, default, deferred_default, _context_var, strict, deferred_default_scope)
 
     def __set_name__(self, owner_cls: type, owner_attr_name: str) -> None:
         if hasattr(self, "_postponed_init_args"):
@@ -229,6 +355,8 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         cls: Type[_DescriptorT],
         context_var: ContextVar[_VarValueT],
         deferred_default: Optional[Callable[[], _VarValueT]] = None,
+        strict: bool = False,
+        deferred_default_scope: DeferredDefaultScope = "context",
     ) -> "ContextVarDescriptor[_VarValueT]":
         """Create ContextVarDescriptor from an existing ContextVar object.
 
@@ -259,7 +387,7 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         """
         name = context_var.name
         default = get_context_var_default(context_var)
-        return cls(name, default, deferred_default, context_var)
+        return cls(name, default, deferred_default, context_var, strict, deferred_default_scope)
 
     def _init(
         self,
@@ -267,10 +395,20 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         default: Union[_VarValueT, NoDefault],
         deferred_default: Optional[Callable[[], _VarValueT]],
         _context_var: Optional[ContextVar[_VarValueT]],
+        strict: bool,
+        deferred_default_scope: DeferredDefaultScope,
     ) -> None:
         assert name
         assert not ((default is not NO_DEFAULT) and (deferred_default is not None))
 
+        try:
+            new_scoped_deferred_default = _SCOPED_DEFERRED_DEFAULT_FACTORIES[deferred_default_scope]
+        except KeyError:
+            raise ValueError(
+                "deferred_default_scope must be one of: 'context', 'thread', 'process' "
+                f"(got: {deferred_default_scope!r})"
+            ) from None
+
         if _context_var is None:
             _context_var = _new_context_var(name, default)
 
@@ -278,6 +416,13 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         self.name = name
         self.default = default
         self.deferred_default = deferred_default
+        self.deferred_default_scope = deferred_default_scope
+        self.strict = strict
+
+        # The function that is actually called by .get() closures (see _init_fast_methods()).
+        self._scoped_deferred_default = (
+            None if deferred_default is None else new_scoped_deferred_default(deferred_default)
+        )
 
         self._init_fast_methods()
         self._init_deferred_default()
@@ -286,7 +431,7 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         # Problem: basic ContextVar.get()/.set()/etc() must have good performance.
         #
         # So, I decided to do some evil premature optimization: instead of regular methods,
-        # I define them as functions (closures) here, and then write them as methods to
+        # I define them as functions (closures), and then write them as methods to
         # the ContextVarDescriptor() instance.
         #
         # Closures, are faster than methods, because they can:
@@ -295,88 +440,239 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         #  - avoid `.` - the dot operator (because, again, attribute access is slow)
         #  - avoid globals (because they're slower than local variables)
         #
+        # Moreover, most of the descriptor's configuration (like: is there a default value?)
+        # is fixed at the time when the descriptor is created. So, instead of one generic closure
+        # that checks all the options on every call, there is a separate set of closures for each
+        # configuration, and each closure contains only branches that can actually happen.
+        #
         # Of course, all these overheads are minor, but they add up.
         # For example .get() call became 2x faster after these optimizations.
         # So I decided to keep them.
+        if self.strict:
+            if self.deferred_default is not None:
+                fast_methods = self._new_fast_methods_for_strict_deferred_default()
+            else:
+                fast_methods = self._new_fast_methods_for_strict()
+        elif self.deferred_default is not None:
+            fast_methods = self._new_fast_methods_for_deferred_default()
+        elif self.default is not NO_DEFAULT:
+            fast_methods = self._new_fast_methods_for_default()
+        else:
+            fast_methods = self._new_fast_methods_for_no_default()
+
+        (
+            self.get,  # type: ignore[method-assign]
+            self.is_set,  # type: ignore[method-assign]
+            self.is_gettable,  # type: ignore[method-assign]
+        ) = fast_methods
 
+        # Copy some methods from ContextVar.
+        # These are even better than closures, because they are C functions.
+        # So by calling, for example ``ContextVarRegistry.set()``, you're *actually* calling
+        # tje low-level C function ``ContextVar.set`` directly, without any Python-level wrappers.
+        self.get_raw = self.context_var.get  # type: ignore[assignment]
+        self.set = self.context_var.set  # type: ignore[assignment]
+        self.reset = self.context_var.reset  # type: ignore[assignment]
+
+    # NOTE: names of closures below are chosen such that they look good in stack traces.
+    # When an exception is thrown, just "get" looks cryptic, while the long name like
+    # "_method_ContextVarDescriptor_get" at least gives you a hint that
+    # the ContextVarDescriptor.get method is the source of exception.
+    #
+    # Also note the trick: closures call ``context_var_get(_RESET_TO_DEFAULT)``.
+    # That way, a variable that was never set in the current context looks exactly like a variable
+    # that was reset to default, so both cases are handled by the same branch of code.
+
+    def _new_fast_methods_for_no_default(self) -> "_FastMethods":
         # The `.` (the dot operator that resoles attributes) has some overhead.
         # So, do it in advance to avoid dots in closures below.
         context_var = self.context_var
         context_var_get = context_var.get
-        context_var_set = context_var.set
-        context_var_ext_default = self.default
-        context_var_ext_deferred_default = self.deferred_default
-
-        context_var_ext_default_is_set = context_var_ext_default is not NO_DEFAULT
-        context_var_ext_deferred_default_is_set = context_var_ext_deferred_default is not None
 
         # Local variables are faster than globals.
         # So, copy all needed globals and thus make them locals.
-        __NOT_SET = _NOT_SET
         _NO_DEFAULT = NO_DEFAULT
         _DELETED = DELETED
         _RESET_TO_DEFAULT = RESET_TO_DEFAULT
         _LookupError = LookupError
 
-        # Ok, now define closures that use all the variables prepared above.
+        def _method_ContextVarDescriptor_get(default=NO_DEFAULT):
+            value = context_var_get(_RESET_TO_DEFAULT)
+
+            # Not set, or special sentinel objects left by .delete() or .reset_to_default().
+            # There is no default value, so both cases mean that the value is missing.
+            if (value is _RESET_TO_DEFAULT) or (value is _DELETED):
+                if default is _NO_DEFAULT:
+                    raise _LookupError(context_var)
+                return default
+
+            return value
+
+        def _method_ContextVarDescriptor_is_set(on_default=False, on_deferred_default=False):
+            value = context_var_get(_RESET_TO_DEFAULT)
+            return (value is not _RESET_TO_DEFAULT) and (value is not _DELETED)
+
+        def _method_ContextVarDescriptor_is_gettable():
+            value = context_var_get(_RESET_TO_DEFAULT)
+            return (value is not _RESET_TO_DEFAULT) and (value is not _DELETED)
+
+        return (
+            _method_ContextVarDescriptor_get,
+            _method_ContextVarDescriptor_is_set,
+            _method_ContextVarDescriptor_is_gettable,
+        )
+
+    def _new_fast_methods_for_default(self) -> "_FastMethods":
+        context_var = self.context_var
+        context_var_get = context_var.get
+        context_var_ext_default = self.default
+
+        _NO_DEFAULT = NO_DEFAULT
+        _DELETED = DELETED
+        _RESET_TO_DEFAULT = RESET_TO_DEFAULT
+        _LookupError = LookupError
 
-        # NOTE: function name is chosen such that it looks good in stack traces.
-        # When an exception is thrown, just "get" looks cryptic, while "_method_ContextVarDescriptor_get"
-        # at least gives you a hint that the ContextVarDescriptor.get method is the source of exception.
         def _method_ContextVarDescriptor_get(default=NO_DEFAULT):
-            if default is _NO_DEFAULT:
-                value = context_var_get()
-            else:
-                value = context_var_get(default)
+            value = context_var_get(_RESET_TO_DEFAULT)
+
+            # Not set, or special sentinel object left by .reset_to_default()
+            if value is _RESET_TO_DEFAULT:
+                if default is _NO_DEFAULT:
+                    return context_var_ext_default
+                return default
 
             # special sentinel object, left by ContextVarDescriptor.delete()
             if value is _DELETED:
-                if default is not _NO_DEFAULT:
-                    return default
-                raise _LookupError(context_var)
+                if default is _NO_DEFAULT:
+                    raise _LookupError(context_var)
+                return default
+
+            return value
 
-            # special sentinel object, left by ContextVarDescriptor.reset_to_default()
+        def _method_ContextVarDescriptor_is_set(on_default=False, on_deferred_default=False):
+            value = context_var_get(_RESET_TO_DEFAULT)
+            if value is _RESET_TO_DEFAULT:
+                return on_default
+            return value is not _DELETED
+
+        def _method_ContextVarDescriptor_is_gettable():
+            return context_var_get(_RESET_TO_DEFAULT) is not _DELETED
+
+        return (
+            _method_ContextVarDescriptor_get,
+            _method_ContextVarDescriptor_is_set,
+            _method_ContextVarDescriptor_is_gettable,
+        )
+
+    def _new_fast_methods_for_deferred_default(self) -> "_FastMethods":
+        context_var = self.context_var
+        context_var_get = context_var.get
+        context_var_set = context_var.set
+        context_var_ext_deferred_default = self._scoped_deferred_default
+        assert context_var_ext_deferred_default is not None
+
+        _NO_DEFAULT = NO_DEFAULT
+        _DELETED = DELETED
+        _RESET_TO_DEFAULT = RESET_TO_DEFAULT
+        _LookupError = LookupError
+
+        def _method_ContextVarDescriptor_get(default=NO_DEFAULT):
+            value = context_var_get(_RESET_TO_DEFAULT)
+
+            # Not set, or special sentinel object left by .reset_to_default()
+            # In this case, we produce the default value, and store it in the current context.
             if value is _RESET_TO_DEFAULT:
                 if default is not _NO_DEFAULT:
                     return default
-                if context_var_ext_default is not _NO_DEFAULT:
-                    return context_var_ext_default
-                if context_var_ext_deferred_default is not None:
-                    value = context_var_ext_deferred_default()
-                    context_var_set(value)
-                    return value
-                raise _LookupError(context_var)
+                value = context_var_ext_deferred_default()
+                context_var_set(value)
+                return value
+
+            # special sentinel object, left by ContextVarDescriptor.delete()
+            if value is _DELETED:
+                if default is _NO_DEFAULT:
+                    raise _LookupError(context_var)
+                return default
 
             return value
 
-        self.get = _method_ContextVarDescriptor_get  # type: ignore[method-assign]
+        def _method_ContextVarDescriptor_is_set(on_default=False, on_deferred_default=False):
+            value = context_var_get(_RESET_TO_DEFAULT)
+            if value is _RESET_TO_DEFAULT:
+                return on_deferred_default
+            return value is not _DELETED
+
+        def _method_ContextVarDescriptor_is_gettable():
+            return context_var_get(_RESET_TO_DEFAULT) is not _DELETED
+
+        return (
+            _method_ContextVarDescriptor_get,
+            _method_ContextVarDescriptor_is_set,
+            _method_ContextVarDescriptor_is_gettable,
+        )
+
+    def _new_fast_methods_for_strict(self) -> "_FastMethods":
+        # Strict variables never contain DELETED/RESET_TO_DEFAULT marks.
+        # So, the built-in ContextVar.get() method does exactly what we need, and we use it as-is.
+        # Only the .is_set() method needs a wrapper.
+        context_var_get = self.context_var.get
+        context_var_ext_default_is_set = self.default is not NO_DEFAULT
+
+        __NOT_SET = _NOT_SET
 
         def _method_ContextVarDescriptor_is_set(on_default=False, on_deferred_default=False):
-            value = context_var_get(__NOT_SET)
+            if context_var_get(__NOT_SET) is not __NOT_SET:
+                return True
+            return context_var_ext_default_is_set and on_default
 
-            if (value is __NOT_SET) or (value is _RESET_TO_DEFAULT):
-                if context_var_ext_default_is_set:
-                    return on_default
-                if context_var_ext_deferred_default_is_set:
-                    return on_deferred_default
-                return False
+        def _method_ContextVarDescriptor_is_gettable():
+            return context_var_ext_default_is_set or (context_var_get(__NOT_SET) is not __NOT_SET)
 
-            return value is not _DELETED
+        return (
+            context_var_get,
+            _method_ContextVarDescriptor_is_set,
+            _method_ContextVarDescriptor_is_gettable,
+        )
 
-        self.is_set = _method_ContextVarDescriptor_is_set  # type: ignore[method-assign]
+    def _new_fast_methods_for_strict_deferred_default(self) -> "_FastMethods":
+        context_var_get = self.context_var.get
+        context_var_set = self.context_var.set
+        context_var_ext_deferred_default = self._scoped_deferred_default
+        assert context_var_ext_deferred_default is not None
 
-        # Copy some methods from ContextVar.
-        # These are even better than closures above, because they are C functions.
-        # So by calling, for example ``ContextVarRegistry.set()``, you're *actually* calling
-        # tje low-level C function ``ContextVar.set`` directly, without any Python-level wrappers.
-        self.get_raw = self.context_var.get  # type: ignore[assignment]
-        self.set = self.context_var.set  # type: ignore[assignment]
-        self.reset = self.context_var.reset  # type: ignore[assignment]
+        __NOT_SET = _NOT_SET
+        _NO_DEFAULT = NO_DEFAULT
+
+        def _method_ContextVarDescriptor_get(default=NO_DEFAULT):
+            value = context_var_get(__NOT_SET)
+            if value is __NOT_SET:
+                if default is not _NO_DEFAULT:
+                    return default
+                value = context_var_ext_deferred_default()
+                context_var_set(value)
+            return value
+
+        def _method_ContextVarDescriptor_is_set(on_default=False, on_deferred_default=False):
+            return (context_var_get(__NOT_SET) is not __NOT_SET) or on_deferred_default
+
+        def _method_ContextVarDescriptor_is_gettable():
+            return True
+
+        return (
+            _method_ContextVarDescriptor_get,
+            _method_ContextVarDescriptor_is_set,
+            _method_ContextVarDescriptor_is_gettable,
+        )
 
     def _init_deferred_default(self) -> None:
-        # In case ``deferred_default`` is used, put a special marker object to the variable
-        # (otherwise ContextVar.get() method will not find any value and raise a LookupError)
-        if self.deferred_default and not self.is_set():
+        # In case ``deferred_default`` is used, put a special marker object to the variable.
+        #
+        # The .get() method doesn't need it (it treats "not set" the same way as the marker),
+        # but it makes .get_raw() to return the marker (instead of raising LookupError),
+        # so code that works with raw values can see that a deferred default is pending.
+        #
+        # Strict variables can't contain the marker, so they're skipped here.
+        if self.deferred_default and not self.strict and not self.is_set():
             self.reset_to_default()
 
     @overload
@@ -430,6 +726,9 @@ class ContextVarDescriptor(Generic[_VarValueT]):
             # The `.get(default=...)` argument is ignored since the value was set above.
             >>> locale_var.get(default='en')
             'en_GB'
+
+        For :attr:`strict` variables, ``default`` is a positional-only argument
+        (see :attr:`strict` for details).
         """
         # pylint: disable=no-self-use,method-hidden
         # This code is never actually called, see ``_init_fast_methods``.
@@ -507,7 +806,10 @@ class ContextVarDescriptor(Generic[_VarValueT]):
             >>> timezone_var.is_gettable()
             True
         """
-        return self.is_set(on_default=True, on_deferred_default=True)
+        # pylint: disable=no-self-use,method-hidden
+        # This code is never actually called, see ``_init_fast_methods``.
+        # It exists only for auto-generated documentation and static code analysis tools.
+        raise AssertionError
 
     def is_set(self, on_default: bool = False, on_deferred_default: bool = False) -> bool:
         """Check if the context variable is set.
@@ -692,7 +994,11 @@ class ContextVarDescriptor(Generic[_VarValueT]):
             # The exception can be avoided by passing a `default=...` value.
             timezone_var.get(default='UTC')
             'UTC'
+
+        :raises DeleteStrictContextVarError: if the variable is :attr:`strict`
         """
+        if self.strict:
+            raise DeleteStrictContextVarError.format(context_var_name=self.name)
         self.set(RESET_TO_DEFAULT)  # type: ignore[arg-type]
 
     def delete(self) -> None:
@@ -728,7 +1034,11 @@ class ContextVarDescriptor(Generic[_VarValueT]):
            :meth:`delete` does NOT reset the variable to its :attr:`default` value.
 
            There is a special method for that purpose: :meth:`reset_to_default`
+
+        :raises DeleteStrictContextVarError: if the variable is :attr:`strict`
         """
+        if self.strict:
+            raise DeleteStrictContextVarError.format(context_var_name=self.name)
         self.set(DELETED)  # type: ignore[arg-type]
 
     def __repr__(self) -> str:
@@ -770,9 +1080,77 @@ class ContextVarDescriptor(Generic[_VarValueT]):
         self.delete()
 
 
-# A special sentinel object, used internally by methods like .is_set() and .set_if_not_set()
+# A special sentinel object, used internally by methods like .set_if_not_set()
 _NOT_SET = SentinelValue(__name__, "_NOT_SET")
 
+# Closures generated by ContextVarDescriptor._init_fast_methods(): (get, is_set, is_gettable)
+_FastMethods = Tuple[Callable[..., Any], Callable[..., bool], Callable[[], bool]]
+
+
+class _ThreadScopedDeferredDefault:
+    # A deferred_default wrapper that calls the function once per thread.
+    __slots__ = ("deferred_default", "values", "__weakref__")
+
+    def __init__(self, deferred_default: Callable[[], Any]) -> None:
+        self.deferred_default = deferred_default
+        self.values = threading.local()
+        _scoped_deferred_defaults.add(self)
+
+    def __call__(self) -> Any:
+        try:
+            return self.values.value
+        except AttributeError:
+            # Only the current thread writes to its thread-local storage, so no lock is needed.
+            value = self.values.value = self.deferred_default()
+            return value
+
+    def _reset_after_fork(self) -> None:
+        self.values = threading.local()
+
+
+class _ProcessScopedDeferredDefault:
+    # A deferred_default wrapper that calls the function once per process.
+    __slots__ = ("deferred_default", "value", "lock", "__weakref__")
+
+    def __init__(self, deferred_default: Callable[[], Any]) -> None:
+        self.deferred_default = deferred_default
+        self.value: Any = _NOT_SET
+        self.lock = threading.RLock()
+        _scoped_deferred_defaults.add(self)
+
+    def __call__(self) -> Any:
+        # Double-checked locking: the lock is taken only until the value is produced.
+        value = self.value
+        if value is _NOT_SET:
+            with self.lock:
+                value = self.value
+                if value is _NOT_SET:
+                    value = self.value = self.deferred_default()
+        return value
+
+    def _reset_after_fork(self) -> None:
+        # The lock may be held by a thread that doesn't exist in the child process.
+        self.lock = threading.RLock()
+        self.value = _NOT_SET
+
+
+_SCOPED_DEFERRED_DEFAULT_FACTORIES = {
+    "context": lambda deferred_default: deferred_default,
+    "thread": _ThreadScopedDeferredDefault,
+    "process": _ProcessScopedDeferredDefault,
+}
+
+_scoped_deferred_defaults: "WeakSet[Any]" = WeakSet()
+
+
+def _reset_scoped_deferred_defaults_after_fork() -> None:
+    for scoped_deferred_default in list(_scoped_deferred_defaults):
+        scoped_deferred_default._reset_after_fork()  # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch (not available on Windows)
+    os.register_at_fork(after_in_child=_reset_scoped_deferred_defaults_after_fork)
+
 
 def _new_context_var(
     name: str,
@@ -892,3 +1270,35 @@ class ContextVarNotSetError(ExceptionDocstringMixin, AttributeError, LookupError
       So, to fit both cases, this exception uses both ``AttributeErrror`` and ``LookupError``
       as base classes.
     """
+
+
+class DeleteStrictContextVarError(ExceptionDocstringMixin, AttributeError):
+    """Can't delete strict context variable: '{context_var_name}'.
+
+    This exception is raised when you call :meth:`ContextVarDescriptor.delete`
+    or :meth:`ContextVarDescriptor.reset_to_default` on a variable created with ``strict=True``,
+    like this::
+
+        >>> timezone_var = ContextVarDescriptor("timezone_var", default="UTC", strict=True)
+        >>> timezone_var.reset_to_default()
+        Traceback (most recent call last):
+        ...
+        contextvars_registry.context_var_descriptor.DeleteStrictContextVarError: ...
+
+    Strict variables trade the deletion feature for performance
+    (see :attr:`ContextVarDescriptor.strict`). So, to solve the issue, you can either:
+
+    1. Restore the previous value using :class:`~contextvars.Token`, returned by the
+       :meth:`ContextVarDescriptor.set` method (or use ``with registry(...)`` that does it for you).
+
+    2. Run your code in a copy of the context (see :mod:`contextvars_registry.context_management`),
+       so all changes are discarded automatically when the code finishes.
+
+    3. Remove the ``strict=True`` flag, and thus enable deletion for the variable.
+
+    .. Note::
+
+      This exception is a subclass of ``AttributeError``, because it is also raised by
+      the ``del`` operator (like ``del registry.timezone``), and ``AttributeError`` is what
+      Python raises when an attribute cannot be deleted.
+    """
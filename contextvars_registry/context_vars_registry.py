@@ -1,18 +1,39 @@
 import abc
+import functools
 import threading
-from contextlib import ExitStack
+from collections.abc import ItemsView, Mapping, ValuesView
 from contextvars import ContextVar, Token
 from types import FunctionType, MethodType
-from typing import Any, ClassVar, Dict, Iterable, Iterator, MutableMapping, Tuple, get_type_hints
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    get_type_hints,
+)
 
 from sentinel_value import sentinel
 
 from contextvars_registry.context_var_descriptor import (
-    ContextVarDescriptor,
     DELETED,
     NO_DEFAULT,
+    RESET_TO_DEFAULT,
+    ContextVarDescriptor,
+    DeleteStrictContextVarError,
 )
 from contextvars_registry.internal_utils import ExceptionDocstringMixin
+from contextvars_registry.packed_context_var_descriptor import (
+    PackedContextVarDescriptor,
+    PackedRecord,
+)
 
 
 class ContextVarsRegistryMeta(abc.ABCMeta):
@@ -65,8 +86,126 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
         >>> current = CurrentVars()
         >>> current.timezone = 'UTC'
         AttributeError: ...
+
+    The allocation can also be disabled later, at run time,
+    using the :func:`seal_context_vars_registry` function.
+    """
+
+    _registry_strict: ClassVar[bool] = False
+    """Allocate strict context variables (that can't be deleted, but are faster to read)?
+
+    If set to True, then all variables allocated by the registry are created with ``strict=True``
+    (see :attr:`ContextVarDescriptor.strict <.context_var_descriptor.ContextVarDescriptor.strict>`).
+
+    That makes attribute access a bit faster (almost as fast as a raw ``ContextVar.get()`` call),
+    but in exchange, attributes can't be deleted:
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     _registry_strict = True
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.locale = 'en_GB'
+
+        >>> del current.locale
+        Traceback (most recent call last):
+        ...
+        contextvars_registry.context_var_descriptor.DeleteStrictContextVarError: ...
+
+    Values can still be restored using the ``with registry(...)`` syntax,
+    or by running code in a copy of the context (see :mod:`.context_management`).
+
+    This setting doesn't affect :class:`ContextVarDescriptor` objects that you create manually
+    in the class body (because then you pass the ``strict`` flag directly to the constructor).
+    """
+
+    _registry_packed: ClassVar[bool] = False
+    """Store all variables of the registry in a single ContextVar?
+
+    By default, each registry attribute gets its own :class:`~contextvars.ContextVar` object.
+    That is fine for small registries, but a registry with many attributes adds many entries
+    to each :class:`~contextvars.Context`, and it makes save/restore operations slower.
+
+    If set to True, then the registry allocates one :class:`~contextvars.ContextVar` for the
+    whole registry (see :attr:`_registry_packed_var`), and stores values of all attributes
+    there, as an immutable tuple, where each attribute occupies its own slot.
+    The attribute access syntax stays the same::
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     _registry_packed = True
+        ...     locale: str = 'en'
+        ...     timezone: str = 'UTC'
+
+        >>> current = CurrentVars()
+        >>> current.timezone = 'GMT'
+        >>> current.timezone
+        'GMT'
+
+        >>> CurrentVars._registry_packed_var.get()
+        (<RESET_TO_DEFAULT>, 'GMT')
+
+    The trade-off is that setting an attribute becomes slower (it copies the whole tuple),
+    and reading is slightly slower too (there are no direct shortcuts to C methods).
+    So this mode is good for big registries where attributes are read more often than written.
+
+    Attributes are backed by
+    :class:`~contextvars_registry.packed_context_var_descriptor.PackedContextVarDescriptor`
+    objects (except for :class:`ContextVarDescriptor` objects that you create manually
+    in the class body, these keep their own :class:`~contextvars.ContextVar` objects).
+    """
+
+    _registry_packed_var: ClassVar["ContextVar[PackedRecord]"]
+    """The :class:`~contextvars.ContextVar` that holds all values of a packed registry.
+
+    Exists only if :attr:`_registry_packed` is set to True.
+    """
+
+    _registry_track_set_fields: ClassVar[bool] = False
+    """Keep track of variables that are set, to make iteration over the registry faster?
+
+    By default, iterating over the registry (as well as ``len()``, ``keys()``, ``dict()``, etc)
+    checks every declared variable, so it is slow for registries with many variables,
+    even if only a few of them are set.
+
+    If set to True, then the registry maintains an index of variables that were set in
+    the current context (a bit mask, stored in :attr:`_registry_set_fields_var`),
+    and the iteration checks only these variables (plus ones that have default values)::
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     _registry_track_set_fields = True
+        ...     locale: str = 'en'
+        ...     timezone: str
+        ...     user_id: int
+
+        >>> current = CurrentVars()
+        >>> current.user_id = 42
+        >>> dict(current)
+        {'locale': 'en', 'user_id': 42}
+
+    The trade-off is that setting a variable becomes slower (it has to update the index).
+
+    .. caution::
+        The index is updated by methods of :class:`ContextVarDescriptor` objects allocated by
+        the registry. If you bypass them, and set the underlying :class:`~contextvars.ContextVar`
+        directly, then the registry won't see the new value.
+
+        :class:`ContextVarDescriptor` objects that you create manually in the class body
+        are not tracked (they're checked on every iteration, as usual).
+    """
+
+    _registry_set_fields_var: ClassVar["ContextVar[int]"]
+    """The :class:`~contextvars.ContextVar` that contains the index of set variables.
+
+    The index is a bit mask (an integer), where each registry variable owns 1 bit.
+    The bit is set when the variable is set, and never cleared, so the mask may contain
+    variables that are deleted or reset (they're skipped on iteration).
+
+    Exists only if :attr:`_registry_track_set_fields` is set to True.
     """
 
+    __set_fields_index: ClassVar[List[Tuple[str, ContextVarDescriptor]]]
+    __always_set_fields_mask: ClassVar[int]
+
     _registry_var_descriptors: ClassVar[Dict[str, ContextVarDescriptor]]
     """A dictionary of all context vars in the registry.
 
@@ -79,6 +218,33 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
     It is just kept for the convenience, and maybe small performance improvements.
     """
 
+    _registry_declared_var_names: ClassVar[Tuple[str, ...]]
+    """Names of variables declared in the class body (in the order of declaration).
+
+    Unlike :attr:`_registry_var_descriptors`, this tuple is computed once, when the class
+    is created, and it doesn't include variables that are allocated on the fly.
+    So it is stable, and the position of a name in it can be used as a numeric ID of
+    the variable (see :mod:`contextvars_registry.serialization`).
+    """
+
+    _registry_class_var_names: ClassVar[FrozenSet[str]]
+    """Names of attributes that are annotated with :data:`typing.ClassVar`.
+
+    These attributes are never converted to context variables (and can't be set via registry
+    instances). The set is computed once, when the class is created, because evaluating
+    type hints is slow (see :meth:`_registry_reload_type_hints`).
+    """
+
+    _registry_override_cache: ClassVar[Dict[Tuple[str, ...], Tuple[ContextVarDescriptor, ...]]]
+    """A cache for the ``with registry(...)`` feature (see :meth:`__call__`).
+
+    Keys are tuples of attribute names (as they're passed to ``registry(...)``),
+    and values are tuples of :class:`ContextVarDescriptor` objects that back these attributes.
+
+    The cache is bounded in size, and contains only sets of attributes that are all
+    context variables (attributes like ``@property`` are not cached).
+    """
+
     _registry_var_allocate_lock: ClassVar[threading.RLock]
     """A lock that protects against race conditions during cration of new ContextVar() objects.
 
@@ -141,11 +307,107 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
         """
         return _OverrideRegistryAttrsTemporarily(self, attr_names_and_values)
 
+    def snapshot(self) -> "RegistrySnapshot":
+        """Take a snapshot of all variables in the registry.
+
+        The snapshot can be restored later, using the :meth:`restore` method::
+
+            >>> class CurrentVars(ContextVarsRegistry):
+            ...     locale: str = 'en'
+            ...     timezone: str = 'UTC'
+            ...     user_id: int
+
+            >>> current = CurrentVars()
+            >>> snapshot = current.snapshot()
+
+            >>> current.locale = 'en_GB'
+            >>> current.user_id = 42
+            >>> del current.timezone
+
+            >>> current.restore(snapshot)
+            >>> dict(current)
+            {'locale': 'en', 'timezone': 'UTC'}
+
+        This is a faster alternative to :func:`save_context_vars_registry`.
+        The snapshot is an immutable object (a tuple) that contains a tuple of raw values
+        (and, for :attr:`_registry_packed` registries, the whole packed record is saved
+        as a single object, so taking a snapshot is O(1) there).
+        """
+        cls = self.__class__
+        _RESET_TO_DEFAULT = RESET_TO_DEFAULT
+        # tuple.__new__() is the same as RegistrySnapshot(...), but skips the slow Python-level
+        # RegistrySnapshot.__new__() method, generated by NamedTuple.
+        return _tuple_new(
+            RegistrySnapshot,
+            (
+                cls,
+                tuple([var.get_raw(_RESET_TO_DEFAULT) for var in cls.__snapshot_var_descriptors]),
+                cls._registry_packed_var.get() if cls._registry_packed else None,
+                cls._registry_set_fields_var.get() if cls._registry_track_set_fields else None,
+            ),
+        )
+
+    def restore(self, snapshot: "RegistrySnapshot") -> None:
+        """Restore variables from a snapshot, previously taken by :meth:`snapshot`.
+
+        Only variables that were changed since the snapshot are written.
+        The values are compared by identity (the ``is`` operator), so this is cheap,
+        and unchanged variables are skipped without calling :meth:`ContextVar.set`.
+
+        Variables that were not set (or were allocated after the snapshot was taken)
+        are reset to their default values.
+
+        :raises DeleteStrictContextVarError: if a :attr:`strict <ContextVarDescriptor.strict>`
+            variable (without default value) was not set in the snapshot, but is set now
+            (because strict variables can't be unset).
+        :raises RegistrySnapshotMismatchError: if the snapshot was taken from a different registry
+        """
+        cls = self.__class__
+        if snapshot.registry_class is not cls:
+            raise RegistrySnapshotMismatchError.format(
+                snapshot_class_name=snapshot.registry_class.__name__,
+                registry_class_name=cls.__name__,
+            )
+
+        _RESET_TO_DEFAULT = RESET_TO_DEFAULT
+        var_descriptors = cls.__snapshot_var_descriptors
+        values = snapshot.values
+        for var, value in zip(var_descriptors, values):
+            # Most variables are not changed, so check that here, avoiding an extra function call.
+            if var.get_raw(_RESET_TO_DEFAULT) is not value:
+                _restore_var_value(var, value)
+        for var in var_descriptors[len(values) :]:
+            _restore_var_value(var, _RESET_TO_DEFAULT)
+
+        if cls._registry_packed:
+            if cls._registry_packed_var.get() is not snapshot.packed_record:
+                cls._registry_packed_var.set(snapshot.packed_record)  # type: ignore[arg-type]
+
+        if cls._registry_track_set_fields:
+            if cls._registry_set_fields_var.get() != snapshot.set_fields_mask:
+                cls._registry_set_fields_var.set(snapshot.set_fields_mask)  # type: ignore[arg-type]
+
+    __snapshot_var_descriptors: ClassVar[Tuple[ContextVarDescriptor, ...]]
+
+    @classmethod
+    def __add_to_snapshot_var_descriptors(cls, descriptor):
+        # Packed variables are saved all at once (as a record), so here we need only
+        # variables that have their own ContextVar objects.
+        if not isinstance(descriptor, PackedContextVarDescriptor):
+            cls.__snapshot_var_descriptors += (descriptor,)
+
     def __init_subclass__(cls):
         cls.__ensure_subclassed_properly()
         cls._registry_var_descriptors = {}
+        cls.__snapshot_var_descriptors = ()
         cls._registry_var_allocate_lock = threading.RLock()
-        cls.__convert_attrs_to_var_descriptors()
+        cls._registry_override_cache = {}
+        cls.__init_packed_var()
+        cls.__init_set_fields_index()
+        type_hints = get_type_hints(cls)
+        cls.__init_class_var_names(type_hints)
+        cls.__convert_attrs_to_var_descriptors(type_hints)
+        cls._registry_declared_var_names = tuple(cls._registry_var_descriptors)
         cls.__init_var_allocation_on_setattr()
         super().__init_subclass__()
 
@@ -154,6 +416,101 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
         if ContextVarsRegistry not in cls.__bases__:
             raise RegistryInheritanceError
 
+    @classmethod
+    def __init_packed_var(cls):
+        if cls._registry_packed:
+            packed_var_name = f"{cls.__module__}.{cls.__name__}"
+            cls._registry_packed_var = ContextVar(packed_var_name, default=())
+
+    @classmethod
+    def __init_class_var_names(cls, type_hints: Dict[str, Any]):
+        cls._registry_class_var_names = frozenset(
+            attr_name for attr_name, type_hint in type_hints.items() if _is_class_var(type_hint)
+        )
+
+    @classmethod
+    def _registry_reload_type_hints(cls) -> None:
+        """Re-read type hints of the registry class.
+
+        Type hints are evaluated only once, when the registry class is created,
+        and then the result is cached (see :attr:`_registry_class_var_names`).
+
+        So if you modify type hints of the class at run time (which you normally shouldn't do),
+        then you have to call this method to update the cache::
+
+            >>> class CurrentVars(ContextVarsRegistry):
+            ...     locale: str = 'en'
+
+            >>> CurrentVars.__annotations__['app_name'] = ClassVar[str]
+            >>> CurrentVars._registry_reload_type_hints()
+
+            >>> current = CurrentVars()
+            >>> current.app_name = 'My App'
+            Traceback (most recent call last):
+            ...
+            contextvars_registry.context_vars_registry.SetClassVarAttributeError: ...
+
+        Only new :data:`~typing.ClassVar` annotations are picked up.
+        Variables that are already allocated are not affected.
+        """
+        with cls._registry_var_allocate_lock:
+            cls.__init_class_var_names(get_type_hints(cls))
+
+    @classmethod
+    def __init_set_fields_index(cls):
+        if cls._registry_track_set_fields:
+            set_fields_var_name = f"{cls.__module__}.{cls.__name__}._registry_set_fields_var"
+            cls._registry_set_fields_var = ContextVar(set_fields_var_name, default=0)
+            cls.__set_fields_index = []
+            cls.__always_set_fields_mask = 0
+
+    @classmethod
+    def __add_to_set_fields_index(cls, attr_name, descriptor, is_tracked):
+        if not cls._registry_track_set_fields:
+            return
+
+        field_bit = 1 << len(cls.__set_fields_index)
+        cls.__set_fields_index.append((attr_name, descriptor))
+
+        # Variables that are not tracked are always checked by __iter__().
+        # That includes variables with static default values: they're present in the registry
+        # even if they were never set (and thus never marked in the bit mask).
+        if is_tracked:
+            cls.__track_set_field(descriptor, field_bit)
+        if not is_tracked or (descriptor.default is not NO_DEFAULT):
+            cls.__always_set_fields_mask |= field_bit
+
+    @classmethod
+    def __track_set_field(cls, descriptor, field_bit):
+        # Wrap the descriptor.set() method, so that it marks the variable in the bit mask.
+        # Other modifying methods, like .delete() and .reset_to_default(), call .set() internally,
+        # and thus don't need to be wrapped.
+        descriptor_set = descriptor.set
+        set_fields_var_get = cls._registry_set_fields_var.get
+        set_fields_var_set = cls._registry_set_fields_var.set
+
+        def _method_ContextVarDescriptor_set_tracked(value):
+            set_fields_mask = set_fields_var_get()
+            if not set_fields_mask & field_bit:
+                set_fields_var_set(set_fields_mask | field_bit)
+            return descriptor_set(value)
+
+        descriptor.set = _method_ContextVarDescriptor_set_tracked
+
+    @classmethod
+    def _mark_set_fields(cls, attr_names: Iterable[str]) -> None:
+        # Mark variables as set, for cases when they're modified bypassing descriptor.set() calls
+        # (like _restore_packed_context_vars_registry() does).
+        if not cls._registry_track_set_fields:
+            return
+
+        attr_names = set(attr_names)
+        set_fields_mask = cls._registry_set_fields_var.get()
+        for field_num, (attr_name, _) in enumerate(cls.__set_fields_index):
+            if attr_name in attr_names:
+                set_fields_mask |= 1 << field_num
+        cls._registry_set_fields_var.set(set_fields_mask)
+
     @classmethod
     def __init_var_allocation_on_setattr(cls):
         if not cls._registry_allocate_on_setattr:
@@ -180,8 +537,13 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
             __setattr__ is object.__setattr__
         ), "Customizing __setattr__() is not allowed (because then super() won't work correctly)"
 
+        # Most of the time, attributes are already allocated, so the fast path is to check
+        # the dict of descriptors (that is faster than hasattr() that walks over the MRO,
+        # and calls the descriptor's __get__() method).
+        var_descriptors = cls._registry_var_descriptors
+
         def _ContextVarsRegistry__setattr__(self, attr_name, value):
-            if not hasattr(cls, attr_name):
+            if (attr_name not in var_descriptors) and not hasattr(cls, attr_name):
                 cls.__before_set__ensure_allocated(attr_name, value)
             __setattr__(self, attr_name, value)
 
@@ -192,8 +554,8 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
     # pylint: disable=unused-private-member
 
     @classmethod
-    def __convert_attrs_to_var_descriptors(cls):
-        for attr_name, type_hint, attr_value in _get_attr_type_hints_and_values(cls):
+    def __convert_attrs_to_var_descriptors(cls, type_hints: Dict[str, Any]):
+        for attr_name, type_hint, attr_value in _get_attr_type_hints_and_values(cls, type_hints):
             # Skip already initialized descriptors.
             #
             # This is needed to be able to do just this:
@@ -203,6 +565,8 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
             # So here we adopt such already existing descriptors.
             if isinstance(attr_value, ContextVarDescriptor):
                 cls._registry_var_descriptors[attr_name] = attr_value
+                cls.__add_to_set_fields_index(attr_name, attr_value, is_tracked=False)
+                cls.__add_to_snapshot_var_descriptors(attr_value)
                 continue
 
             # For other attributes, we may convert them to ContextVarDescriptor
@@ -253,10 +617,30 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
             value = getattr(cls, attr_name, NO_DEFAULT)
             assert not isinstance(value, (ContextVar, ContextVarDescriptor))
 
-            descriptor: ContextVarDescriptor = ContextVarDescriptor(default=value)
+            descriptor: ContextVarDescriptor
+            if cls._registry_packed:
+                descriptor = PackedContextVarDescriptor(
+                    packed_var=cls._registry_packed_var,
+                    slot=cls.__count_packed_var_descriptors(),
+                    default=value,
+                    strict=cls._registry_strict,
+                )
+            else:
+                descriptor = ContextVarDescriptor(default=value, strict=cls._registry_strict)
+
             descriptor.__set_name__(cls, attr_name)
             setattr(cls, attr_name, descriptor)
             cls._registry_var_descriptors[attr_name] = descriptor
+            cls.__add_to_set_fields_index(attr_name, descriptor, is_tracked=True)
+            cls.__add_to_snapshot_var_descriptors(descriptor)
+
+    @classmethod
+    def __count_packed_var_descriptors(cls) -> int:
+        return sum(
+            1
+            for descriptor in cls._registry_var_descriptors.values()
+            if isinstance(descriptor, PackedContextVarDescriptor)
+        )
 
     def __init__(self):
         self.__ensure_subclassed_properly()
@@ -272,11 +656,12 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
 
     @classmethod
     def __before_set__allocate_var_descriptor(cls, attr_name, value):
-        assert cls._registry_allocate_on_setattr
+        if not cls._registry_allocate_on_setattr:
+            raise AttributeError(f"'{cls.__name__}' object has no attribute '{attr_name}'")
         assert not hasattr(cls, attr_name)
         assert attr_name not in cls._registry_var_descriptors
 
-        if _is_annotated_with_class_var(cls, attr_name):
+        if attr_name in cls._registry_class_var_names:
             raise SetClassVarAttributeError.format(
                 class_name=cls.__name__,
                 attr_name=attr_name,
@@ -289,10 +674,51 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
     def __iter__(self) -> Iterator[str]:
         return (
             key
-            for (key, ctx_var) in self._registry_var_descriptors.items()
+            for (key, ctx_var) in self.__iter_var_descriptors()
             if ctx_var.is_set(on_default=True, on_deferred_default=False)
         )
 
+    @classmethod
+    def __iter_var_descriptors(cls) -> Iterable[Tuple[str, ContextVarDescriptor]]:
+        # Get (key, descriptor) pairs of variables that may be set in the current context.
+        # It is a superset, so each variable still needs to be checked with .is_set().
+        if cls._registry_track_set_fields:
+            return cls.__iter_set_fields_index()
+        return cls._registry_var_descriptors.items()
+
+    @classmethod
+    def __iter_set_fields_index(cls) -> Iterator[Tuple[str, ContextVarDescriptor]]:
+        # Iterate over bits of the mask, from the lowest to the highest one
+        # (that gives the same order as iteration over _registry_var_descriptors).
+        #
+        # The mask is a superset of variables that are actually set
+        # (some of them may be deleted or reset), so each variable is still checked by callers.
+        set_fields_index = cls.__set_fields_index
+        set_fields_mask = cls.__always_set_fields_mask | cls._registry_set_fields_var.get()
+
+        while set_fields_mask:
+            lowest_bit = set_fields_mask & -set_fields_mask
+            set_fields_mask ^= lowest_bit
+            yield set_fields_index[lowest_bit.bit_length() - 1]
+
+    def _iter_items(self) -> Iterator[Tuple[str, Any]]:
+        # The same as the generic ItemsView iteration, but values are read while iterating over
+        # descriptors, without extra __getitem__() calls (and KeyError exceptions) for each key.
+        _NO_DEFAULT = NO_DEFAULT
+        _NO_VALUE = _NO_ATTR_VALUE
+
+        for key, ctx_var in self.__iter_var_descriptors():
+            value = ctx_var.get(_NO_VALUE)
+            if value is _NO_VALUE:
+                # Not set, but may have a default value (here only the static default counts,
+                # so most variables are skipped without calling the slower .is_set() method).
+                if ctx_var.default is _NO_DEFAULT:
+                    continue
+                if not ctx_var.is_set(on_default=True, on_deferred_default=False):
+                    continue
+                value = ctx_var.default
+            yield (key, value)
+
     def __len__(self):
         return sum(1 for _ in self.__iter__())
 
@@ -317,13 +743,158 @@ class ContextVarsRegistry(MutableMapping[str, Any], metaclass=ContextVarsRegistr
 
         ctx_var.delete()
 
+    # Methods below are inherited from MutableMapping, but re-implemented for performance.
+    #
+    # The base implementations are generic: they're built on top of __getitem__()/__setitem__(),
+    # and use exceptions for control flow (e.g., __contains__() catches KeyError).
+    # Here they work with _registry_var_descriptors directly, and don't raise exceptions
+    # for missing/unset keys.
+
+    def __contains__(self, key: object) -> bool:
+        ctx_var = self._registry_var_descriptors.get(key)  # type: ignore[call-overload]
+        return (ctx_var is not None) and ctx_var.is_gettable()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        ctx_var = self._registry_var_descriptors.get(key)
+        if ctx_var is None:
+            return default
+        value = _get_var_value(ctx_var)
+        return default if (value is _NO_ATTR_VALUE) else value
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        ctx_var = self._registry_var_descriptors.get(key)
+        if ctx_var is None:
+            ctx_var = self.__before_set__ensure_allocated(key, default)
+        else:
+            value = _get_var_value(ctx_var)
+            if value is not _NO_ATTR_VALUE:
+                return value
+        ctx_var.set(default)
+        return default
+
+    def pop(self, key: str, default: Any = NO_DEFAULT) -> Any:
+        ctx_var = self._registry_var_descriptors.get(key)
+        if ctx_var is not None:
+            value = _get_var_value(ctx_var)
+            if value is not _NO_ATTR_VALUE:
+                ctx_var.delete()
+                return value
+        if default is NO_DEFAULT:
+            raise KeyError(key)
+        return default
+
+    def update(self, other: Any = (), /, **kwargs: Any) -> None:
+        if isinstance(other, Mapping):
+            self.__set_items(other.items())
+        elif hasattr(other, "keys"):
+            self.__set_items((key, other[key]) for key in other.keys())
+        else:
+            self.__set_items(other)
+        self.__set_items(kwargs.items())
+
+    @classmethod
+    def __set_items(cls, items: Iterable[Tuple[str, Any]]) -> None:
+        descriptors = cls._registry_var_descriptors
+        for key, value in items:
+            ctx_var = descriptors.get(key)
+            if ctx_var is None:
+                ctx_var = cls.__before_set__ensure_allocated(key, value)
+            ctx_var.set(value)
+
+    def clear(self) -> None:
+        # Delete all variables that are visible via iteration (the same as the base
+        # MutableMapping.clear() does by calling .popitem() in a loop).
+        for _, ctx_var in self.__iter_var_descriptors():
+            if ctx_var.is_set(on_default=True, on_deferred_default=False):
+                ctx_var.delete()
+
+    def items(self) -> "_ContextVarsRegistryItemsView":
+        return _ContextVarsRegistryItemsView(self)
+
+    def values(self) -> "_ContextVarsRegistryValuesView":
+        return _ContextVarsRegistryValuesView(self)
+
+
+class _ContextVarsRegistryItemsView(ItemsView):
+    """The ``ContextVarsRegistry.items()`` view, that doesn't call ``__getitem__()`` for each key.
+
+    Only iteration is sped up: ``len()`` is still a separate pass over variables
+    (and ``list()`` calls ``len()`` before iterating), like in other mapping views.
+    """
+
+    _mapping: ContextVarsRegistry
+
+    def __iter__(self):
+        return self._mapping._iter_items()
+
+
+class _ContextVarsRegistryValuesView(ValuesView):
+    """The ``ContextVarsRegistry.values()`` view, that doesn't call ``__getitem__()`` for each key.
+
+    Like in :class:`_ContextVarsRegistryItemsView`, ``len()`` is still a separate pass.
+    """
+
+    _mapping: ContextVarsRegistry
+
+    def __iter__(self):
+        return (value for (_, value) in self._mapping._iter_items())
+
+
+class RegistrySnapshot(NamedTuple):
+    """A saved state of :class:`ContextVarsRegistry`.
+
+    It is returned by :meth:`ContextVarsRegistry.snapshot`,
+    and accepted by :meth:`ContextVarsRegistry.restore` (see docs there).
+
+    The object is immutable and opaque (you shouldn't rely on its attributes).
+    """
+
+    registry_class: Type[ContextVarsRegistry]
+    values: Tuple[Any, ...]
+    packed_record: Optional[PackedRecord]
+    set_fields_mask: Optional[int]
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} of {self.registry_class.__name__}>"
+
+
+def _restore_var_value(var: ContextVarDescriptor, value: Any) -> None:
+    # Write a raw value (previously obtained via .get_raw(RESET_TO_DEFAULT)),
+    # but only if it is changed (compared by identity, to keep it cheap).
+    if var.get_raw(RESET_TO_DEFAULT) is value:
+        return
+
+    # Strict variables can't contain the RESET_TO_DEFAULT marker, so they can't be reset.
+    # The best we can do is to set the default value explicitly (if there is one).
+    if (value is RESET_TO_DEFAULT) and var.strict:
+        if var.default is NO_DEFAULT:
+            raise DeleteStrictContextVarError.format(context_var_name=var.name)
+        value = var.default
+
+    var.set(value)
+
+
+_tuple_new = tuple.__new__
 
 _NO_ATTR_VALUE = sentinel("_NO_VALUE")
 _NO_TYPE_HINT = sentinel("_NO_TYPE_HINT")
 
 
-def _get_attr_type_hints_and_values(cls: object) -> Iterable[Tuple[str, Any, Any]]:
-    type_hints = get_type_hints(cls)
+def _get_var_value(ctx_var: ContextVarDescriptor) -> Any:
+    # Get value of the variable (including default and deferred default values),
+    # or return _NO_ATTR_VALUE if the variable is not gettable (without raising LookupError).
+    #
+    # The .get(_NO_ATTR_VALUE) call covers the most common case (the variable is set),
+    # but it masks default values, so for unset variables we have to call .get() again.
+    value = ctx_var.get(_NO_ATTR_VALUE)
+    if (value is _NO_ATTR_VALUE) and ctx_var.is_gettable():
+        value = ctx_var.get()
+    return value
+
+
+def _get_attr_type_hints_and_values(
+    cls: object, type_hints: Dict[str, Any]
+) -> Iterable[Tuple[str, Any, Any]]:
     cls_attrs = vars(cls)
 
     for attr_name, type_hint in type_hints.items():
@@ -336,11 +907,6 @@ def _get_attr_type_hints_and_values(cls: object) -> Iterable[Tuple[str, Any, Any
         yield (attr_name, _NO_TYPE_HINT, attr_value)
 
 
-def _is_annotated_with_class_var(cls: type, attr_name: str) -> bool:
-    type_hints = get_type_hints(cls)
-    return (attr_name in type_hints) and _is_class_var(type_hints[attr_name])
-
-
 def _is_class_var(type_hint: object) -> bool:
     origin = getattr(type_hint, "__origin__", None)
     return origin is ClassVar
@@ -362,49 +928,155 @@ def _is_lambda(obj: object) -> bool:
     return isinstance(obj, FunctionType) and (obj.__name__ == "<lambda>")
 
 
-class _OverrideRegistryAttrsTemporarily(ExitStack):
+class _OverrideRegistryAttrsTemporarily:
     """Helper for :class:`ContextVarsRegistry` that implements ``with registry(var=value)`` feature.
 
     On ``__enter__``, it sets registry attributes to the new values.
-    On ``__exit__``, it restores the old values (using features of the base :class:`ExitStack`).
+    On ``__exit__``, it restores the old values (in reverse order).
+
+    Restoring is done on the best-effort basis: if some attribute can't be restored
+    (an exception is raised), then it still tries to restore all other attributes,
+    and only then re-raises the exception (the same as :class:`contextlib.ExitStack` does).
 
-    The base ``ExitStack`` class is used mostly because of its nice exception handling feature
-    (on exit, it tries to reset as much attributes as possible, despite of exceptions being thrown).
+    The ``with registry(...)`` statement is often used in tight loops, so this class is optimized
+    for the common case, when all attributes are context variables: descriptors are resolved once
+    per set of attribute names (and cached in :attr:`ContextVarsRegistry._registry_override_cache`),
+    and reset functions and tokens are stored in one flat list, without extra closures.
 
     See documentation for :meth:`ContextVarsRegistry.__call__` for details about this feature.
     """
 
+    __slots__ = ("registry", "attr_names_and_values", "undo_list")
+
     registry: ContextVarsRegistry
     attr_names_and_values: Dict[str, Any]
 
+    undo_list: List[Any]
+    """A flat list of undo functions and their arguments: ``[func1, arg1, func2, arg2, ...]``."""
+
     def __init__(self, registry: ContextVarsRegistry, attr_names_and_values: Dict[str, Any]):
         self.registry = registry
         self.attr_names_and_values = attr_names_and_values
-        super().__init__()
 
     def __enter__(self):
+        undo_list: List[Any] = []
+        self.undo_list = undo_list
+
+        attr_names_and_values = self.attr_names_and_values
+        override_cache = self.registry._registry_override_cache
+        try:
+            descriptors = override_cache[tuple(attr_names_and_values)]
+        except KeyError:
+            self.__enter_slow_path()
+            return
+
+        try:
+            for descriptor, new_value in zip(descriptors, attr_names_and_values.values()):
+                token = descriptor.set(new_value)
+                undo_list.append(descriptor.reset)
+                undo_list.append(token)
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+
+    def __enter_slow_path(self):
         registry = self.registry
         registry_class = registry.__class__
+        undo_list = self.undo_list
+        descriptors = []
 
-        for attr_name, new_value in self.attr_names_and_values.items():
-            # In case of ContextVarDescriptor, use its special set()/reset() methods.
-            # Otherwise, call standard setattr()/delattr() that work with any kind of attributes.
-            #
-            # Why not just always use the standard attribute calls?
-            # Because ContextVar.reset() implements a special behavior: it can restore a special
-            # "unset" state of the ContextVar object, which is not achievable by setting attributes.
-            # So I had to implement the special case for context variables here.
-            descriptor = getattr(registry_class, attr_name, None)
-            if isinstance(descriptor, ContextVarDescriptor):
-                reset_token: Token = descriptor.set(new_value)
-                self.callback(descriptor.reset, reset_token)  # will be called on __exit__
-            else:
-                old_value = getattr(registry, attr_name, _NO_ATTR_VALUE)
-                setattr(registry, attr_name, new_value)
-                if old_value is _NO_ATTR_VALUE:
-                    self.callback(delattr, registry, attr_name)
+        try:
+            for attr_name, new_value in self.attr_names_and_values.items():
+                # In case of ContextVarDescriptor, use its special set()/reset() methods.
+                # Otherwise, call standard setattr()/delattr() that work with any attributes.
+                #
+                # Why not just always use the standard attribute calls?
+                # Because ContextVar.reset() implements a special behavior: it can restore
+                # a special "unset" state of the ContextVar object, which is not achievable
+                # by setting attributes. So I had to implement the special case here.
+                descriptor = getattr(registry_class, attr_name, None)
+                if isinstance(descriptor, ContextVarDescriptor):
+                    descriptors.append(descriptor)
+                    reset_token: Token = descriptor.set(new_value)
+                    undo_list.append(descriptor.reset)
+                    undo_list.append(reset_token)
                 else:
-                    self.callback(setattr, registry, attr_name, old_value)
+                    old_value = getattr(registry, attr_name, _NO_ATTR_VALUE)
+                    setattr(registry, attr_name, new_value)
+                    if old_value is _NO_ATTR_VALUE:
+                        undo_list.append(functools.partial(delattr, registry))
+                        undo_list.append(attr_name)
+                    else:
+                        undo_list.append(functools.partial(setattr, registry, attr_name))
+                        undo_list.append(old_value)
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+
+        # Cache descriptors, but only if all attributes are context variables
+        # (that is the only case supported by the fast path in __enter__).
+        override_cache = registry_class._registry_override_cache
+        if (len(descriptors) == len(self.attr_names_and_values)) and (
+            len(override_cache) < _OVERRIDE_CACHE_MAX_SIZE
+        ):
+            override_cache[tuple(self.attr_names_and_values)] = tuple(descriptors)
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        undo_list = self.undo_list
+        undo_error = None
+
+        for undo_func_index in range(len(undo_list) - 2, -1, -2):
+            try:
+                undo_list[undo_func_index](undo_list[undo_func_index + 1])
+            except BaseException as err:  # pylint: disable=broad-except
+                undo_error = err
+
+        undo_list.clear()
+        if undo_error is not None:
+            raise undo_error
+
+
+_OVERRIDE_CACHE_MAX_SIZE = 256
+
+
+def seal_context_vars_registry(registry_class: Type[ContextVarsRegistry]) -> None:
+    """Stop dynamic allocation of context variables in the registry.
+
+    After this call, the registry behaves as if it was declared with
+    :attr:`~ContextVarsRegistry._registry_allocate_on_setattr` set to False:
+    existing variables work as usual, but new ones can't be created::
+
+        >>> from contextvars_registry.context_vars_registry import (
+        ...    ContextVarsRegistry,
+        ...    seal_context_vars_registry,
+        ... )
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.user_id = 42  # allocated dynamically
+
+        >>> seal_context_vars_registry(CurrentVars)
+
+        >>> current.user_id = 43
+        >>> current.timezone = 'UTC'
+        Traceback (most recent call last):
+        ...
+        AttributeError: 'CurrentVars' object has no attribute 'timezone'...
+
+    The point is performance: the dynamic allocation is implemented via a custom ``__setattr__``
+    method (written in Python), and sealing restores the native ``object.__setattr__``,
+    so setting attributes becomes faster.
+
+    So you could call this function after your application is initialized,
+    and all variables are already allocated.
+    """
+    # pylint: disable=protected-access
+    with registry_class._registry_var_allocate_lock:
+        registry_class._registry_allocate_on_setattr = False
+        if "__setattr__" in vars(registry_class):
+            del registry_class.__setattr__
 
 
 def save_context_vars_registry(
@@ -415,11 +1087,31 @@ def save_context_vars_registry(
     The resulting dict can be used as argument to :func:`restore_context_vars_registry`.
     """
     # pylint: disable=protected-access
+    if registry._registry_packed:
+        return _save_packed_context_vars_registry(registry)
+
     return {
-        key: descriptor.get_raw() for key, descriptor in registry._registry_var_descriptors.items()
+        key: descriptor.get_raw(RESET_TO_DEFAULT)
+        for key, descriptor in registry._registry_var_descriptors.items()
     }
 
 
+def _save_packed_context_vars_registry(registry: ContextVarsRegistry) -> Dict[str, Any]:
+    # Read the packed record only once (instead of calling .get_raw() for each descriptor).
+    # pylint: disable=protected-access
+    packed_var = registry._registry_packed_var
+    record = packed_var.get()
+    record_len = len(record)
+
+    saved_state = {}
+    for key, descriptor in registry._registry_var_descriptors.items():
+        if isinstance(descriptor, PackedContextVarDescriptor) and descriptor.slot < record_len:
+            saved_state[key] = record[descriptor.slot]
+        else:
+            saved_state[key] = descriptor.get_raw(RESET_TO_DEFAULT)
+    return saved_state
+
+
 def restore_context_vars_registry(
     registry: ContextVarsRegistry,
     saved_registry_state: Dict[str, Any],
@@ -490,12 +1182,58 @@ def restore_context_vars_registry(
         So you prefer that decorator by default, and choose :func:`restore_registry_state`
         only when you can't use the decorator, or when you need to restore only 1 specific
         registry, not touching variables outside of the registry.
+
+        Also, if you don't need the state as a ``dict``, then there is a faster alternative:
+        :meth:`ContextVarsRegistry.snapshot` and :meth:`ContextVarsRegistry.restore`.
     """
-    get_saved_value = saved_registry_state.get
+    # pylint: disable=protected-access
+    if registry._registry_packed:
+        _restore_packed_context_vars_registry(registry, saved_registry_state)
+        return
+
+    for key, descriptor in registry._registry_var_descriptors.items():
+        try:
+            value = saved_registry_state[key]
+        except KeyError:
+            # A variable is missing in the saved state (e.g., it was allocated after the state
+            # was saved), so we delete it (and that raises an error for strict variables).
+            descriptor.delete()
+        else:
+            _restore_var_value(descriptor, value)
 
+
+def _restore_packed_context_vars_registry(
+    registry: ContextVarsRegistry,
+    saved_registry_state: Dict[str, Any],
+):
+    # Build the whole packed record, and write it to the ContextVar only once
+    # (calling .set() for each descriptor would copy the record N times).
     # pylint: disable=protected-access
+    packed_var = registry._registry_packed_var
+    values = list(packed_var.get())
+
     for key, descriptor in registry._registry_var_descriptors.items():
-        descriptor.context_var.set(get_saved_value(key, DELETED))
+        try:
+            value = saved_registry_state[key]
+        except KeyError:
+            if descriptor.strict:
+                raise DeleteStrictContextVarError.format(context_var_name=descriptor.name)
+            value = DELETED
+
+        if isinstance(descriptor, PackedContextVarDescriptor):
+            missing_slots_count = descriptor.slot + 1 - len(values)
+            if missing_slots_count > 0:
+                values.extend([RESET_TO_DEFAULT] * missing_slots_count)
+            values[descriptor.slot] = value
+        else:
+            _restore_var_value(descriptor, value)
+
+    packed_var.set(tuple(values))
+    registry._mark_set_fields(
+        key
+        for key, value in saved_registry_state.items()
+        if (value is not RESET_TO_DEFAULT) and (value is not DELETED)
+    )
 
 
 class RegistryInheritanceError(ExceptionDocstringMixin, TypeError):
@@ -541,6 +1279,19 @@ class RegistryInheritanceError(ExceptionDocstringMixin, TypeError):
     """
 
 
+class RegistrySnapshotMismatchError(ExceptionDocstringMixin, TypeError):
+    """Can't restore snapshot of {snapshot_class_name} into {registry_class_name}.
+
+    This exception is raised when you take a snapshot of one registry,
+    and then try to restore it into another registry, like this::
+
+        snapshot = {snapshot_class_name}().snapshot()
+        {registry_class_name}().restore(snapshot)
+
+    A snapshot can be restored only to the same registry class it was taken from.
+    """
+
+
 class SetClassVarAttributeError(ExceptionDocstringMixin, AttributeError):
     """Can't set ClassVar: '{class_name}.{attr_name}'.
 
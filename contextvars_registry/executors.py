@@ -0,0 +1,283 @@
+"""Executors that run tasks in a snapshot of the submitter's context."""
+
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import Context, copy_context
+from operator import is_
+from threading import get_ident
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, TypeVar
+
+from contextvars_registry.context_vars_registry import ContextVarsRegistry, RegistrySnapshot
+from contextvars_registry.serialization import (
+    encode_context_vars_registries,
+    restore_encoded_context_vars_registries,
+)
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class ContextVarsThreadPoolExecutor(ThreadPoolExecutor):
+    """A :class:`~concurrent.futures.ThreadPoolExecutor` that preserves context variables.
+
+    Normally, tasks submitted to a thread pool run in the worker thread's own context,
+    so they don't see context variables of the code that submitted them.
+
+    This executor takes a snapshot of the submitter's context, and runs each task in it.
+    It is a drop-in replacement for wrapping every submitted function with
+    :func:`~contextvars_registry.context_management.bind_to_snapshot_context`,
+    except that no wrapper function is allocated per task::
+
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.executors import ContextVarsThreadPoolExecutor
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+        ...     timezone: str = 'UTC'
+
+        >>> current = CurrentVars()
+
+        >>> def get_current_vars(suffix=''):
+        ...     return f"{current.locale}/{current.timezone}{suffix}"
+
+        >>> current.locale = 'nb'
+        >>> current.timezone = 'Antarctica/Troll'
+
+        >>> with ContextVarsThreadPoolExecutor(max_workers=2) as executor:
+        ...     executor.submit(get_current_vars).result()
+        ...     list(executor.map(get_current_vars, ['!', '?']))
+        'nb/Antarctica/Troll'
+        ['nb/Antarctica/Troll!', 'nb/Antarctica/Troll?']
+
+    :meth:`map` takes only one snapshot for the whole batch.
+    What tasks do with that snapshot depends on the ``share_snapshot`` flag:
+
+    - ``share_snapshot=False`` (default): each task runs in its own copy of the snapshot,
+      so tasks are isolated from each other (like with :func:`bind_to_snapshot_context`).
+
+    - ``share_snapshot=True``: each worker thread makes only one copy of the snapshot per batch,
+      and runs all its tasks in it. That is, changes made to context variables by one task
+      may be visible to the next task that happens to run in the same thread.
+      Use it for read-only tasks, where isolation isn't needed.
+
+    :meth:`submit` always runs the task in a fresh snapshot, regardless of the flag.
+    """
+
+    share_snapshot: bool
+    """Run tasks of a :meth:`map` batch in one shared snapshot per worker thread."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        thread_name_prefix: str = "",
+        initializer: Optional[Callable[..., Any]] = None,
+        initargs: Tuple[Any, ...] = (),
+        *,
+        share_snapshot: bool = False,
+    ) -> None:
+        """Initialize the executor.
+
+        :param share_snapshot: Share the :meth:`map` snapshot among tasks of the same worker.
+
+        Other parameters are the same as in :class:`~concurrent.futures.ThreadPoolExecutor`.
+        """
+        super().__init__(max_workers, thread_name_prefix, initializer, initargs)
+        self.share_snapshot = share_snapshot
+
+    def submit(
+        self, fn: Callable[..., _ReturnT], /, *args: Any, **kwargs: Any
+    ) -> "Future[_ReturnT]":
+        """Submit a callable to be executed in a snapshot of the current context.
+
+        The signature is the same as in :meth:`concurrent.futures.Executor.submit`.
+        """
+        # No wrapper here: the bound Context.run method is the callable the worker calls.
+        return super().submit(copy_context().run, fn, *args, **kwargs)
+
+    def map(
+        self,
+        fn: Callable[..., _ReturnT],
+        *iterables: Iterable[Any],
+        timeout: Optional[float] = None,
+        chunksize: int = 1,
+    ) -> Iterator[_ReturnT]:
+        """Run a callable for each item in iterables, in one snapshot of the current context.
+
+        The signature is the same as in :meth:`concurrent.futures.Executor.map`.
+        """
+        # Executor.map() only calls self.submit() for each item, so here it is called
+        # with the batch submitter instead of self, and the whole result-iterator logic
+        # (timeouts, cancellation of pending futures, etc) is reused as-is.
+        batch = _SnapshotBatch(super().submit, copy_context(), self.share_snapshot)
+        return Executor.map(batch, fn, *iterables, timeout=timeout)  # type: ignore[arg-type]
+
+
+class _SnapshotBatch:
+    # A stand-in for the executor in Executor.map(), that submits tasks of one batch.
+    __slots__ = ("submit", "executor_submit", "snapshot", "thread_contexts")
+
+    def __init__(
+        self, executor_submit: Callable[..., Future], snapshot: Context, share_snapshot: bool
+    ) -> None:
+        self.executor_submit = executor_submit
+        self.snapshot = snapshot
+        self.thread_contexts: Dict[int, Context] = {}
+        self.submit = self._submit_shared if share_snapshot else self._submit_copy
+
+    def _submit_copy(self, fn: Callable[..., Any], /, *args: Any) -> Future:
+        return self.executor_submit(self.snapshot.copy().run, fn, *args)
+
+    def _submit_shared(self, fn: Callable[..., Any], /, *args: Any) -> Future:
+        return self.executor_submit(self._run_in_thread_context, fn, *args)
+
+    def _run_in_thread_context(self, fn: Callable[..., Any], /, *args: Any) -> Any:
+        # A Context can't be entered by two threads at once, so each worker gets its own copy.
+        # A worker runs tasks one by one, so it never enters its copy twice.
+        thread_id = get_ident()
+        try:
+            context = self.thread_contexts[thread_id]
+        except KeyError:
+            context = self.thread_contexts[thread_id] = self.snapshot.copy()
+        return context.run(fn, *args)
+
+
+class ContextVarsProcessPoolExecutor(ProcessPoolExecutor):
+    """A :class:`~concurrent.futures.ProcessPoolExecutor` that transfers registry variables.
+
+    Worker processes can't share the submitter's context, so the context has to be
+    serialized (and sent to the worker along with each task). Serializing the whole context
+    is not possible (and not desired), so you choose registries to be transferred,
+    and only variables that are set in those registries are sent.
+
+    In the worker, each task runs in a fresh context, where the variables are restored:
+
+    .. code:: python
+
+        from contextvars_registry import ContextVarsRegistry
+        from contextvars_registry.executors import ContextVarsProcessPoolExecutor
+
+        class CurrentVars(ContextVarsRegistry):
+            locale: str = 'en'
+
+        current = CurrentVars()
+
+        def get_locale(suffix):
+            return current.locale + suffix
+
+        current.locale = 'nb'
+        with ContextVarsProcessPoolExecutor(registries=[current]) as executor:
+            executor.submit(get_locale, '!').result()  # => 'nb!'
+
+    The serialized variables are cached: when the registries didn't change since the previous
+    :meth:`submit` (as it happens with :meth:`map`, or in a loop that submits many tasks),
+    the already encoded payload is reused (pass ``cache_payload=False`` to disable that).
+    The worker also caches the decoded context, so a batch of tasks from the same context
+    is decoded only once per worker.
+
+    Variables are encoded with :mod:`contextvars_registry.serialization`.
+
+    Limitations:
+
+    - Registry classes (and values of variables) must be picklable,
+      and registry classes must be importable in worker processes.
+    - Changes made to variables in the worker are not sent back.
+    - The payload cache detects changes by comparing values of variables by identity.
+      So, if a value is mutated in place (like ``current.tags.append('x')``) between two
+      :meth:`submit` calls, the second task gets the stale (previously encoded) value.
+      Set a new object instead (``current.tags = [*current.tags, 'x']``),
+      or pass ``cache_payload=False``.
+    - Each worker process keeps the last received payload (and the context decoded from it)
+      until the next payload arrives, so large values of variables stay in worker's memory
+      after the task is done.
+    """
+
+    registries: Tuple[ContextVarsRegistry, ...]
+    """Registries, whose variables are transferred to worker processes."""
+
+    cache_payload: bool
+    """Re-use the encoded payload, while values of variables are the same objects."""
+
+    def __init__(
+        self,
+        *args: Any,
+        registries: Iterable[ContextVarsRegistry],
+        cache_payload: bool = True,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the executor.
+
+        :param registries: Registries, whose variables are transferred to worker processes.
+        :param cache_payload: Re-use the encoded payload, while values of variables
+                              are the same objects (disable it, if you mutate values in place).
+
+        Other parameters are the same as in :class:`~concurrent.futures.ProcessPoolExecutor`.
+        """
+        super().__init__(*args, **kwargs)
+        self.registries = tuple(registries)
+        self.cache_payload = cache_payload
+        self._cached_payload: Tuple[Tuple[RegistrySnapshot, ...], bytes] = ((), b"")
+
+    def submit(
+        self, fn: Callable[..., _ReturnT], /, *args: Any, **kwargs: Any
+    ) -> "Future[_ReturnT]":
+        """Submit a callable to be executed in a worker, with variables of the chosen registries.
+
+        The signature is the same as in :meth:`concurrent.futures.Executor.submit`.
+        """
+        payload = self._get_payload()
+        return super().submit(_run_with_registries_payload, payload, fn, *args, **kwargs)
+
+    def _get_payload(self) -> bytes:
+        if not self.cache_payload:
+            return encode_context_vars_registries(self.registries)
+
+        # Snapshots are cheap, and they allow to detect changes (by comparing values by identity),
+        # so the expensive encoding is done only when variables actually change.
+        snapshots = tuple([registry.snapshot() for registry in self.registries])
+        cached_snapshots, cached_payload = self._cached_payload
+        if _is_same_snapshots(snapshots, cached_snapshots):
+            return cached_payload
+
+        payload = encode_context_vars_registries(self.registries)
+        self._cached_payload = (snapshots, payload)
+        return payload
+
+
+def _is_same_snapshots(
+    snapshots: Tuple[RegistrySnapshot, ...], other_snapshots: Tuple[RegistrySnapshot, ...]
+) -> bool:
+    if len(snapshots) != len(other_snapshots):
+        return False
+    for snapshot, other_snapshot in zip(snapshots, other_snapshots):
+        if (
+            (snapshot.packed_record is not other_snapshot.packed_record)
+            or (snapshot.set_fields_mask != other_snapshot.set_fields_mask)
+            or (len(snapshot.values) != len(other_snapshot.values))
+            # map(is_, ...) compares values by identity without a Python-level loop.
+            or not all(map(is_, snapshot.values, other_snapshot.values))
+        ):
+            return False
+    return True
+
+
+def _decode_registries(payload: bytes) -> Context:
+    # Build a fresh context, with variables restored from the payload.
+    context = Context()
+    context.run(restore_encoded_context_vars_registries, payload)
+    return context
+
+
+# The last payload decoded in this (worker) process, and the context built from it.
+_last_decoded_payload: Tuple[bytes, Context] = (b"", Context())
+
+
+def _run_with_registries_payload(
+    payload: bytes, fn: Callable[..., _ReturnT], /, *args: Any, **kwargs: Any
+) -> _ReturnT:
+    global _last_decoded_payload  # pylint: disable=global-statement
+
+    last_payload, context = _last_decoded_payload
+    if payload != last_payload:
+        context = _decode_registries(payload)
+        _last_decoded_payload = (payload, context)
+
+    # Each task gets its own copy, so tasks can't affect each other via context variables.
+    return context.copy().run(fn, *args, **kwargs)
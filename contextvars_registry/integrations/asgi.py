@@ -0,0 +1,114 @@
+from contextvars import ContextVar, copy_context
+from inspect import iscoroutine
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+from contextvars_registry.context_management import run_coroutine_in_context
+
+Scope = Dict[str, Any]
+Message = Dict[str, Any]
+ReceiveFn = Callable[[], Awaitable[Message]]
+SendFn = Callable[[Message], Awaitable[None]]
+AsgiApp = Callable[[Scope, ReceiveFn, SendFn], Awaitable[None]]
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+current_scope: ContextVar[Scope] = ContextVar(
+    "contextvars_registry.integrations.asgi.current_scope"
+)
+"""Connection scope for the current HTTP request (or websocket connection).
+
+This context variable contains the ASGI ``scope`` dictionary, that contains metadata about
+the connection currently being handled (like ``type``, ``path``, ``headers``, etc).
+
+See the ASGI specification for the list of possible keys:
+https://asgi.readthedocs.io/en/latest/specs/www.html
+
+.. Note::
+
+  This context variable is set by :class:`ContextVarsMiddleware`.
+
+  So you can use it only when you use that special middleware class,
+  and only inside HTTP request (or websocket connection) handler code.
+
+  An attempt to use it ouside of a connection context will raise ``LookupError``.
+"""
+
+
+class ContextVarsMiddleware:
+    """Middleware for ASGI apps that puts each connection to its own isolated context.
+
+    This is an ASGI analog of :class:`contextvars_registry.integrations.wsgi.ContextVarsMiddleware`.
+    It does 2 things:
+
+      1. Runs each HTTP request (and each websocket connection) in its own sandbox context.
+         That allows you to set any context variables freely,
+         and your changes will remain local to the current connection.
+
+      2. Sets :data:`current_scope` context variable.
+         That allows you to reach the ``scope`` dict from any function in your code,
+         without passing it through arguments.
+
+    Example::
+
+       >>> from asyncio import run
+       >>> from contextvars_registry import ContextVarsRegistry
+       >>> from contextvars_registry.integrations.asgi import ContextVarsMiddleware, current_scope
+
+       >>> class CurrentVars(ContextVarsRegistry):
+       ...     user_id: int = None
+
+       >>> current = CurrentVars()
+
+       >>> async def my_asgi_app(scope, receive, send):
+       ...     current.user_id = 42
+       ...     body = f"{current_scope.get()['path']} user_id={current.user_id}"
+       ...     await send({"type": "http.response.start", "status": 200, "headers": []})
+       ...     await send({"type": "http.response.body", "body": body.encode()})
+
+       >>> wrapped_asgi_app = ContextVarsMiddleware(my_asgi_app)
+
+       >>> async def receive():
+       ...     return {"type": "http.request", "body": b""}
+
+       >>> async def send(message):
+       ...     print(message.get("body", b"").decode() or message["status"])
+
+       >>> run(wrapped_asgi_app({"type": "http", "path": "/test_api"}, receive, send))
+       200
+       /test_api user_id=42
+
+       # The change made inside the app isn't seen outside of it.
+       >>> print(current.user_id)
+       None
+
+    The wrapped app is called inside the connection context (so even an app that is a plain
+    callable returning an awaitable runs its synchronous part in the connection context).
+    The app coroutine is not wrapped with an extra :class:`asyncio.Task`.
+    Instead, each its step is executed in the connection context
+    (see :func:`~contextvars_registry.context_management.run_coroutine_in_context`).
+
+    The ``lifespan`` events are passed through to the wrapped app as-is
+    (they're not bound to any connection, so there is no sandbox context for them,
+    and :data:`current_scope` is not set).
+    """
+
+    def __init__(self, wrapped_app: AsgiApp):
+        self.wrapped_app = wrapped_app
+
+    async def __call__(self, scope: Scope, receive: ReceiveFn, send: SendFn) -> None:  # noqa: D102
+        if scope["type"] == "lifespan":
+            return await self.wrapped_app(scope, receive, send)
+
+        connection_context = copy_context()
+        connection_context.run(current_scope.set, scope)
+        awaitable = connection_context.run(self.wrapped_app, scope, receive, send)
+        if not iscoroutine(awaitable):
+            awaitable = _await(awaitable)
+        return await run_coroutine_in_context(awaitable, connection_context)
+
+
+async def _await(awaitable: Awaitable[_ReturnT]) -> _ReturnT:
+    # Turn an arbitrary awaitable (like a Future) into a coroutine that can be driven
+    # by run_coroutine_in_context().
+    return await awaitable
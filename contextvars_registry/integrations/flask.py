@@ -1,6 +1,10 @@
+from contextvars import Context
+from typing import Optional
+
 import flask
 
 from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.context_vars_registry import ContextVarsRegistry
 
 
 class Flask(flask.Flask):
@@ -56,3 +60,102 @@ class Flask(flask.Flask):
 
         """
         return super().__call__(environ, start_response)
+
+
+class RequestGlobals:
+    """Flask extension that uses a :class:`ContextVarsRegistry` as a replacement for ``flask.g``.
+
+    ``flask.g`` is a proxy object, that is resolved on every attribute access.
+    A registry is a plain object, where each attribute is a
+    :class:`~contextvars_registry.context_var_descriptor.ContextVarDescriptor`,
+    so attribute access is cheaper (and also friendly to type checkers and IDEs).
+
+    The extension makes the registry behave like ``flask.g``:
+    all registry variables are reset when a request starts,
+    and once again when the application context of that request is torn down
+    (other application contexts, like ``with app.app_context():`` nested in a request,
+    don't reset the registry).
+
+    Example::
+
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.integrations.flask import Flask, RequestGlobals
+
+        >>> class RequestVars(ContextVarsRegistry):
+        ...     user_id: int = None
+        ...     visited: list
+
+        >>> g = RequestVars()
+
+        >>> flask_app = Flask(__name__)
+        >>> request_globals = RequestGlobals(g, flask_app)
+
+        >>> @flask_app.before_request
+        ... def load_user():
+        ...     g.user_id = 42
+        ...     g.visited = []
+
+        >>> @flask_app.route("/test_url")
+        ... def test_view_function():
+        ...     g.visited.append("view")
+        ...     return f"user_id={g.user_id} visited={g.visited}"
+
+        >>> client = flask_app.test_client()
+        >>> client.get("/test_url").data
+        b"user_id=42 visited=['view']"
+
+        >>> print(g.user_id)
+        None
+
+    The registry is reset by restoring a snapshot of its pristine state (see
+    :meth:`~contextvars_registry.context_vars_registry.ContextVarsRegistry.restore`),
+    so only variables that were actually changed are written.
+
+    .. Note::
+
+      :attr:`~contextvars_registry.context_var_descriptor.ContextVarDescriptor.strict` variables
+      can't be unset. So, if a strict variable without a default value is set during a request,
+      the reset raises
+      :class:`~contextvars_registry.context_var_descriptor.DeleteStrictContextVarError`
+      at the end of the request. Give such variables default values
+      (then they're reset to defaults), or don't make them strict.
+
+    Several extensions (with registries of different classes) can be used in one app.
+    They're listed in ``app.extensions["contextvars_registry"]``, a dict where keys are
+    registry classes.
+    """
+
+    registry: ContextVarsRegistry
+    """The registry used as the request-global namespace."""
+
+    def __init__(self, registry: ContextVarsRegistry, app: Optional[flask.Flask] = None) -> None:
+        """Initialize the extension.
+
+        :param registry: An instance of :class:`ContextVarsRegistry` subclass.
+        :param app: Flask application. If omitted, call :meth:`init_app` later.
+        """
+        self.registry = registry
+        # A snapshot of the registry, where no variables are set.
+        self._pristine_snapshot = Context().run(registry.snapshot)
+        # A flask.g attribute that marks the application context of a request,
+        # where the registry was reset (and where it has to be reset again on teardown).
+        self._g_marker_name = f"_contextvars_registry_reset_{id(self)}"
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: flask.Flask) -> None:
+        """Register the extension in a Flask application."""
+        # The reset must go before any other before_request() function,
+        # since they may already use the registry.
+        app.before_request_funcs.setdefault(None, []).insert(0, self._reset_registry)
+        app.teardown_appcontext(self._teardown_registry)
+        app.extensions.setdefault("contextvars_registry", {})[type(self.registry)] = self
+
+    def _reset_registry(self) -> None:
+        self.registry.restore(self._pristine_snapshot)
+        setattr(flask.g, self._g_marker_name, True)
+
+    def _teardown_registry(self, exception: Optional[BaseException]) -> None:
+        # flask.g is bound to the application context, that is being torn down.
+        if flask.g.pop(self._g_marker_name, False):
+            self.registry.restore(self._pristine_snapshot)
@@ -0,0 +1,109 @@
+from contextvars import copy_context
+from typing import Any, List, TypeVar
+
+import gevent
+import gevent.pool
+
+_GreenletT = TypeVar("_GreenletT", bound=gevent.Greenlet)
+
+
+class Greenlet(gevent.Greenlet):
+    """A :class:`gevent.Greenlet` that starts in a snapshot of the parent's context.
+
+    Normally, greenlets start in an empty context, so a spawned function doesn't see
+    context variables of the code that spawned it.
+
+    This class captures a copy of the current context when the greenlet is created,
+    and the greenlet runs in it (the copy is assigned to :attr:`greenlet.greenlet.gr_context`,
+    so no wrapper function is created around the spawned function)::
+
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.integrations.gevent import Greenlet
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.locale = 'nb'
+
+        >>> def get_locale():
+        ...     return current.locale
+
+        >>> gevent.spawn(get_locale).get()
+        'en'
+
+        >>> Greenlet.spawn(get_locale).get()
+        'nb'
+
+    Changes made to context variables inside the greenlet are not visible to the parent
+    (and to other greenlets), since each greenlet has its own copy of the context.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:  # noqa: D107
+        super().__init__(*args, **kwargs)
+        self.gr_context = copy_context()
+
+
+spawn = Greenlet.spawn
+"""Create and start a :class:`Greenlet` (a replacement for :func:`gevent.spawn`)."""
+
+spawn_later = Greenlet.spawn_later
+"""Create and start a :class:`Greenlet` later (a replacement for :func:`gevent.spawn_later`)."""
+
+
+def _pin_to_current_context(greenlet: _GreenletT) -> _GreenletT:
+    # Some Group methods (like imap) spawn a plain gevent.Greenlet that, in turn, spawns
+    # workers from inside of it. That plain greenlet hasn't started yet, so it is not too late
+    # to give it a copy of the current context (that will be inherited by the workers).
+    if not isinstance(greenlet, Greenlet):
+        greenlet.gr_context = copy_context()
+    return greenlet
+
+
+class Group(gevent.pool.Group):
+    """A :class:`gevent.pool.Group` that spawns greenlets in a snapshot of the current context.
+
+    All the methods (:meth:`spawn`, :meth:`map`, :meth:`imap`, :meth:`apply_async`, etc)
+    run functions in a copy of the caller's context, like :class:`Greenlet` does.
+    """
+
+    greenlet_class = Greenlet
+
+    def map(self, func: Any, iterable: Any) -> List[Any]:  # noqa: D102
+        # The original map() spawns a plain greenlet, and immediately waits for it
+        # (so it can't be pinned to the context). But, it is equivalent to imap().
+        return list(self.imap(func, iterable))
+
+    def imap(self, func: Any, *iterables: Any, **kwargs: Any) -> Any:  # noqa: D102
+        return _pin_to_current_context(super().imap(func, *iterables, **kwargs))
+
+    def imap_unordered(self, func: Any, *iterables: Any, **kwargs: Any) -> Any:  # noqa: D102
+        return _pin_to_current_context(super().imap_unordered(func, *iterables, **kwargs))
+
+    def map_async(self, func: Any, iterable: Any, callback: Any = None) -> Any:  # noqa: D102
+        return _pin_to_current_context(super().map_async(func, iterable, callback))
+
+    def apply_async(  # noqa: D102
+        self, func: Any, args: Any = None, kwds: Any = None, callback: Any = None
+    ) -> Any:
+        return _pin_to_current_context(super().apply_async(func, args, kwds, callback))
+
+
+class Pool(Group, gevent.pool.Pool):
+    """A :class:`gevent.pool.Pool` that spawns greenlets in a snapshot of the current context.
+
+    The same as :class:`Group`, but with a limited number of greenlets::
+
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.integrations.gevent import Pool
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.locale = 'nb'
+
+        >>> pool = Pool(2)
+        >>> list(pool.imap(lambda suffix: current.locale + suffix, ['!', '?']))
+        ['nb!', 'nb?']
+    """
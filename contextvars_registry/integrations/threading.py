@@ -0,0 +1,170 @@
+import threading
+from concurrent.futures import thread as futures_thread
+from contextvars import Context, copy_context
+from functools import partial
+from typing import Any, Callable, Optional
+
+
+class Thread(threading.Thread):
+    """A :class:`threading.Thread` that inherits context variables of the code that starts it.
+
+    Normally, threads start in an empty context, so the thread's target function
+    doesn't see context variables of the code that started the thread.
+
+    This class takes a copy of the current context in :meth:`start`,
+    and runs the thread in it::
+
+        >>> from contextvars import Context
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.integrations.threading import Thread
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.locale = 'nb'
+
+        >>> def print_locale():
+        ...     print(current.locale)
+
+        >>> thread = Thread(target=print_locale)
+        >>> thread.start()
+        nb
+        >>> thread.join()
+
+    Also, you can pass an explicit context. For example, an empty :class:`~contextvars.Context`,
+    to get the standard behavior (like with
+    :func:`~contextvars_registry.context_management.bind_to_empty_context`)::
+
+        >>> thread = Thread(target=print_locale, context=Context())
+        >>> thread.start()
+        en
+        >>> thread.join()
+
+    Note that the thread runs directly in the given context (it isn't copied),
+    so the context object can't be shared by two threads that run at the same time.
+    """
+
+    context: Optional[Context]
+    """The context, where the thread runs (``None`` until the thread is started)."""
+
+    def __init__(self, *args: Any, context: Optional[Context] = None, **kwargs: Any) -> None:
+        """Initialize the thread.
+
+        :param context: Run the thread in this context.
+                        If omitted, a copy of the current context is taken in :meth:`start`.
+
+        Other parameters are the same as in :class:`threading.Thread`.
+        """
+        super().__init__(*args, **kwargs)
+        self.context = context
+
+    def start(self) -> None:  # noqa: D102
+        if self.context is None:
+            self.context = copy_context()
+        super().start()
+
+    def run(self) -> None:  # noqa: D102
+        assert self.context is not None
+        self.context.run(super().run)
+
+
+class Timer(Thread, threading.Timer):
+    """A :class:`threading.Timer` that inherits context variables of the code that starts it.
+
+    The same as :class:`Thread`, but for delayed calls::
+
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.integrations.threading import Timer
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.locale = 'nb'
+
+        >>> timer = Timer(0.001, lambda: print(current.locale))
+        >>> timer.start()
+        >>> timer.join()
+        nb
+    """
+
+
+def patch_thread_start(*, skip_thread_pool_workers: bool = True) -> Callable[[], None]:
+    """Make all threads inherit context variables of the code that starts them.
+
+    :param skip_thread_pool_workers: Don't patch worker threads of
+        :class:`concurrent.futures.ThreadPoolExecutor` (see the caution below).
+    :returns: A function that reverts the patch.
+
+    This is for third-party code, that creates its own threads
+    (which you can't replace with :class:`Thread`).
+
+    The function patches :meth:`threading.Thread.start`, so that it takes a copy
+    of the current context, and the thread's ``run()`` method is executed in it.
+    It affects all threads (including subclasses of :class:`threading.Thread`)
+    started after the patch is applied::
+
+        >>> import threading
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.integrations.threading import patch_thread_start
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     locale: str = 'en'
+
+        >>> current = CurrentVars()
+        >>> current.locale = 'nb'
+
+        >>> def print_locale():
+        ...     print(current.locale)
+
+        >>> unpatch_thread_start = patch_thread_start()
+        >>> thread = threading.Thread(target=print_locale)
+        >>> thread.start()
+        nb
+        >>> thread.join()
+
+        >>> unpatch_thread_start()
+        >>> thread = threading.Thread(target=print_locale)
+        >>> thread.start()
+        en
+        >>> thread.join()
+
+    .. Caution::
+
+      A thread inherits the context once, when it is started, and keeps it for its whole life.
+      So long-lived (pooled) worker threads keep the context of whoever started them,
+      and leak it to all tasks they run later (for example, to tasks of other HTTP requests).
+
+      Workers of :class:`concurrent.futures.ThreadPoolExecutor` (and its subclasses) are
+      therefore skipped by default (use
+      :class:`~contextvars_registry.executors.ContextVarsThreadPoolExecutor` to run pool tasks
+      in the submitter's context instead). Other thread pools are not detected,
+      so don't apply the patch if your code (or a third-party library) uses them.
+
+    Patches can be stacked, but they must be reverted in the reverse order.
+    """
+    original_start = threading.Thread.start
+
+    def _patched_Thread_start(self: threading.Thread) -> None:
+        # Thread objects of this module take care of the context by themselves.
+        if not isinstance(self, Thread) and not (
+            skip_thread_pool_workers and _is_thread_pool_worker(self)
+        ):
+            # Patch the instance (not the class), because subclasses may override run().
+            self.run = partial(copy_context().run, self.run)  # type: ignore[method-assign]
+        original_start(self)
+
+    def _unpatch_thread_start() -> None:
+        if threading.Thread.start is not _patched_Thread_start:
+            raise RuntimeError("threading.Thread.start was patched again, and not reverted yet")
+        threading.Thread.start = original_start  # type: ignore[method-assign]
+
+    threading.Thread.start = _patched_Thread_start  # type: ignore[method-assign]
+    return _unpatch_thread_start
+
+
+def _is_thread_pool_worker(thread: threading.Thread) -> bool:
+    # ThreadPoolExecutor starts plain Thread objects, with its private _worker() function as target.
+    # pylint: disable=protected-access
+    return getattr(thread, "_target", None) is futures_thread._worker
@@ -1,7 +1,8 @@
-from contextvars import ContextVar
-from typing import Callable, Dict, Iterable, List, Tuple, Union
-
-from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars import Context, ContextVar, copy_context
+from functools import cached_property
+from http.cookies import SimpleCookie
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Union
+from urllib.parse import parse_qs
 
 EnvironDict = Dict[str, str]
 StatusStr = str
@@ -65,12 +66,154 @@ class ContextVarsMiddleware:
        >>> response = test_client.post("http://localhost/test_api")
        >>> response.text
        'http://localhost/test_api'
+
+    By default, only the call of the wrapped app runs in the request context.
+    If the app returns a lazy iterable (like a generator that streams a big file),
+    then the response body is produced later, when the server iterates it,
+    and that happens outside of the request context.
+
+    To solve that, pass ``streaming=True``.
+    Then the middleware wraps the response, and runs each its ``__next__()`` and ``close()``
+    call in the same request context (the context is entered on each step, but never copied)::
+
+       >>> def my_streaming_wsgi_app(environ, start_response):
+       ...     start_response('200 OK', [('Content-type', 'text/plain; charset=utf-8')])
+       ...     yield 'url: '
+       ...     yield get_current_url()
+
+       >>> test_client = werkzeug.test.Client(
+       ...     ContextVarsMiddleware(my_streaming_wsgi_app, streaming=True)
+       ... )
+
+       >>> response = test_client.get("http://localhost/export.csv")
+       >>> response.text
+       'url: http://localhost/export.csv'
     """
 
-    def __init__(self, wrapped_app: WsgiApp):
+    def __init__(self, wrapped_app: WsgiApp, streaming: bool = False):
+        """Initialize the middleware.
+
+        :param wrapped_app: The WSGI application to wrap.
+        :param streaming: Iterate the response in the request context.
+        """
         self.wrapped_app = wrapped_app
+        self.streaming = streaming
 
-    @bind_to_sandbox_context
     def __call__(self, environ: EnvironDict, start_response: StartResponseFn) -> Response:  # noqa: D102
+        request_context = copy_context()
+        response = request_context.run(self._call_wrapped_app, environ, start_response)
+        if self.streaming:
+            return _ResponseInContext(response, request_context)
+        return response
+
+    def _call_wrapped_app(self, environ: EnvironDict, start_response: StartResponseFn) -> Response:
         current_environ.set(environ)
         return self.wrapped_app(environ, start_response)
+
+
+class _ResponseInContext:
+    # A response iterable returned by ContextVarsMiddleware(streaming=True).
+    # Runs each step of the wrapped response (and its close() method) in the request context.
+    __slots__ = ("response", "_run", "_next")
+
+    def __init__(self, response: Response, request_context: Context) -> None:
+        self.response = response
+        self._run = request_context.run
+        self._next: Callable[[], Union[str, bytes]] = request_context.run(iter, response).__next__
+
+    def __iter__(self) -> Iterator[Union[str, bytes]]:
+        return self
+
+    def __next__(self) -> Union[str, bytes]:
+        return self._run(self._next)
+
+    def close(self) -> None:
+        close = getattr(self.response, "close", None)
+        if close is not None:
+            self._run(close)
+
+
+class ParsedEnviron:
+    """Lazily parsed parts of the ``environ`` dict (headers, query string, cookies).
+
+    Each part is parsed on first access, and then cached.
+    You normally don't create these objects manually.
+    Instead, you call :func:`get_parsed_environ`, that returns the object for the current request.
+    """
+
+    environ: EnvironDict
+    """The ``environ`` dict being parsed."""
+
+    def __init__(self, environ: EnvironDict) -> None:
+        self.environ = environ
+
+    @cached_property
+    def headers(self) -> Dict[str, str]:
+        """HTTP headers, with lowercase names (like ``{'user-agent': 'curl/8.0'}``)."""
+        headers = {}
+        for key, value in self.environ.items():
+            if key.startswith("HTTP_"):
+                headers[key[5:].replace("_", "-").lower()] = value
+            elif key in ("CONTENT_TYPE", "CONTENT_LENGTH") and value:
+                headers[key.replace("_", "-").lower()] = value
+        return headers
+
+    @cached_property
+    def query(self) -> Dict[str, List[str]]:
+        """Query string parameters (as returned by :func:`urllib.parse.parse_qs`)."""
+        return parse_qs(self.environ.get("QUERY_STRING", ""), keep_blank_values=True)
+
+    @cached_property
+    def cookies(self) -> Dict[str, str]:
+        """Cookies sent by the client (only values, without attributes)."""
+        cookie: SimpleCookie = SimpleCookie(self.environ.get("HTTP_COOKIE", ""))
+        return {name: morsel.value for name, morsel in cookie.items()}
+
+
+_parsed_environ_var: ContextVar[ParsedEnviron] = ContextVar(
+    "contextvars_registry.integrations.wsgi._parsed_environ_var"
+)
+
+
+def get_parsed_environ() -> ParsedEnviron:
+    """Get :class:`ParsedEnviron` for the current HTTP request (the :data:`current_environ`).
+
+    The object is created once per request, and stored in the request context.
+    So all middleware layers and helpers share the already parsed values,
+    and they're gone once the request is handled.
+
+    Example::
+
+       >>> from contextvars_registry.integrations.wsgi import (
+       ...     ContextVarsMiddleware,
+       ...     get_parsed_environ,
+       ... )
+       >>> import werkzeug.test
+
+       >>> def my_wsgi_app(environ, start_response):
+       ...     start_response('200 OK', [('Content-type', 'text/plain; charset=utf-8')])
+       ...     parsed = get_parsed_environ()
+       ...     assert get_parsed_environ() is parsed
+       ...     return [
+       ...         f"page={parsed.query['page']} ",
+       ...         f"session={parsed.cookies['session']} ",
+       ...         f"accept={parsed.headers['accept']}",
+       ...     ]
+
+       >>> test_client = werkzeug.test.Client(ContextVarsMiddleware(my_wsgi_app))
+       >>> test_client.set_cookie("session", "abc")
+
+       >>> response = test_client.get("/?page=2", headers={"Accept": "text/csv"})
+       >>> response.text
+       "page=['2'] session=abc accept=text/csv"
+
+    :raises LookupError: if called outside of a request handled by :class:`ContextVarsMiddleware`.
+    """
+    environ = current_environ.get()
+    parsed_environ = _parsed_environ_var.get(None)
+    # The context may be copied from a parent request (e.g., in a nested WSGI app call),
+    # so the cached object is valid only if it was parsed from the same environ.
+    if (parsed_environ is None) or (parsed_environ.environ is not environ):
+        parsed_environ = ParsedEnviron(environ)
+        _parsed_environ_var.set(parsed_environ)
+    return parsed_environ
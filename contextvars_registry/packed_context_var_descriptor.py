@@ -0,0 +1,264 @@
+"""PackedContextVarDescriptor - a variable that lives in a slot of a shared ContextVar."""
+
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, Tuple, TypeVar, Union
+
+from contextvars_registry.context_var_descriptor import (
+    DELETED,
+    NO_DEFAULT,
+    RESET_TO_DEFAULT,
+    ContextVarDescriptor,
+    DeferredDefaultScope,
+    NoDefault,
+    _FastMethods,
+)
+
+# A value stored in the context variable.
+_VarValueT = TypeVar("_VarValueT")
+
+PackedRecord = Tuple[Any, ...]
+"""A tuple of values of all packed variables (one slot per variable).
+
+Slots of variables that are not set contain the :data:`RESET_TO_DEFAULT` marker.
+A record may be shorter than the number of allocated slots (if some variables were allocated
+after the record was written), and missing slots are treated as not set.
+"""
+
+
+class PackedToken:
+    """A token returned by :meth:`PackedContextVarDescriptor.set`.
+
+    It is an analog of :class:`contextvars.Token` (that can't be used here, because all packed
+    variables share the same :class:`~contextvars.ContextVar`, and resetting the standard token
+    would restore all of them at once). This token restores only one slot of the packed record.
+    """
+
+    __slots__ = ("var", "old_value")
+
+    def __init__(self, var: "PackedContextVarDescriptor[Any]", old_value: Any) -> None:
+        self.var = var
+        self.old_value = old_value
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} var={self.var!r}>"
+
+
+class PackedContextVarDescriptor(ContextVarDescriptor[_VarValueT]):
+    """A :class:`~.context_var_descriptor.ContextVarDescriptor` that shares a ContextVar.
+
+    Normally, each descriptor owns its own :class:`~contextvars.ContextVar` object.
+    A packed descriptor doesn't. Instead, many packed descriptors share one
+    :class:`~contextvars.ContextVar` object that contains a :data:`PackedRecord` - a tuple
+    of values, where each descriptor owns one slot (an index in the tuple).
+
+    You normally don't create these objects manually.
+    They're allocated by :class:`~.context_vars_registry.ContextVarsRegistry`
+    when its :attr:`~.context_vars_registry.ContextVarsRegistry._registry_packed` flag is set.
+
+    The public API is the same as of :class:`~.context_var_descriptor.ContextVarDescriptor`,
+    with a couple of differences:
+
+    - :attr:`context_var` points to the shared :class:`~contextvars.ContextVar`
+      (that contains the whole record, not a value of this variable).
+
+    - :meth:`set` returns a :class:`PackedToken` (instead of :class:`contextvars.Token`).
+
+    - :meth:`get_raw` returns :data:`RESET_TO_DEFAULT` for variables that are not set.
+    """
+
+    packed_var: "ContextVar[PackedRecord]"
+    """The shared :class:`~contextvars.ContextVar` that contains the :data:`PackedRecord`.
+
+    The same object as :attr:`context_var` (just with a more precise type).
+    """
+
+    slot: int
+    """Index of the variable's value in the :data:`PackedRecord`."""
+
+    def __init__(
+        self,
+        packed_var: "ContextVar[PackedRecord]",
+        slot: int,
+        name: Optional[str] = None,
+        default: Union[_VarValueT, NoDefault] = NO_DEFAULT,
+        deferred_default: Optional[Callable[[], _VarValueT]] = None,
+        strict: bool = False,
+        deferred_default_scope: DeferredDefaultScope = "context",
+    ) -> None:
+        """Initialize PackedContextVarDescriptor object.
+
+        :param packed_var: The shared :class:`~contextvars.ContextVar` that contains the record.
+        :param slot: Index of the variable's value in the record.
+
+        Other parameters are the same as in :meth:`ContextVarDescriptor.__init__`.
+        """
+        self.packed_var = packed_var
+        self.slot = slot
+        super().__init__(
+            name=name,
+            default=default,
+            deferred_default=deferred_default,
+            # The shared ContextVar contains the whole record, not a value of this variable.
+            _context_var=packed_var,  # type: ignore[arg-type]
+            strict=strict,
+            deferred_default_scope=deferred_default_scope,
+        )
+
+    def _init_fast_methods(self) -> None:
+        # Packed descriptors have no direct C-level shortcuts (like ContextVar.get),
+        # since their value always needs to be extracted from the record.
+        # So here all methods are closures, but otherwise they follow the same
+        # optimization tricks as ContextVarDescriptor._init_fast_methods().
+        (
+            self.get,  # type: ignore[method-assign]
+            self.is_set,  # type: ignore[method-assign]
+            self.is_gettable,  # type: ignore[method-assign]
+        ) = self._new_fast_methods_for_packed_var()
+
+        (
+            self.get_raw,  # type: ignore[method-assign]
+            self.set,  # type: ignore[method-assign]
+            self.reset,  # type: ignore[method-assign]
+        ) = self._new_raw_methods_for_packed_var()  # type: ignore[assignment]
+
+    def _new_fast_methods_for_packed_var(self) -> _FastMethods:
+        slot = self.slot
+        name = self.name
+        packed_var_get = self.packed_var.get
+        context_var_ext_default = self.default
+        context_var_ext_deferred_default = self._scoped_deferred_default
+        context_var_ext_default_is_set = context_var_ext_default is not NO_DEFAULT
+        context_var_ext_deferred_default_is_set = context_var_ext_deferred_default is not None
+
+        _NO_DEFAULT = NO_DEFAULT
+        _DELETED = DELETED
+        _RESET_TO_DEFAULT = RESET_TO_DEFAULT
+        _LookupError = LookupError
+        _IndexError = IndexError
+
+        def _method_PackedContextVarDescriptor_get(default=NO_DEFAULT):
+            try:
+                value = packed_var_get()[slot]
+            except _IndexError:
+                value = _RESET_TO_DEFAULT
+
+            # not set, or reset to default
+            if value is _RESET_TO_DEFAULT:
+                if default is not _NO_DEFAULT:
+                    return default
+                if context_var_ext_default_is_set:
+                    return context_var_ext_default
+                if context_var_ext_deferred_default is not None:
+                    value = context_var_ext_deferred_default()
+                    self.set(value)
+                    return value
+                raise _LookupError(name)
+
+            # deleted
+            if value is _DELETED:
+                if default is not _NO_DEFAULT:
+                    return default
+                raise _LookupError(name)
+
+            return value
+
+        def _method_PackedContextVarDescriptor_is_set(on_default=False, on_deferred_default=False):
+            try:
+                value = packed_var_get()[slot]
+            except _IndexError:
+                value = _RESET_TO_DEFAULT
+
+            if value is _RESET_TO_DEFAULT:
+                if context_var_ext_default_is_set:
+                    return on_default
+                if context_var_ext_deferred_default_is_set:
+                    return on_deferred_default
+                return False
+
+            return value is not _DELETED
+
+        def _method_PackedContextVarDescriptor_is_gettable():
+            try:
+                value = packed_var_get()[slot]
+            except _IndexError:
+                value = _RESET_TO_DEFAULT
+
+            if value is _RESET_TO_DEFAULT:
+                return context_var_ext_default_is_set or context_var_ext_deferred_default_is_set
+
+            return value is not _DELETED
+
+        return (
+            _method_PackedContextVarDescriptor_get,
+            _method_PackedContextVarDescriptor_is_set,
+            _method_PackedContextVarDescriptor_is_gettable,
+        )
+
+    def _new_raw_methods_for_packed_var(
+        self,
+    ) -> Tuple[Callable[..., Any], Callable[[Any], PackedToken], Callable[[PackedToken], None]]:
+        slot = self.slot
+        packed_var_get = self.packed_var.get
+        packed_var_set = self.packed_var.set
+
+        _NO_DEFAULT = NO_DEFAULT
+        _RESET_TO_DEFAULT = RESET_TO_DEFAULT
+        _IndexError = IndexError
+        _PackedToken = PackedToken
+        _replace_slot = replace_packed_record_slot
+
+        def _method_PackedContextVarDescriptor_get_raw(default=NO_DEFAULT):
+            try:
+                value = packed_var_get()[slot]
+            except _IndexError:
+                value = _RESET_TO_DEFAULT
+
+            if (value is _RESET_TO_DEFAULT) and (default is not _NO_DEFAULT):
+                return default
+            return value
+
+        def _method_PackedContextVarDescriptor_set(value):
+            record = packed_var_get()
+            try:
+                old_value = record[slot]
+            except _IndexError:
+                old_value = _RESET_TO_DEFAULT
+
+            packed_var_set(_replace_slot(record, slot, value))
+            return _PackedToken(self, old_value)
+
+        def _method_PackedContextVarDescriptor_reset(token):
+            assert token.var is self, "Token was created by a different variable"
+            packed_var_set(_replace_slot(packed_var_get(), slot, token.old_value))
+
+        return (
+            _method_PackedContextVarDescriptor_get_raw,
+            _method_PackedContextVarDescriptor_set,
+            _method_PackedContextVarDescriptor_reset,
+        )
+
+    def _init_deferred_default(self) -> None:
+        # Nothing to do here: an empty slot is treated as "reset to default",
+        # so there is no need to write the RESET_TO_DEFAULT marker.
+        pass
+
+
+def replace_packed_record_slot(record: PackedRecord, slot: int, value: Any) -> PackedRecord:
+    """Make a copy of the record, with one slot replaced.
+
+    The record is padded with :data:`RESET_TO_DEFAULT` markers if it is too short.
+
+    Example::
+
+        >>> replace_packed_record_slot(("en", "UTC"), 0, "en_GB")
+        ('en_GB', 'UTC')
+
+        >>> replace_packed_record_slot(("en",), 2, 42)
+        ('en', <RESET_TO_DEFAULT>, 42)
+    """
+    values = list(record)
+    missing_slots_count = slot + 1 - len(values)
+    if missing_slots_count > 0:
+        values.extend([RESET_TO_DEFAULT] * missing_slots_count)
+    values[slot] = value
+    return tuple(values)
@@ -0,0 +1,179 @@
+"""Queues that carry the producer's context along with each item."""
+
+import asyncio
+import queue
+from contextvars import Context, copy_context
+from typing import Any, Callable, Coroutine, Optional, Tuple, TypeVar
+
+from contextvars_registry.context_management import run_coroutine_in_context
+
+_ReturnT = TypeVar("_ReturnT")
+
+
+class ContextQueue(queue.Queue):
+    """A :class:`queue.Queue` that captures the producer's context on :meth:`put`.
+
+    Normally, an item that goes through a queue loses context of the producer,
+    so the consumer can't see context variables (like ID of the request that produced the item).
+
+    This queue takes a snapshot of the current context when an item is put into the queue,
+    and the consumer can handle the item inside that snapshot::
+
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.queues import ContextQueue
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     request_id: int = None
+
+        >>> current = CurrentVars()
+        >>> items = ContextQueue()
+
+        >>> current.request_id = 1
+        >>> items.put('first')
+        >>> current.request_id = 2
+        >>> items.put('second')
+
+        >>> def handle_item(item):
+        ...     print(f"{item} (request_id={current.request_id})")
+
+        >>> items.handle_next(handle_item)
+        first (request_id=1)
+        >>> items.handle_next(handle_item)
+        second (request_id=2)
+
+    :meth:`get` (and :meth:`~queue.Queue.get_nowait`) return just the item,
+    so the queue can be passed to code that expects a regular :class:`queue.Queue`.
+    To obtain the context as well, use :meth:`get_with_context` or :meth:`handle_next`.
+
+    Taking a snapshot is cheap (O(1)), and nothing is copied per item:
+    :func:`~contextvars.copy_context` returns a :class:`~contextvars.Context` that shares
+    its underlying (immutable) mapping with the producer's context, so consecutive items
+    put from an unchanged context share their variables.
+    """
+
+    def _put(self, item: Any) -> None:
+        # Called by put() (under the queue lock), in the producer's context.
+        super()._put((item, copy_context()))
+
+    def get(self, block: bool = True, timeout: Optional[float] = None) -> Any:
+        """Remove and return an item from the queue (without its context).
+
+        The signature is the same as in :meth:`queue.Queue.get`.
+        """
+        return self.get_with_context(block, timeout)[0]
+
+    def get_with_context(
+        self, block: bool = True, timeout: Optional[float] = None
+    ) -> Tuple[Any, Context]:
+        """Remove and return an item from the queue, with the context captured by :meth:`put`.
+
+        Parameters are the same as in :meth:`queue.Queue.get`.
+
+        :returns: A pair: ``(item, context)``.
+
+        The context may be shared by several items, so don't run code in it directly
+        (consumers in different threads can't enter one context at the same time).
+        Use its copy, like :meth:`handle_next` does.
+        """
+        item, context = super().get(block, timeout)
+        return item, context
+
+    def handle_next(
+        self,
+        handler: Callable[[Any], _ReturnT],
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> _ReturnT:
+        """Get the next item, and call ``handler(item)`` in a copy of the item's context.
+
+        :param handler: A function that handles the item.
+        :param block: The same as in :meth:`queue.Queue.get`.
+        :param timeout: The same as in :meth:`queue.Queue.get`.
+        :returns: Result of the ``handler`` function.
+
+        Changes that the handler makes to context variables are not visible
+        to handlers of other items.
+        """
+        item, context = self.get_with_context(block, timeout)
+        return context.copy().run(handler, item)
+
+
+class AsyncContextQueue(asyncio.Queue):
+    """An :class:`asyncio.Queue` that captures the producer's context on ``put()``.
+
+    The same as :class:`ContextQueue`, but for :mod:`asyncio` tasks::
+
+        >>> import asyncio
+        >>> from contextvars_registry import ContextVarsRegistry
+        >>> from contextvars_registry.queues import AsyncContextQueue
+
+        >>> class CurrentVars(ContextVarsRegistry):
+        ...     request_id: int = None
+
+        >>> current = CurrentVars()
+
+        >>> async def produce(items, request_id):
+        ...     current.request_id = request_id
+        ...     await items.put(f"item of request {request_id}")
+
+        >>> async def handle_item(item):
+        ...     print(f"{item} (request_id={current.request_id})")
+
+        >>> async def main():
+        ...     items = AsyncContextQueue()
+        ...     await asyncio.gather(produce(items, 1), produce(items, 2))
+        ...     await items.handle_next(handle_item)
+        ...     await items.handle_next(handle_item)
+
+        >>> asyncio.run(main())
+        item of request 1 (request_id=1)
+        item of request 2 (request_id=2)
+
+    ``get()`` and ``get_nowait()`` return just the item. To obtain the context as well,
+    use :meth:`get_with_context` (or :meth:`get_nowait_with_context`), or :meth:`handle_next`.
+    """
+
+    _got_context: Context
+
+    def _put(self, item: Any) -> None:
+        # Called by put_nowait() (and thus by put()), in the producer's context.
+        super()._put((item, copy_context()))
+
+    def _get(self) -> Any:
+        # Called by get_nowait() (and thus by get()), which return just the item.
+        # There is no await point between this call and return from get(), and only one
+        # thread runs the event loop, so the context can be safely picked up by the caller.
+        item, self._got_context = super()._get()
+        return item
+
+    async def get_with_context(self) -> Tuple[Any, Context]:
+        """Remove and return an item from the queue, with the context captured by ``put()``.
+
+        :returns: A pair: ``(item, context)``.
+
+        Like in :meth:`ContextQueue.get_with_context`, the context may be shared
+        by several items, so use its copy to run code in it.
+        """
+        item = await self.get()
+        return item, self._got_context
+
+    def get_nowait_with_context(self) -> Tuple[Any, Context]:
+        """The same as :meth:`get_with_context`, but without waiting for an item."""
+        item = self.get_nowait()
+        return item, self._got_context
+
+    async def handle_next(
+        self, handler: Callable[[Any], Coroutine[Any, Any, _ReturnT]]
+    ) -> _ReturnT:
+        """Get the next item, and await ``handler(item)`` in a copy of the item's context.
+
+        :param handler: An async function that handles the item.
+        :returns: Result of the ``handler`` coroutine.
+
+        No extra :class:`asyncio.Task` is created, the coroutine runs in the context
+        via :func:`~contextvars_registry.context_management.run_coroutine_in_context`.
+        """
+        item, context = await self.get_with_context()
+        context = context.copy()
+        coro = context.run(handler, item)
+        return await run_coroutine_in_context(coro, context)
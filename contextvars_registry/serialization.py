@@ -0,0 +1,306 @@
+"""Compact binary encoding of registry variables (for sending them to other processes).
+
+The format is designed for transferring variables of :class:`ContextVarsRegistry` objects
+between processes that run the same code (like workers of
+:class:`~contextvars_registry.executors.ContextVarsProcessPoolExecutor`).
+
+Usage example:
+
+.. code:: python
+
+    from contextvars_registry import ContextVarsRegistry
+    from contextvars_registry.serialization import (
+        encode_context_vars_registries,
+        restore_encoded_context_vars_registries,
+    )
+
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = 'en'
+        timezone: str = 'UTC'
+
+    current = CurrentVars()
+    current.locale = 'nb'
+    del current.timezone
+
+    data = encode_context_vars_registries([current])
+
+    # ...then, in another process (in a fresh context):
+    restore_encoded_context_vars_registries(data)
+    dict(current)  # => {'locale': 'nb'}
+
+The layout of the encoded data is::
+
+    header:      magic (b"CV"), version (1 byte), number of registries (2 bytes)
+    registries:  for each registry:
+                   - schema fingerprint (8 bytes)
+                   - length of the class path (2 bytes)
+                   - number of declared/dynamic fields (2 + 2 bytes)
+                   - class path ("module:qualname", UTF-8)
+                   - declared fields: field ID (2 bytes) + tag (1 byte)
+                   - dynamic fields: name length (2 bytes) + tag (1 byte) + name (UTF-8)
+    values:      values of all fields tagged as VALUE (one pickled tuple)
+
+That is:
+
+- Variables declared in the class body are identified by numeric IDs,
+  which are positions in :attr:`ContextVarsRegistry._registry_declared_var_names`
+  (names are not repeated in every payload).
+  Only variables allocated on the fly (dynamic fields) are identified by names.
+
+- :data:`~contextvars_registry.context_var_descriptor.DELETED` and
+  :data:`~contextvars_registry.context_var_descriptor.RESET_TO_DEFAULT` markers
+  are stored as explicit tags (they don't go through pickle).
+
+- The schema fingerprint is a hash of the class path and names of declared variables.
+  It detects the case when the decoding process has a different definition of
+  the registry class (see :class:`RegistrySchemaMismatchError`).
+
+- Decoding doesn't copy the data: it works with :class:`memoryview` slices of the input.
+
+.. caution::
+
+    The values are pickled, and class paths are imported on decoding.
+    So, like with :mod:`pickle`, never decode data that comes from an untrusted source.
+"""
+
+import hashlib
+import pickle
+import struct
+from functools import lru_cache
+from importlib import import_module
+from typing import Any, Dict, Iterable, List, NamedTuple, Tuple, Type, Union
+
+from contextvars_registry.context_var_descriptor import DELETED, RESET_TO_DEFAULT
+from contextvars_registry.context_vars_registry import (
+    ContextVarsRegistry,
+    restore_context_vars_registry,
+    save_context_vars_registry,
+)
+from contextvars_registry.internal_utils import ExceptionDocstringMixin
+
+FORMAT_MAGIC = b"CV"
+"""First bytes of the encoded data."""
+
+FORMAT_VERSION = 1
+"""Version of the format, that is written by :func:`encode_context_vars_registries`."""
+
+_HEADER = struct.Struct("!2sBH")
+_REGISTRY_HEADER = struct.Struct("!8sHHH")
+_DECLARED_FIELD = struct.Struct("!HB")
+_DYNAMIC_FIELD = struct.Struct("!HB")
+
+_TAG_VALUE = 0
+_TAG_DELETED = 1
+_TAG_RESET_TO_DEFAULT = 2
+
+# Markers for tags (the index is the tag).
+# The _TAG_VALUE position is never used: such values are taken from the pickled tuple.
+_TAG_MARKERS = (None, DELETED, RESET_TO_DEFAULT)
+
+EncodedData = Union[bytes, bytearray, memoryview]
+
+
+class _RegistrySchema(NamedTuple):
+    path: bytes
+    fingerprint: bytes
+    field_names: Tuple[str, ...]
+    field_ids: Dict[str, int]
+
+
+@lru_cache(maxsize=None)
+def _get_registry_schema(registry_class: Type[ContextVarsRegistry]) -> _RegistrySchema:
+    # pylint: disable=protected-access
+    path = f"{registry_class.__module__}:{registry_class.__qualname__}"
+    field_names = registry_class._registry_declared_var_names
+    fingerprint = hashlib.blake2b("\n".join([path, *field_names]).encode(), digest_size=8).digest()
+    field_ids = {name: field_id for field_id, name in enumerate(field_names)}
+    return _RegistrySchema(path.encode(), fingerprint, field_names, field_ids)
+
+
+@lru_cache(maxsize=None)
+def _resolve_registry_class(path: str) -> Type[ContextVarsRegistry]:
+    module_name, _, qualname = path.partition(":")
+    try:
+        obj: Any = import_module(module_name)
+        for attr_name in qualname.split("."):
+            obj = getattr(obj, attr_name)
+    except (ImportError, AttributeError) as err:
+        raise EncodedDataError.format(reason=f"can't import registry class '{path}'") from err
+
+    if not (isinstance(obj, type) and issubclass(obj, ContextVarsRegistry)):
+        raise EncodedDataError.format(reason=f"'{path}' is not a ContextVarsRegistry subclass")
+    return obj
+
+
+def encode_context_vars_registries(
+    registries: Iterable[ContextVarsRegistry], *, include_unset: bool = False
+) -> bytes:
+    """Encode variables of the given registries (in the current context) to bytes.
+
+    :param registries: :class:`ContextVarsRegistry` objects, whose variables are encoded.
+    :param include_unset: Also encode variables that are not set (as ``RESET_TO_DEFAULT``).
+                          By default, they're skipped, since they're not set in a fresh
+                          context anyway, so it is not needed to send them.
+    :returns: Data for :func:`decode_context_vars_registries`
+              (or :func:`restore_encoded_context_vars_registries`).
+
+    Variables are read via
+    :func:`~contextvars_registry.context_vars_registry.save_context_vars_registry`,
+    so deleted variables are encoded as well (as ``DELETED`` markers).
+    """
+    chunks: List[bytes] = [b""]
+    values: List[Any] = []
+    registries_count = 0
+
+    for registry in registries:
+        schema = _get_registry_schema(registry.__class__)
+        declared_fields: List[bytes] = []
+        dynamic_fields: List[bytes] = []
+
+        for name, value in save_context_vars_registry(registry).items():
+            if value is DELETED:
+                tag = _TAG_DELETED
+            elif value is RESET_TO_DEFAULT:
+                if not include_unset:
+                    continue
+                tag = _TAG_RESET_TO_DEFAULT
+            else:
+                tag = _TAG_VALUE
+                values.append(value)
+
+            field_id = schema.field_ids.get(name)
+            if field_id is not None:
+                declared_fields.append(_DECLARED_FIELD.pack(field_id, tag))
+            else:
+                encoded_name = name.encode()
+                dynamic_fields.append(_DYNAMIC_FIELD.pack(len(encoded_name), tag) + encoded_name)
+
+        chunks.append(
+            _REGISTRY_HEADER.pack(
+                schema.fingerprint, len(schema.path), len(declared_fields), len(dynamic_fields)
+            )
+        )
+        chunks.append(schema.path)
+        chunks.extend(declared_fields)
+        chunks.extend(dynamic_fields)
+        registries_count += 1
+
+    chunks[0] = _HEADER.pack(FORMAT_MAGIC, FORMAT_VERSION, registries_count)
+    chunks.append(pickle.dumps(tuple(values), protocol=pickle.HIGHEST_PROTOCOL))
+    return b"".join(chunks)
+
+
+def decode_context_vars_registries(
+    data: EncodedData,
+) -> Dict[Type[ContextVarsRegistry], Dict[str, Any]]:
+    """Decode data produced by :func:`encode_context_vars_registries`.
+
+    :param data: Encoded data (``bytes``, or any other object that supports the buffer protocol).
+    :returns: A dict, where keys are registry classes, and values are (partial) saved states,
+              like those returned by
+              :func:`~contextvars_registry.context_vars_registry.save_context_vars_registry`.
+
+    :raises EncodedDataError: the data is corrupted, or encoded in an unsupported format.
+    :raises RegistrySchemaMismatchError: a registry class is defined differently in this process.
+
+    This function doesn't touch any context variables.
+    To apply the decoded variables to the current context,
+    use :func:`restore_encoded_context_vars_registries`.
+    """
+    view = memoryview(data)
+    try:
+        return _decode(view)
+    except (struct.error, IndexError, UnicodeDecodeError, EOFError, pickle.UnpicklingError) as err:
+        raise EncodedDataError.format(reason="the data is truncated or corrupted") from err
+
+
+def _decode(view: memoryview) -> Dict[Type[ContextVarsRegistry], Dict[str, Any]]:
+    magic, version, registries_count = _HEADER.unpack_from(view)
+    if magic != FORMAT_MAGIC:
+        raise EncodedDataError.format(reason="unknown data format")
+    if version != FORMAT_VERSION:
+        raise EncodedDataError.format(reason=f"unsupported format version: {version}")
+    offset = _HEADER.size
+
+    # At first, read all the fields (as tags), and then fill values from the pickled tuple.
+    decoded_fields: List[Tuple[Type[ContextVarsRegistry], List[Tuple[str, int]]]] = []
+    for _ in range(registries_count):
+        fingerprint, path_len, declared_count, dynamic_count = _REGISTRY_HEADER.unpack_from(
+            view, offset
+        )
+        offset += _REGISTRY_HEADER.size
+        path = str(view[offset : offset + path_len], "utf-8")
+        offset += path_len
+
+        registry_class = _resolve_registry_class(path)
+        schema = _get_registry_schema(registry_class)
+        if fingerprint != schema.fingerprint:
+            raise RegistrySchemaMismatchError.format(registry_class_path=path)
+
+        fields = []
+        for _ in range(declared_count):
+            field_id, tag = _DECLARED_FIELD.unpack_from(view, offset)
+            offset += _DECLARED_FIELD.size
+            fields.append((schema.field_names[field_id], tag))
+        for _ in range(dynamic_count):
+            name_len, tag = _DYNAMIC_FIELD.unpack_from(view, offset)
+            offset += _DYNAMIC_FIELD.size
+            fields.append((str(view[offset : offset + name_len], "utf-8"), tag))
+            offset += name_len
+        decoded_fields.append((registry_class, fields))
+
+    values = iter(pickle.loads(view[offset:]))
+    result: Dict[Type[ContextVarsRegistry], Dict[str, Any]] = {}
+    for registry_class, fields in decoded_fields:
+        state = result.setdefault(registry_class, {})
+        for name, tag in fields:
+            state[name] = next(values) if tag == _TAG_VALUE else _TAG_MARKERS[tag]
+    return result
+
+
+def restore_encoded_context_vars_registries(data: EncodedData) -> None:
+    """Decode data produced by :func:`encode_context_vars_registries`, and set the variables.
+
+    The variables are set in the current context.
+    Variables that are not present in the data are left untouched.
+
+    Variables that were allocated on the fly (not declared in the class body) in the encoding
+    process are allocated here as well (if they're missing in the current process).
+
+    Exceptions are the same as in :func:`decode_context_vars_registries`.
+    """
+    for registry_class, encoded_state in decode_context_vars_registries(data).items():
+        # pylint: disable=protected-access
+        registry = registry_class()
+        for name, value in encoded_state.items():
+            if (
+                (name not in registry_class._registry_var_descriptors)
+                and (value is not DELETED)
+                and (value is not RESET_TO_DEFAULT)
+            ):
+                registry[name] = value
+
+        state = save_context_vars_registry(registry)
+        state.update(encoded_state)
+        restore_context_vars_registry(registry, state)
+
+
+class EncodedDataError(ExceptionDocstringMixin, ValueError):
+    """Can't decode registry variables: {reason}.
+
+    This exception is raised by :func:`decode_context_vars_registries` when the data
+    is not produced by :func:`encode_context_vars_registries` (or produced by an incompatible
+    version of the library), or when the data is damaged on the way.
+    """
+
+
+class RegistrySchemaMismatchError(ExceptionDocstringMixin, ValueError):
+    """Definition of '{registry_class_path}' doesn't match the encoded data.
+
+    This exception is raised when variables are encoded in one process, and decoded in another,
+    but variables declared in the registry class differ between these two processes.
+
+    Usually, that means that the processes run different versions of the code
+    (e.g., during a rolling deployment), so the encoded field IDs can't be mapped
+    to the class attributes. Make sure that both processes run the same code.
+    """
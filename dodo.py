@@ -14,6 +14,7 @@ SRC_DIRS = [
     "contextvars_registry",
     "tests",
     "docs",
+    "benchmarks",
 ]
 
 
@@ -87,6 +88,15 @@ def task_test_multi():
     }
 
 
+def task_benchmark():
+    return {
+        "file_dep": SRC_FILES,
+        "actions": [
+            Interactive("python -m benchmarks"),
+        ],
+    }
+
+
 def task_docs():
     return {
         "file_dep": SRC_FILES,
@@ -0,0 +1,193 @@
+import asyncio
+from contextvars import copy_context
+
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_management import (
+    bind_async_generator_to_context,
+    bind_generator_to_context,
+    bind_to_empty_context,
+    bind_to_sandbox_context,
+    bind_to_snapshot_context,
+    run_coroutine_in_context,
+    run_in_executor_in_empty_context,
+    run_in_executor_in_snapshot_context,
+)
+from contextvars_registry.executors import ContextVarsThreadPoolExecutor
+
+
+class CurrentVars(ContextVarsRegistry):
+    request_id: int = 0
+
+
+current = CurrentVars()
+
+
+def _get_request_id(offset: int = 0) -> int:
+    return current.request_id + offset
+
+
+def test__run_in_executor_helpers__override_context_of_the_executor():
+    async def _main():
+        current.request_id = 42
+
+        with ContextVarsThreadPoolExecutor(max_workers=1) as executor:
+            return (
+                await run_in_executor_in_snapshot_context(executor, _get_request_id, 1),
+                await run_in_executor_in_empty_context(executor, _get_request_id, 1),
+            )
+
+    assert asyncio.run(_main()) == (43, 1)
+
+
+async def _set_request_id_and_yield(request_id: int) -> int:
+    current.request_id = request_id
+    await asyncio.sleep(0)
+    return current.request_id
+
+
+@pytest.mark.parametrize(
+    "bind_to_context, expected_seen_request_id",
+    [
+        (bind_to_sandbox_context, 1),
+        (bind_to_snapshot_context, 1),
+        (bind_to_empty_context, 0),
+    ],
+)
+def test__bind_to_context__runs_whole_coroutine_body_in_its_context(
+    bind_to_context, expected_seen_request_id
+):
+    async def _get_request_id_after_yield() -> int:
+        await asyncio.sleep(0)
+        return current.request_id
+
+    async def _main():
+        current.request_id = 1
+        set_request_id = bind_to_context(_set_request_id_and_yield)
+        get_request_id = bind_to_context(_get_request_id_after_yield)
+
+        # Concurrent coroutines don't see changes of each other, nor leak them to the caller.
+        results = await asyncio.gather(set_request_id(2), set_request_id(3), get_request_id())
+        return results, current.request_id
+
+    assert asyncio.run(_main()) == ([2, 3, expected_seen_request_id], 1)
+
+
+def test__run_coroutine_in_context__forwards_throw_and_close():
+    async def _catch_cancel() -> str:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            return f"cancelled with request_id={current.request_id}"
+        raise AssertionError("not reached")
+
+    async def _main():
+        context = copy_context()
+        context.run(current.__setitem__, "request_id", 42)
+
+        # create_task() accepts the driver (and cancels it via throw())
+        task = asyncio.create_task(run_coroutine_in_context(_catch_cancel(), context))
+        await asyncio.sleep(0)
+        task.cancel()
+        return await task
+
+    assert asyncio.run(_main()) == "cancelled with request_id=42"
+
+    coro = run_coroutine_in_context(_set_request_id_and_yield(1), copy_context())
+    assert repr(coro).startswith("<_CoroutineInContext <coroutine object ")
+    assert coro.__await__().send(None) is None  # stopped at asyncio.sleep(0)
+    coro.close()
+    assert current.request_id == 0
+
+
+def _generate_request_ids(request_id: int):
+    current.request_id = request_id
+    try:
+        while True:
+            received = yield current.request_id
+            if received is not None:
+                current.request_id = received
+    finally:
+        current.request_id = -1
+
+
+async def _generate_request_ids_async(request_id: int):
+    current.request_id = request_id
+    try:
+        while True:
+            await asyncio.sleep(0)
+            received = yield current.request_id
+            if received is not None:
+                current.request_id = received
+    finally:
+        current.request_id = -1
+
+
+@pytest.mark.parametrize(
+    "bind_to_context, expected_first_item",
+    [
+        (bind_to_sandbox_context, 1),
+        (bind_to_snapshot_context, 1),
+        (bind_to_empty_context, 0),
+    ],
+)
+@bind_to_sandbox_context
+def test__bind_to_context__runs_generator_steps_in_its_context(
+    bind_to_context, expected_first_item
+):
+    def _get_request_ids():
+        while True:
+            yield current.request_id
+
+    current.request_id = 1
+    request_ids = bind_to_context(_get_request_ids)()
+    current.request_id = 2
+    assert next(request_ids) == expected_first_item
+
+    generator = bind_to_context(_generate_request_ids)(10)
+    assert next(generator) == 10
+    current.request_id = 3
+    assert generator.send(11) == 11
+    assert next(generator) == 11
+    with pytest.raises(KeyError):
+        generator.throw(KeyError("boom"))
+    assert current.request_id == 3
+
+
+@bind_to_sandbox_context
+def test__bind_generator_to_context__uses_one_context_for_all_steps():
+    context = copy_context()
+    generator = bind_generator_to_context(_generate_request_ids(10), context)
+    assert repr(generator).startswith("<_GeneratorInContext <generator object ")
+
+    assert list(zip(generator, range(2))) == [(10, 0), (10, 1)]
+    assert context.run(getattr, current, "request_id") == 10
+
+    generator.close()
+    assert context.run(getattr, current, "request_id") == -1
+    assert current.request_id == 0
+
+
+@bind_to_sandbox_context
+def test__bind_async_generator_to_context__uses_one_context_for_all_steps():
+    context = copy_context()
+
+    async def _main():
+        generator = bind_async_generator_to_context(_generate_request_ids_async(10), context)
+        assert repr(generator).startswith("<_AsyncGeneratorInContext <async_generator object ")
+
+        assert await generator.__anext__() == 10
+        current.request_id = 3
+        assert await generator.asend(11) == 11
+        with pytest.raises(KeyError):
+            await generator.athrow(KeyError("boom"))
+        await generator.aclose()
+
+        auto_bound_generator = bind_to_sandbox_context(_generate_request_ids_async)(20)
+        assert await auto_bound_generator.__anext__() == 20
+        await auto_bound_generator.aclose()
+        return current.request_id
+
+    assert asyncio.run(_main()) == 3
+    assert context.run(getattr, current, "request_id") == -1
+    assert current.request_id == 0
@@ -0,0 +1,81 @@
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from threading import Barrier
+from typing import List
+
+import pytest
+from contextvars_registry import ContextVarDescriptor, ContextVarsRegistry
+from contextvars_registry.context_pool import ContextPool
+
+_session_ids = count()
+
+
+class CurrentVars(ContextVarsRegistry):
+    session_id = ContextVarDescriptor(deferred_default=lambda: next(_session_ids))
+    config = ContextVarDescriptor(deferred_default=lambda: {"id": next(_session_ids)})
+    user_id: int = 0
+
+
+current = CurrentVars()
+
+
+def _get_session_id_and_set_user_id(user_id: int) -> int:
+    assert current.user_id == 0  # changes made by previous tasks are not seen
+    current.user_id = user_id
+    return current.session_id
+
+
+def test__run__materializes_deferred_defaults_once_per_pool_slot():
+    pool = ContextPool(current, max_size=2)
+    started = Barrier(2)
+
+    def _wait_and_get_session_id(user_id: int) -> int:
+        started.wait()  # both workers are busy, so the pool has to create 2 contexts
+        return _get_session_id_and_set_user_id(user_id)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first_batch = list(executor.map(pool.run, [_wait_and_get_session_id] * 2, [1, 2]))
+        second_batch = list(executor.map(pool.run, [_wait_and_get_session_id] * 2, [3, 4]))
+
+    assert len(set(first_batch)) == 2
+    assert set(second_batch) == set(first_batch)
+    assert len(pool) == 2
+
+    configs = [pool.run(lambda: current.config) for _ in range(3)]
+    assert configs[0] is configs[1] is configs[2]
+
+
+def test__pool__evicts_least_recently_used_and_worn_out_contexts():
+    torn_down: List[int] = []
+    pool = ContextPool(
+        current,
+        warm_up=lambda: setattr(current, "user_id", 0),
+        tear_down=lambda: torn_down.append(current.session_id),
+        max_size=1,
+        max_uses=2,
+    )
+
+    with pool.check_out() as context_1, pool.check_out() as context_2:
+        session_1 = context_1.run(_get_session_id_and_set_user_id, 1)
+        session_2 = context_2.run(_get_session_id_and_set_user_id, 2)
+
+    # The pool is full, so the least recently used context (the 2nd one) is evicted.
+    assert torn_down == [session_2]
+    assert len(pool) == 1
+
+    # The 1st context is evicted after its 2nd use (even if the task fails).
+    with pytest.raises(ZeroDivisionError):
+        pool.run(lambda: 1 / 0)
+    assert torn_down == [session_2, session_1]
+    assert len(pool) == 0
+
+    new_session = pool.run(_get_session_id_and_set_user_id, 3)
+    assert new_session not in (session_1, session_2)
+    pool.clear()
+    assert torn_down == [session_2, session_1, new_session]
+    assert len(pool) == 0
+
+    # Without tear_down, contexts are just dropped.
+    pool = ContextPool(max_size=0)
+    assert pool.run(_get_session_id_and_set_user_id, 4) not in torn_down
+    pool.clear()
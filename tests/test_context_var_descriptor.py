@@ -1,8 +1,18 @@
-from contextvars import ContextVar
-
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import Context, ContextVar
+from itertools import count
+from threading import Barrier, get_ident
+from typing import List
+
+import contextvars_registry.context_var_descriptor
 import pytest
-from contextvars_registry import ContextVarDescriptor
+from contextvars_registry import ContextVarDescriptor, ContextVarsRegistry
 from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.context_var_descriptor import DeleteStrictContextVarError
+
+_MISSING = object()
 
 
 def test__descriptor__can_be_initialized_with_an_existing_context_var_object():
@@ -102,3 +112,288 @@ def test__deferred_default__cannot_be_used__if_existing_context_var_has_default_
     timezone_var = ContextVar("timezone_var", default="UTC")
     with pytest.raises(AssertionError):
         ContextVarDescriptor.from_existing_var(timezone_var, deferred_default=lambda: "GMT")
+
+
+def test__deferred_default__is_called__in_empty_context():
+    timezone_var = ContextVarDescriptor("timezone_var", deferred_default=lambda: "UTC")
+
+    # A fresh empty context (like in a new thread) doesn't contain anything,
+    # not even the RESET_TO_DEFAULT marker, but the deferred default still works there.
+    assert Context().run(timezone_var.get) == "UTC"
+    assert Context().run(timezone_var.is_gettable) is True
+    assert Context().run(timezone_var.is_set) is False
+
+
+@pytest.mark.parametrize(
+    "descriptor_kwargs, default_value",
+    [
+        ({}, _MISSING),
+        ({"default": "UTC"}, "UTC"),
+        ({"deferred_default": lambda: "UTC"}, "UTC"),
+    ],
+)
+@bind_to_sandbox_context
+def test__get_and_is_set_methods__behave_consistently__for_all_kinds_of_defaults(
+    descriptor_kwargs, default_value
+):
+    timezone_var = ContextVarDescriptor("timezone_var", **descriptor_kwargs)
+
+    def _get():
+        try:
+            return timezone_var.get()
+        except LookupError:
+            return _MISSING
+
+    has_default = "default" in descriptor_kwargs
+    has_deferred_default = "deferred_default" in descriptor_kwargs
+
+    # initial state: not set
+    assert timezone_var.is_set() is False
+    assert timezone_var.is_set(on_default=True) is has_default
+    assert timezone_var.is_set(on_deferred_default=True) is has_deferred_default
+    assert timezone_var.is_gettable() is (default_value is not _MISSING)
+    assert timezone_var.get("GMT") == "GMT"
+    assert _get() == default_value
+
+    # set
+    timezone_var.set("Europe/London")
+    assert _get() == timezone_var.get("GMT") == "Europe/London"
+    assert timezone_var.is_gettable() is True
+    assert timezone_var.is_set() is True
+
+    # reset to default
+    timezone_var.reset_to_default()
+    assert timezone_var.get("GMT") == "GMT"
+    assert _get() == default_value
+
+    # deleted
+    timezone_var.delete()
+    assert _get() is _MISSING
+    assert timezone_var.get("GMT") == "GMT"
+    assert timezone_var.is_gettable() is False
+    assert timezone_var.is_set(on_default=True, on_deferred_default=True) is False
+
+
+@pytest.mark.parametrize(
+    "descriptor_kwargs, default_value",
+    [
+        ({}, _MISSING),
+        ({"default": "UTC"}, "UTC"),
+        ({"deferred_default": lambda: "UTC"}, "UTC"),
+    ],
+)
+@bind_to_sandbox_context
+def test__strict_descriptor__cannot_be_deleted__but_otherwise_works_as_usual(
+    descriptor_kwargs, default_value
+):
+    timezone_var = ContextVarDescriptor("timezone_var", strict=True, **descriptor_kwargs)
+
+    def _get():
+        try:
+            return timezone_var.get()
+        except LookupError:
+            return _MISSING
+
+    has_default = "default" in descriptor_kwargs
+    has_deferred_default = "deferred_default" in descriptor_kwargs
+
+    # strict variables never contain special marker objects, even with deferred_default
+    assert timezone_var.get_raw(_MISSING) is _MISSING
+
+    # initial state: not set
+    assert timezone_var.is_set() is False
+    assert timezone_var.is_set(on_default=True) is has_default
+    assert timezone_var.is_set(on_deferred_default=True) is has_deferred_default
+    assert timezone_var.is_gettable() is (default_value is not _MISSING)
+    assert timezone_var.get("GMT") == "GMT"
+    assert _get() == default_value
+
+    # set
+    token = timezone_var.set("Europe/London")
+    assert _get() == timezone_var.get("GMT") == "Europe/London"
+    assert timezone_var.is_gettable() is True
+    assert timezone_var.is_set() is True
+
+    # deletion is not allowed
+    with pytest.raises(DeleteStrictContextVarError):
+        timezone_var.delete()
+    with pytest.raises(DeleteStrictContextVarError):
+        timezone_var.reset_to_default()
+    assert _get() == "Europe/London"
+
+    # ...but resetting the value via Token is allowed
+    timezone_var.reset(token)
+    assert _get() == default_value
+
+
+def test__strict_descriptor__uses_builtin_ContextVar_get_method():
+    timezone_var = ContextVarDescriptor("timezone_var", default="UTC", strict=True)
+    assert timezone_var.get == timezone_var.context_var.get
+
+    existing_var: ContextVar[str] = ContextVar("existing_var")
+    existing_var_ext = ContextVarDescriptor.from_existing_var(existing_var, strict=True)
+    assert existing_var_ext.strict
+    assert existing_var_ext.get == existing_var.get
+
+
+@pytest.mark.parametrize("descriptor_kwargs", [{}, {"default": "UTC"}])
+def test__strict_descriptor__get__accepts_default_only_positionally(descriptor_kwargs):
+    timezone_var = ContextVarDescriptor("timezone_var", strict=True, **descriptor_kwargs)
+    assert timezone_var.get("GMT") == "GMT"
+    with pytest.raises(TypeError, match="no keyword arguments"):
+        timezone_var.get(default="GMT")
+
+    # deferred_default needs a Python-level wrapper, so there the keyword works as usual
+    timezone_var = ContextVarDescriptor("timezone_var", strict=True, deferred_default=lambda: "UTC")
+    assert timezone_var.get(default="GMT") == "GMT"
+
+
+def _new_counting_factory(delay: float = 0):
+    calls: List[int] = []
+    call_ids = count()
+
+    def _factory():
+        calls.append(get_ident())
+        time.sleep(delay)  # widens the window for races between threads
+        return f"value {next(call_ids)}"
+
+    return _factory, calls
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test__deferred_default_scope__process__calls_function_once__under_concurrent_first_access(
+    strict,
+):
+    factory, calls = _new_counting_factory(delay=0.01)
+    client_var = ContextVarDescriptor(
+        "client_var", deferred_default=factory, deferred_default_scope="process", strict=strict
+    )
+    threads_count = 8
+    started = Barrier(threads_count)
+
+    def _get_in_new_context(_):
+        started.wait()
+        return Context().run(client_var.get)
+
+    with ThreadPoolExecutor(max_workers=threads_count) as executor:
+        values = list(executor.map(_get_in_new_context, range(threads_count)))
+
+    assert values == ["value 0"] * threads_count
+    assert len(calls) == 1
+
+    # The value is stored in each context (like with the "context" scope).
+    context = Context()
+    assert not context.run(client_var.is_set)
+    assert context.run(client_var.get) == "value 0"
+    assert context.run(client_var.is_set)
+
+
+def test__deferred_default_scope__thread__calls_function_once_per_thread():
+    factory, calls = _new_counting_factory(delay=0.01)
+    client_var = ContextVarDescriptor(
+        "client_var", deferred_default=factory, deferred_default_scope="thread"
+    )
+    threads_count = 4
+    started = Barrier(threads_count)
+
+    def _get_in_new_contexts(_):
+        started.wait()
+        return [Context().run(client_var.get) for _ in range(3)]
+
+    with ThreadPoolExecutor(max_workers=threads_count) as executor:
+        values = list(executor.map(_get_in_new_contexts, range(threads_count)))
+
+    # Each thread has its own value, shared by all contexts of the thread.
+    assert all(len(set(thread_values)) == 1 for thread_values in values)
+    assert len({thread_values[0] for thread_values in values}) == threads_count
+    assert len(calls) == len(set(calls)) == threads_count
+
+
+@pytest.mark.parametrize("scope", ["thread", "process"])
+def test__deferred_default_scope__failed_call__is_retried(scope):
+    results = iter([ZeroDivisionError, "value"])
+
+    def _factory():
+        result = next(results)
+        if result is ZeroDivisionError:
+            raise result
+        return result
+
+    client_var = ContextVarDescriptor(
+        "client_var", deferred_default=_factory, deferred_default_scope=scope
+    )
+    with pytest.raises(ZeroDivisionError):
+        Context().run(client_var.get)
+    assert Context().run(client_var.get) == "value"
+    assert Context().run(client_var.get) == "value"
+
+
+def test__deferred_default_scope__can_be_set_for_registry_attributes_and_existing_vars():
+    factory, calls = _new_counting_factory()
+
+    class CurrentVars(ContextVarsRegistry):
+        client = ContextVarDescriptor(deferred_default=factory, deferred_default_scope="process")
+
+    existing_var_ext = ContextVarDescriptor.from_existing_var(
+        ContextVar("existing_var"), deferred_default=factory, deferred_default_scope="thread"
+    )
+
+    assert Context().run(getattr, CurrentVars(), "client") == "value 0"
+    assert Context().run(getattr, CurrentVars(), "client") == "value 0"
+    assert Context().run(existing_var_ext.get) == "value 1"
+    assert Context().run(existing_var_ext.get) == "value 1"
+    assert CurrentVars.client.deferred_default_scope == "process"
+    assert existing_var_ext.deferred_default is factory
+    assert len(calls) == 2
+
+
+def test__deferred_default_scope__must_be_valid():
+    with pytest.raises(ValueError, match="got: 'request'"):
+        ContextVarDescriptor(
+            "client_var",
+            deferred_default=dict,
+            deferred_default_scope="request",  # type: ignore[arg-type]
+        )
+
+
+@pytest.mark.parametrize("scope", ["thread", "process"])
+def test__deferred_default_scope__values_are_produced_again_after_fork(scope):
+    factory, calls = _new_counting_factory()
+    client_var = ContextVarDescriptor(
+        "client_var", deferred_default=factory, deferred_default_scope=scope
+    )
+    assert Context().run(client_var.get) == "value 0"
+
+    # This is what happens in a child process after fork() (tested here, in the same process,
+    # since coverage is not measured in child processes).
+    reset_after_fork = (
+        contextvars_registry.context_var_descriptor._reset_scoped_deferred_defaults_after_fork
+    )
+    reset_after_fork()
+    assert Context().run(client_var.get) == "value 1"
+    assert len(calls) == 2
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork() is not available")
+def test__deferred_default_scope__process__is_reset_in_forked_child_process():
+    factory, _ = _new_counting_factory()
+    client_var = ContextVarDescriptor(
+        "client_var", deferred_default=factory, deferred_default_scope="process"
+    )
+    assert Context().run(client_var.get) == "value 0"
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover (the child process)
+        try:
+            os.write(write_fd, Context().run(client_var.get).encode())
+        finally:
+            os._exit(0)
+
+    os.close(write_fd)
+    with os.fdopen(read_fd) as read_file:
+        child_value = read_file.read()
+    os.waitpid(pid, 0)
+
+    assert child_value == "value 1"
+    assert Context().run(client_var.get) == "value 0"
@@ -1,11 +1,28 @@
 import functools
+from collections.abc import MutableMapping
+from contextvars import Context, copy_context
 from typing import ClassVar, Optional
 
+import pytest
 from pytest import raises
 
+import contextvars_registry.context_vars_registry
 from contextvars_registry import ContextVar, ContextVarDescriptor, ContextVarsRegistry
-from contextvars_registry.context_var_descriptor import RESET_TO_DEFAULT
-from contextvars_registry.context_vars_registry import RegistryInheritanceError
+from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.context_var_descriptor import (
+    DELETED,
+    RESET_TO_DEFAULT,
+    DeleteStrictContextVarError,
+)
+from contextvars_registry.context_vars_registry import (
+    RegistryInheritanceError,
+    RegistrySnapshotMismatchError,
+    SetClassVarAttributeError,
+    restore_context_vars_registry,
+    save_context_vars_registry,
+    seal_context_vars_registry,
+)
+from contextvars_registry.packed_context_var_descriptor import PackedContextVarDescriptor
 
 # pylint: disable=attribute-defined-outside-init,protected-access,pointless-statement
 # pylint: disable=function-redefined
@@ -581,3 +598,518 @@ def test__dict_clear_method():
     current.clear()
 
     assert set(current.values()) == set()
+
+
+def test__strict_registry__allocates_strict_vars__that_cannot_be_deleted():
+    class CurrentVars(ContextVarsRegistry):
+        _registry_strict = True
+        locale: str = "en"
+        timezone = ContextVarDescriptor(default="UTC")  # manually created, so not strict
+
+    current = CurrentVars()
+    current.user_id = 42  # type: ignore[attr-defined]
+
+    descriptors = CurrentVars._registry_var_descriptors
+    assert descriptors["locale"].strict
+    assert descriptors["user_id"].strict
+    assert not descriptors["timezone"].strict
+
+    with raises(DeleteStrictContextVarError):
+        del current.locale
+    with raises(DeleteStrictContextVarError):
+        del current["user_id"]
+    del current.timezone
+
+    # the with() block still works, since it uses Token objects to restore values
+    with current(locale="en_GB", user_id=43):
+        assert current.locale == "en_GB"
+        assert current.user_id == 43  # type: ignore[attr-defined]
+    assert current.locale == "en"
+    assert current.user_id == 42  # type: ignore[attr-defined]
+
+    # the saved state can be restored, unless it requires deletion of a variable
+    state = save_context_vars_registry(current)
+    current.locale = "nb"
+    restore_context_vars_registry(current, state)
+    assert current.locale == "en"
+
+    del state["user_id"]
+    with raises(DeleteStrictContextVarError):
+        restore_context_vars_registry(current, state)
+
+
+def test__packed_registry__stores_all_vars__in_a_single_context_var():
+    class CurrentVars(ContextVarsRegistry):
+        _registry_packed = True
+        locale: str = "en"
+        timezone = ContextVarDescriptor(default="UTC")  # manually created, so not packed
+        user_id: int
+
+    current = CurrentVars()
+    descriptors = CurrentVars._registry_var_descriptors
+    packed_var = CurrentVars._registry_packed_var
+
+    assert isinstance(descriptors["locale"], PackedContextVarDescriptor)
+    assert isinstance(descriptors["user_id"], PackedContextVarDescriptor)
+    assert not isinstance(descriptors["timezone"], PackedContextVarDescriptor)
+    assert descriptors["locale"].context_var is descriptors["user_id"].context_var is packed_var
+
+    # attribute access works as usual
+    assert current.locale == "en"
+    current.user_id = 42
+    current["timezone"] = "GMT"
+    assert packed_var.get() == (RESET_TO_DEFAULT, 42)
+    assert dict(current) == {"locale": "en", "timezone": "GMT", "user_id": 42}
+
+    with current(locale="en_GB", user_id=43):
+        assert packed_var.get() == ("en_GB", 43)
+    assert packed_var.get() == (RESET_TO_DEFAULT, 42)
+
+    # variables allocated dynamically get next slots (that are missing in existing records)
+    state = save_context_vars_registry(current)
+    current.session_id = "abc"  # type: ignore[attr-defined]
+    assert descriptors["session_id"].slot == 2  # type: ignore[attr-defined]
+
+    # the record is written only once on restore, and missing slots are filled
+    restore_context_vars_registry(current, state)
+    assert packed_var.get() == (RESET_TO_DEFAULT, 42, DELETED)
+    assert current.timezone == "GMT"
+    assert "session_id" not in current
+
+    # the short record (written before session_id was allocated) is saved correctly as well
+    packed_var.set((RESET_TO_DEFAULT, 42))
+    assert save_context_vars_registry(current) == {
+        "locale": RESET_TO_DEFAULT,
+        "timezone": "GMT",
+        "user_id": 42,
+        "session_id": RESET_TO_DEFAULT,
+    }
+    restore_context_vars_registry(current, {**state, "session_id": "xyz"})
+    assert packed_var.get() == (RESET_TO_DEFAULT, 42, "xyz")
+
+
+def test__packed_strict_registry__cannot_restore_deleted_vars():
+    class CurrentVars(ContextVarsRegistry):
+        _registry_packed = True
+        _registry_strict = True
+        locale: str = "en"
+
+    current = CurrentVars()
+    state = save_context_vars_registry(current)
+    current.locale = "en_GB"
+
+    with raises(DeleteStrictContextVarError):
+        restore_context_vars_registry(current, {})
+    assert current.locale == "en_GB"
+
+    restore_context_vars_registry(current, state)
+    assert current.locale == "en"
+
+
+@bind_to_sandbox_context
+def test__packed_registry__saves_manually_created_vars_without_default():
+    class CurrentVars(ContextVarsRegistry):
+        _registry_packed = True
+        locale: str = "en"
+        user_id = ContextVarDescriptor[int]()  # manually created, not packed, and has no default
+
+    current = CurrentVars()
+    state = save_context_vars_registry(current)
+    assert state == {"locale": RESET_TO_DEFAULT, "user_id": RESET_TO_DEFAULT}
+
+    current["user_id"] = 42
+    assert save_context_vars_registry(current) == {"locale": RESET_TO_DEFAULT, "user_id": 42}
+
+    restore_context_vars_registry(current, state)
+    assert "user_id" not in current
+
+
+@pytest.mark.parametrize("packed", [False, True])
+@bind_to_sandbox_context
+def test__set_fields_tracking__does_not_change_registry_contents(packed):  # noqa: R701
+    class UntrackedVars(ContextVarsRegistry):
+        _registry_packed = packed
+        locale: str = "en"
+        timezone: str
+        user_id: int
+        settings: ContextVarDescriptor[dict] = ContextVarDescriptor(deferred_default=dict)
+
+    class TrackedVars(ContextVarsRegistry):
+        _registry_packed = packed
+        _registry_track_set_fields = True
+        locale: str = "en"
+        timezone: str
+        user_id: int
+        settings: ContextVarDescriptor[dict] = ContextVarDescriptor(deferred_default=dict)
+
+    untracked = UntrackedVars()
+    tracked = TrackedVars()
+    registries = (untracked, tracked)
+
+    def _assert_consistent():
+        assert list(tracked.items()) == list(untracked.items())
+        assert len(tracked) == len(untracked)
+
+    _assert_consistent()
+    assert list(tracked) == ["locale"]
+
+    for registry in registries:
+        registry["user_id"] = 42
+        registry["session_id"] = "abc"  # dynamically allocated variable
+        registry["settings"]  # manually created descriptor, with deferred default
+    _assert_consistent()
+    assert list(tracked) == ["locale", "user_id", "settings", "session_id"]
+    assert TrackedVars._registry_set_fields_var.get() == 0b10100
+
+    for registry in registries:
+        del registry["locale"]
+        registry._registry_var_descriptors["user_id"].reset_to_default()
+    _assert_consistent()
+    assert list(tracked) == ["settings", "session_id"]
+
+    for registry in registries:
+        with registry(timezone="UTC"):
+            assert list(registry) == ["timezone", "settings", "session_id"]
+    _assert_consistent()
+
+    # restored variables are tracked as well (even if restored in a fresh empty context)
+    def _restore_in_empty_context(registry):
+        registry["timezone"] = "UTC"
+        state = {**save_context_vars_registry(registry), "timezone": "GMT"}
+        return Context().run(_restore, registry, state)
+
+    def _restore(registry, state):
+        restore_context_vars_registry(registry, state)
+        return dict(registry)
+
+    assert (
+        _restore_in_empty_context(tracked)
+        == _restore_in_empty_context(untracked)
+        == {"timezone": "GMT", "settings": {}, "session_id": "abc"}
+    )
+
+
+class _KeysAndGetItemOnly:
+    # An object that is not a Mapping, but still acceptable by dict.update()
+    def __init__(self, data):
+        self.data = data
+
+    def keys(self):
+        return self.data.keys()
+
+    def __getitem__(self, key):
+        return self.data[key]
+
+
+@bind_to_sandbox_context
+def test__dict_methods__behave_like__generic_MutableMapping_methods():  # noqa: R701
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+        timezone: str
+        user_id: int
+        settings: ContextVarDescriptor[dict] = ContextVarDescriptor(deferred_default=dict)
+
+    current = CurrentVars()
+    current.user_id = 42
+    del current.locale
+
+    # Run each method twice: the native implementation, and the generic one from MutableMapping,
+    # and check that results (and resulting registry states) are the same.
+    def _call_both(method_name, *args, **kwargs):
+        def _call(method):
+            try:
+                return method(current, *args, **kwargs), dict(current)
+            except KeyError:
+                return KeyError, dict(current)
+
+        native_method = getattr(CurrentVars, method_name)
+        generic_method = getattr(MutableMapping, method_name)
+        native_result = copy_context().run(_call, native_method)
+        generic_result = copy_context().run(_call, generic_method)
+        assert native_result == generic_result
+        return native_result[0]
+
+    for key in ("locale", "timezone", "user_id", "settings", "non_existent"):
+        # NOTE: the generic __contains__() is not checked here, because it triggers deferred_default
+        assert (key in current) is (key in ("user_id", "settings"))
+        _call_both("get", key)
+        _call_both("get", key, "DEFAULT")
+        _call_both("pop", key)
+        _call_both("pop", key, "DEFAULT")
+        _call_both("setdefault", key)
+        _call_both("setdefault", key, "DEFAULT")
+
+    assert _call_both("get", "user_id") == 42
+    assert _call_both("get", "settings") == {}
+    assert _call_both("setdefault", "locale", "nb") == "nb"
+
+    _call_both("update", {"locale": "nb", "new_key": 1})
+    _call_both("update", [("locale", "nb"), ("timezone", "UTC")], user_id=43)
+    _call_both("update", current, user_id=43)
+    _call_both("update", _KeysAndGetItemOnly({"locale": "nb"}))
+    _call_both("clear")
+
+    assert list(current.items()) == [("user_id", 42)]
+    assert list(current.values()) == [42]
+    assert ("user_id", 42) in current.items()
+    assert 42 in current.values()
+
+
+@pytest.mark.parametrize("packed", [False, True])
+@pytest.mark.parametrize("track_set_fields", [False, True])
+@bind_to_sandbox_context
+def test__snapshot__can_be_restored(packed, track_set_fields):
+    class CurrentVars(ContextVarsRegistry):
+        _registry_packed = packed
+        _registry_track_set_fields = track_set_fields
+        locale: str = "en"
+        timezone: str
+        user_id: int
+        settings: ContextVarDescriptor[dict] = ContextVarDescriptor(deferred_default=dict)
+
+    current = CurrentVars()
+    current.timezone = "UTC"
+    snapshot1 = current.snapshot()
+    dict1 = dict(current)
+    assert repr(snapshot1) == "<RegistrySnapshot of CurrentVars>"
+
+    current.locale = "en_GB"
+    current.user_id = 42
+    current.session_id = "abc"  # type: ignore[attr-defined]
+    del current.timezone
+    current.settings["key"] = "value"
+    snapshot2 = current.snapshot()
+    dict2 = dict(current)
+
+    current.restore(snapshot1)
+    assert dict(current) == dict1 == {"locale": "en", "timezone": "UTC"}
+    assert current.settings == {}
+
+    current.restore(snapshot2)
+    assert dict(current) == dict2
+    assert dict2 == {
+        "locale": "en_GB",
+        "user_id": 42,
+        "session_id": "abc",
+        "settings": {"key": "value"},
+    }
+
+    # a snapshot restored in a fresh empty context
+    def _restore_and_get_dict(snapshot):
+        current.restore(snapshot)
+        return dict(current)
+
+    assert Context().run(_restore_and_get_dict, snapshot2) == dict2
+
+
+@bind_to_sandbox_context
+def test__snapshot__restore__writes_only_changed_variables():
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+        timezone: str = "UTC"
+
+    current = CurrentVars()
+    current.locale = "en_GB"
+    snapshot = current.snapshot()
+
+    set_calls = []
+
+    def _count_set_calls(key, set_method, value):
+        set_calls.append(key)
+        return set_method(value)
+
+    for key, descriptor in CurrentVars._registry_var_descriptors.items():
+        descriptor.set = functools.partial(  # type: ignore[method-assign]
+            _count_set_calls, key, descriptor.set
+        )
+
+    current.restore(snapshot)
+    assert set_calls == []
+
+    current.timezone = "GMT"
+    current.restore(snapshot)
+    assert set_calls == ["timezone", "timezone"]
+    assert dict(current) == {"locale": "en_GB", "timezone": "UTC"}
+
+
+@bind_to_sandbox_context
+def test__snapshot__of_strict_registry__cannot_unset_variables():
+    class CurrentVars(ContextVarsRegistry):
+        _registry_strict = True
+        locale: str = "en"
+        user_id: int
+
+    current = CurrentVars()
+    snapshot = current.snapshot()
+
+    # variables with defaults are restored by setting the default value explicitly
+    current.locale = "en_GB"
+    current.restore(snapshot)
+    assert current.locale == "en"
+
+    # ...but variables without defaults can't be unset
+    current.user_id = 42
+    with raises(DeleteStrictContextVarError):
+        current.restore(snapshot)
+
+
+def test__snapshot__cannot_be_restored_into_another_registry():
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+
+    class OtherVars(ContextVarsRegistry):
+        locale: str = "en"
+
+    with raises(RegistrySnapshotMismatchError):
+        OtherVars().restore(CurrentVars().snapshot())
+
+
+@bind_to_sandbox_context
+def test__save_context_vars_registry__handles_unset_variables():
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+        user_id: int
+
+    current = CurrentVars()
+    state = save_context_vars_registry(current)
+    assert state == {"locale": RESET_TO_DEFAULT, "user_id": RESET_TO_DEFAULT}
+
+    current.user_id = 42
+    restore_context_vars_registry(current, state)
+    assert dict(current) == {"locale": "en"}
+
+
+@bind_to_sandbox_context
+def test__with_context_manager__caches_descriptors__only_for_context_vars():
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+        _timezone: str = "UTC"
+
+        @property
+        def timezone(self):
+            return self._timezone
+
+        @timezone.setter
+        def timezone(self, value):
+            self._timezone = value
+
+    current = CurrentVars()
+    cache = CurrentVars._registry_override_cache
+
+    # the 1st call resolves descriptors, and the 2nd call takes them from cache
+    for _ in range(2):
+        with current(locale="en_GB", user_id=42):
+            assert dict(current) == {"locale": "en_GB", "_timezone": "UTC", "user_id": 42}
+        assert dict(current) == {"locale": "en", "_timezone": "UTC"}
+
+    assert cache == {
+        ("locale", "user_id"): (
+            CurrentVars._registry_var_descriptors["locale"],
+            CurrentVars._registry_var_descriptors["user_id"],
+        )
+    }
+
+    # properties are not cached (they're set via setattr() each time)
+    for _ in range(2):
+        with current(locale="en_GB", timezone="GMT"):
+            assert current.timezone == "GMT"
+        assert current.timezone == "UTC"
+    assert ("locale", "timezone") not in cache
+
+
+@pytest.mark.parametrize("warm_up_cache", [False, True])
+@bind_to_sandbox_context
+def test__with_context_manager__undoes_changes__if_enter_fails(warm_up_cache):
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+        timezone: str = "UTC"
+
+    current = CurrentVars()
+    if warm_up_cache:
+        with current(locale="en_GB", timezone="GMT"):
+            pass
+
+    def _fail(value):
+        raise ValueError(value)
+
+    CurrentVars._registry_var_descriptors["timezone"].set = _fail  # type: ignore[method-assign]
+
+    with raises(ValueError):
+        with current(locale="en_GB", timezone="GMT"):
+            pass
+
+    assert current.locale == "en"
+
+
+@bind_to_sandbox_context
+def test__with_context_manager__restores_all_attrs__even_if_some_restore_fails():
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+        timezone: str = "UTC"
+        user_id: int = 0
+
+    current = CurrentVars()
+
+    def _fail(token):
+        raise ValueError(token)
+
+    CurrentVars._registry_var_descriptors["timezone"].reset = _fail  # type: ignore[method-assign]
+
+    with raises(ValueError):
+        with current(locale="en_GB", timezone="GMT", user_id=42):
+            pass
+
+    assert current.locale == "en"
+    assert current.timezone == "GMT"
+    assert current.user_id == 0
+
+
+@bind_to_sandbox_context
+def test__sealed_registry__uses_native_setattr__and_does_not_allocate_vars():
+    class CurrentVars(ContextVarsRegistry):
+        locale: str = "en"
+
+    current = CurrentVars()
+    current.user_id = 42  # type: ignore[attr-defined]
+    assert CurrentVars.__setattr__ is not object.__setattr__
+
+    seal_context_vars_registry(CurrentVars)
+    seal_context_vars_registry(CurrentVars)  # calling it twice is fine
+    assert CurrentVars.__setattr__ is object.__setattr__
+
+    current.locale = "en_GB"
+    current.user_id = 43  # type: ignore[attr-defined]
+    current["user_id"] = 44
+    current.update(locale="nb")
+    assert dict(current) == {"locale": "nb", "user_id": 44}
+
+    with raises(AttributeError):
+        current.timezone = "UTC"  # type: ignore[attr-defined]
+    with raises(AttributeError):
+        current["timezone"] = "UTC"
+    with raises(AttributeError):
+        with current(timezone="UTC"):
+            pass
+    assert "timezone" not in CurrentVars._registry_var_descriptors
+
+
+def test__type_hints__are_evaluated_only_once__when_class_is_created(monkeypatch):
+    class CurrentVars(ContextVarsRegistry):
+        app_name: ClassVar[str]
+        locale: str = "en"
+
+    def _get_type_hints_must_not_be_called(cls):
+        raise AssertionError("get_type_hints() must not be called")
+
+    monkeypatch.setattr(
+        contextvars_registry.context_vars_registry,
+        "get_type_hints",
+        _get_type_hints_must_not_be_called,
+    )
+
+    current = CurrentVars()
+    current.user_id = 42  # type: ignore[attr-defined]
+    assert current.user_id == 42  # type: ignore[attr-defined]
+
+    with raises(SetClassVarAttributeError):
+        current.app_name = "Other App"  # type: ignore[misc]
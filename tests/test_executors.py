@@ -0,0 +1,219 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import Context
+from threading import Event
+from typing import Any, Dict, List
+
+import contextvars_registry.executors
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_management import (
+    bind_to_sandbox_context,
+    bind_to_snapshot_context,
+)
+from contextvars_registry.executors import (
+    ContextVarsProcessPoolExecutor,
+    ContextVarsThreadPoolExecutor,
+)
+from contextvars_registry.serialization import (
+    decode_context_vars_registries,
+    encode_context_vars_registries,
+)
+
+
+class CurrentVars(ContextVarsRegistry):
+    locale: str = "en"
+    counter: int = 0
+
+
+current = CurrentVars()
+
+
+def _increment_counter(step: int = 1) -> int:
+    current.counter += step
+    return current.counter
+
+
+@bind_to_sandbox_context
+def test__submit__runs_task_in_snapshot_taken_at_submit_time():
+    started = Event()
+    proceed = Event()
+
+    def _wait_and_get_locale(suffix, *, extra=""):
+        started.set()
+        proceed.wait()
+        return current.locale + suffix + extra
+
+    with ContextVarsThreadPoolExecutor(max_workers=1) as executor:
+        current.locale = "nb"
+        future = executor.submit(_wait_and_get_locale, "!", extra="?")
+        started.wait()
+        current.locale = "en_GB"
+        proceed.set()
+
+        assert future.result() == "nb!?"
+
+        # changes made by the task don't leak back to the submitter, nor to other tasks
+        assert executor.submit(_increment_counter).result() == 1
+        assert executor.submit(_increment_counter).result() == 1
+        assert current.counter == 0
+
+
+@pytest.mark.parametrize("share_snapshot", [False, True])
+@bind_to_sandbox_context
+def test__map__runs_tasks_in_one_snapshot_of_the_submitter_context(share_snapshot):
+    current.locale = "nb"
+    current.counter = 10
+
+    with ContextVarsThreadPoolExecutor(max_workers=1, share_snapshot=share_snapshot) as executor:
+        results = executor.map(_increment_counter, [1, 1, 1])
+        current.counter = 20
+
+        if share_snapshot:
+            # The only worker thread runs all tasks in its copy of the snapshot.
+            assert list(results) == [11, 12, 13]
+        else:
+            # Each task is isolated in its own copy of the snapshot.
+            assert list(results) == [11, 11, 11]
+
+        # the next batch takes a new snapshot
+        assert list(executor.map(_increment_counter, [1])) == [21]
+
+    assert current.counter == 20
+
+
+def test__map__supports_multiple_iterables__and_propagates_exceptions():
+    with ContextVarsThreadPoolExecutor(max_workers=2, share_snapshot=True) as executor:
+        assert list(executor.map(pow, [2, 3], [3, 2], timeout=10)) == [8, 9]
+
+        results = executor.map(_increment_counter, [1, "x"])
+        assert next(results) == 1
+        with pytest.raises(TypeError):
+            next(results)
+
+
+@bind_to_sandbox_context
+def test__executor__gives_same_results_as__tasks_bound_to_snapshot_context():
+    current.counter = 10
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        expected_submit = executor.submit(bind_to_snapshot_context(_increment_counter, 5)).result()
+        expected_map = list(executor.map(bind_to_snapshot_context(_increment_counter), [1, 2]))
+
+    with ContextVarsThreadPoolExecutor(max_workers=2) as context_executor:
+        assert context_executor.submit(_increment_counter, 5).result() == expected_submit == 15
+        assert list(context_executor.map(_increment_counter, [1, 2])) == expected_map == [11, 12]
+
+
+class ProcessVars(ContextVarsRegistry):
+    user_id: int
+    timezone: str = "UTC"
+    locale: str = "en"
+
+
+class PackedProcessVars(ContextVarsRegistry):
+    _registry_packed = True
+    _registry_track_set_fields = True
+    request_id: int
+    timezone: str = "UTC"
+
+
+process_vars = ProcessVars()
+packed_process_vars = PackedProcessVars()
+
+
+def _get_process_vars(suffix: str = "") -> List[Dict[str, Any]]:
+    result = [dict(process_vars), dict(packed_process_vars)]
+    process_vars.user_id = -1  # this change must not be seen by other tasks
+    return result
+
+
+@bind_to_sandbox_context
+def test__process_pool_executor__transfers_set_variables_of_chosen_registries(monkeypatch):
+    encode_calls: List[Any] = []
+
+    def _encode(registries):
+        encode_calls.append(registries)
+        return encode_context_vars_registries(registries)
+
+    monkeypatch.setattr(contextvars_registry.executors, "encode_context_vars_registries", _encode)
+
+    _set_process_vars_in_current_context()
+    current.counter = 10  # not transferred: the registry is not chosen
+
+    expected = [
+        {"user_id": 42, "locale": "en", "dynamic": "allocated on the fly"},
+        {"request_id": 1},
+    ]
+    with ContextVarsProcessPoolExecutor(
+        max_workers=1, registries=[process_vars, packed_process_vars]
+    ) as executor:
+        assert executor.submit(_get_process_vars).result() == expected
+        assert list(executor.map(_get_process_vars, ["!", "?"])) == [expected, expected]
+        assert len(encode_calls) == 1
+
+        process_vars.locale = "nb"
+        assert executor.submit(_get_process_vars).result()[0]["locale"] == "nb"
+        packed_process_vars.request_id = 2
+        assert executor.submit(_get_process_vars).result()[1]["request_id"] == 2
+        assert len(encode_calls) == 3
+
+        assert executor.submit(_get_counter).result() == 0
+
+
+def _get_counter() -> int:
+    return current.counter
+
+
+def _set_process_vars_in_current_context() -> None:
+    process_vars.user_id = 42
+    del process_vars.timezone
+    process_vars["dynamic"] = "allocated on the fly"
+    packed_process_vars.request_id = 1
+    del packed_process_vars.timezone
+
+
+def test__process_pool_executor__worker_side__decodes_payload_once():
+    # The worker side is tested in this process (in addition to the test above),
+    # since coverage is not measured in worker processes.
+    run_with_payload = contextvars_registry.executors._run_with_registries_payload
+
+    def _encode_in_context(fill_context):
+        context = Context()
+        context.run(fill_context)
+        return context.run(encode_context_vars_registries, [process_vars, packed_process_vars])
+
+    payload = _encode_in_context(_set_process_vars_in_current_context)
+    empty_payload = _encode_in_context(lambda: None)
+
+    result = run_with_payload(payload, _get_process_vars)
+    assert run_with_payload(payload, _get_process_vars) == result
+    assert result == [
+        {"user_id": 42, "locale": "en", "dynamic": "allocated on the fly"},
+        {"request_id": 1},
+    ]
+    assert contextvars_registry.executors._last_decoded_payload[0] is payload
+
+    assert run_with_payload(empty_payload, _get_process_vars) == [
+        {"timezone": "UTC", "locale": "en"},
+        {"timezone": "UTC"},
+    ]
+
+
+@bind_to_sandbox_context
+@pytest.mark.parametrize("cache_payload, expected_user_ids", [(True, [1]), (False, [1, 2])])
+def test__process_pool_executor__payload_cache__misses_in_place_changes(
+    cache_payload, expected_user_ids
+):
+    user_ids = [1]
+    process_vars["user_ids"] = user_ids
+    executor = ContextVarsProcessPoolExecutor(
+        registries=[process_vars], cache_payload=cache_payload
+    )
+
+    executor._get_payload()
+    user_ids.append(2)  # the same object, so the change is not detected by the cache
+    payload = executor._get_payload()
+    executor.shutdown()
+
+    restored = decode_context_vars_registries(payload)[ProcessVars]["user_ids"]
+    assert restored == expected_user_ids
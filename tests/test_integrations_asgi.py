@@ -0,0 +1,108 @@
+import asyncio
+from typing import List
+
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.integrations.asgi import ContextVarsMiddleware, current_scope
+
+
+class CurrentVars(ContextVarsRegistry):
+    user_id: int = 0
+
+
+current = CurrentVars()
+
+
+async def _echo_app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        message = await receive()
+        with pytest.raises(LookupError):
+            current_scope.get()
+        await send({"type": message["type"] + ".complete"})
+        return
+
+    # Interleave with other connections, to check that they don't see changes of each other.
+    current.user_id = scope["user_id"]
+    message = await receive()
+    await asyncio.sleep(0)
+    if message.get("body") == b"fail":
+        raise ValueError(current.user_id)
+    path = current_scope.get()["path"]
+    await send({"type": scope["type"], "path": path, "user_id": current.user_id})
+
+
+def _run_connection(app, scope_type: str, path: str, user_id: int, sent: List[dict], body=b""):
+    async def _receive():
+        await asyncio.sleep(0)
+        return {"type": f"{scope_type}.request", "body": body}
+
+    async def _send(message):
+        sent.append(message)
+
+    return app({"type": scope_type, "path": path, "user_id": user_id}, _receive, _send)
+
+
+def test__asgi_middleware__isolates_concurrent_connections():
+    app = ContextVarsMiddleware(_echo_app)
+    sent: List[dict] = []
+
+    async def _main():
+        current.user_id = 1
+        await asyncio.gather(
+            _run_connection(app, "http", "/a", 2, sent),
+            _run_connection(app, "websocket", "/b", 3, sent),
+            _run_connection(app, "http", "/c", 4, sent),
+        )
+        return current.user_id
+
+    assert asyncio.run(_main()) == 1
+    assert sorted(sent, key=lambda message: message["path"]) == [
+        {"type": "http", "path": "/a", "user_id": 2},
+        {"type": "websocket", "path": "/b", "user_id": 3},
+        {"type": "http", "path": "/c", "user_id": 4},
+    ]
+    assert current.user_id == 0
+
+
+def test__asgi_middleware__propagates_app_errors():
+    app = ContextVarsMiddleware(_echo_app)
+
+    with pytest.raises(ValueError, match="^5$"):
+        asyncio.run(_run_connection(app, "http", "/", 5, [], body=b"fail"))
+
+
+def test__asgi_middleware__passes_lifespan_events_through():
+    app = ContextVarsMiddleware(_echo_app)
+    sent: List[dict] = []
+
+    async def _receive():
+        return {"type": "lifespan.startup"}
+
+    async def _send(message):
+        sent.append(message)
+
+    asyncio.run(app({"type": "lifespan"}, _receive, _send))
+    assert sent == [{"type": "lifespan.startup.complete"}]
+
+
+@pytest.mark.parametrize("wrap_awaitable", [lambda coro: coro, asyncio.ensure_future])
+def test__asgi_middleware__calls_plain_callable_apps_in_connection_context(wrap_awaitable):
+    def _plain_app(scope, receive, send):
+        # Not an `async def` function: this part runs when the app is called.
+        current.user_id = scope["user_id"]
+        message = {"type": scope["type"], "path": current_scope.get()["path"]}
+        return wrap_awaitable(_send_user_id(send, message))
+
+    async def _send_user_id(send, message):
+        await asyncio.sleep(0)
+        await send({**message, "user_id": current.user_id})
+
+    app = ContextVarsMiddleware(_plain_app)
+    sent: List[dict] = []
+
+    async def _main():
+        await _run_connection(app, "http", "/a", 2, sent)
+        return current.user_id
+
+    assert asyncio.run(_main()) == 0
+    assert sent == [{"type": "http", "path": "/a", "user_id": 2}]
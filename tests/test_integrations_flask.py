@@ -0,0 +1,115 @@
+import asyncio
+from typing import List
+
+import flask
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.context_var_descriptor import DeleteStrictContextVarError
+from contextvars_registry.integrations.flask import Flask, RequestGlobals
+
+
+class RequestVars(ContextVarsRegistry):
+    user_id: int = 0
+    path: str
+
+
+g = RequestVars()
+
+
+@bind_to_sandbox_context
+def test__request_globals__reset_registry_on_each_request__even_without_sandbox():
+    # A plain flask.Flask doesn't put requests to sandbox contexts,
+    # so here the extension alone is responsible for cleaning up the registry.
+    app = flask.Flask(__name__)
+    seen_at_request_start: List[dict] = []
+
+    @app.before_request
+    def _registered_before_extension():
+        seen_at_request_start.append(dict(g))
+        g.path = flask.request.path
+
+    request_globals = RequestGlobals(g)
+    request_globals.init_app(app)
+    assert app.extensions["contextvars_registry"] == {RequestVars: request_globals}
+
+    @app.route("/<int:user_id>")
+    def _view(user_id):
+        g.user_id = user_id
+        return f"{g.path} {g.user_id}"
+
+    # leftovers from outside of the request are reset too
+    g.user_id = 1
+    g.path = "/leftover"
+
+    client = app.test_client()
+    assert client.get("/2").text == "/2 2"
+    assert dict(g) == {"user_id": 0}
+    assert client.get("/3").text == "/3 3"
+    assert dict(g) == {"user_id": 0}
+
+    assert seen_at_request_start == [{"user_id": 0}, {"user_id": 0}]
+
+
+def test__flask__async_views__are_isolated_per_request():
+    app = Flask(__name__)
+
+    @app.route("/<int:user_id>")
+    async def _view(user_id):
+        g.user_id = user_id
+        await asyncio.sleep(0)
+        return str(g.user_id)
+
+    client = app.test_client()
+    assert client.get("/1").text == "1"
+    assert client.get("/2").text == "2"
+    assert g.user_id == 0
+
+
+class StrictRequestVars(ContextVarsRegistry):
+    _registry_strict = True
+    locale: str = "en"
+    session_id: str
+
+
+@bind_to_sandbox_context
+def test__request_globals__resets_registry_only_on_teardown_of_request_app_context():
+    app = flask.Flask(__name__)
+    RequestGlobals(g, app)
+    strict_g = StrictRequestVars()
+    RequestGlobals(strict_g, app)
+    assert list(app.extensions["contextvars_registry"]) == [RequestVars, StrictRequestVars]
+
+    @app.route("/<int:user_id>")
+    def _view(user_id):
+        g.user_id = user_id
+        strict_g.locale = "nb"
+        with app.app_context():
+            pass  # a nested app context doesn't wipe the request's registry
+        return f"{g.user_id} {strict_g.locale}"
+
+    client = app.test_client()
+    assert client.get("/2").text == "2 nb"
+    assert dict(g) == {"user_id": 0}
+    assert strict_g.locale == "en"
+
+    # Outside of requests, app contexts don't touch the registry.
+    g.user_id = 3
+    with app.app_context():
+        pass
+    assert g.user_id == 3
+
+
+@bind_to_sandbox_context
+def test__request_globals__cant_reset_strict_vars_without_default():
+    app = flask.Flask(__name__)
+    strict_g = StrictRequestVars()
+    RequestGlobals(strict_g, app)
+
+    @app.route("/")
+    def _view():
+        strict_g.session_id = "abc"
+        return strict_g.session_id
+
+    with pytest.raises(DeleteStrictContextVarError):
+        app.test_client().get("/")
@@ -0,0 +1,65 @@
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.integrations.gevent import Group, Pool, spawn, spawn_later
+
+
+class CurrentVars(ContextVarsRegistry):
+    locale: str = "en"
+
+
+current = CurrentVars()
+
+
+def _get_locale(suffix: str = "") -> str:
+    return current.locale + suffix
+
+
+def _set_locale(locale: str) -> str:
+    current.locale = locale
+    return current.locale
+
+
+@bind_to_sandbox_context
+def test__spawn__runs_greenlet_in_snapshot_taken_at_spawn_time():
+    current.locale = "nb"
+    greenlet = spawn(_get_locale, "!")
+    later_greenlet = spawn_later(0.001, _get_locale, "?")
+    current.locale = "en_GB"
+
+    assert greenlet.get() == "nb!"
+    assert later_greenlet.get() == "nb?"
+
+    # changes made inside the greenlet are not visible outside of it
+    assert spawn(_set_locale, "de").get() == "de"
+    assert current.locale == "en_GB"
+
+
+@pytest.mark.parametrize("group_class", [Group, lambda: Pool(2)])
+@bind_to_sandbox_context
+def test__group__runs_all_spawned_functions_in_snapshot_of_caller_context(group_class):
+    group = group_class()
+    current.locale = "nb"
+
+    assert group.spawn(_get_locale, "!").get() == "nb!"
+    assert group.apply(_get_locale, ("!",)) == "nb!"
+    assert group.apply_async(_get_locale, ("?",)).get() == "nb?"
+    assert group.map(_get_locale, ["!", "?"]) == ["nb!", "nb?"]
+    assert group.map_async(_get_locale, ["!"]).get() == ["nb!"]
+    assert list(group.imap(_get_locale, ["!", "?"])) == ["nb!", "nb?"]
+    assert sorted(group.imap_unordered(_get_locale, ["!", "?"])) == ["nb!", "nb?"]
+
+    assert group.map(_set_locale, ["de", "fr"]) == ["de", "fr"]
+    assert current.locale == "nb"
+
+
+@bind_to_sandbox_context
+def test__full_pool__apply_async__runs_function_in_snapshot_of_caller_context():
+    pool = Pool(1)
+    current.locale = "nb"
+
+    # When the pool is full, apply_async() goes through an intermediate plain greenlet.
+    blocker = pool.spawn(_get_locale)
+    greenlet = pool.apply_async(_get_locale, ("!",))
+    assert blocker.get() == "nb"
+    assert greenlet.get() == "nb!"
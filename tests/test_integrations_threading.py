@@ -0,0 +1,107 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import Context
+from typing import List
+
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.integrations.threading import Thread, Timer, patch_thread_start
+
+
+class CurrentVars(ContextVarsRegistry):
+    locale: str = "en"
+
+
+current = CurrentVars()
+
+
+@bind_to_sandbox_context
+def test__thread__captures_context_at_start_time():
+    seen: List[str] = []
+
+    def _set_and_remember_locale(locale):
+        seen.append(current.locale)
+        current.locale = locale
+
+    current.locale = "nb"
+    thread = Thread(target=_set_and_remember_locale, args=("de",))
+    timer = Timer(0.001, _set_and_remember_locale, args=("fr",))
+    current.locale = "en_GB"
+    thread.start()
+    timer.start()
+    thread.join()
+    timer.join()
+
+    assert seen == ["en_GB", "en_GB"]
+    assert current.locale == "en_GB"
+    assert thread.context is not None
+    assert thread.context.run(getattr, current, "locale") == "de"
+
+
+class _ThirdPartyThread(threading.Thread):
+    def __init__(self, seen: List[str]) -> None:
+        super().__init__()
+        self.seen = seen
+
+    def run(self) -> None:
+        self.seen.append(current.locale)
+
+
+@bind_to_sandbox_context
+def test__patch_thread_start__is_reversible():
+    seen: List[str] = []
+    current.locale = "nb"
+
+    unpatch_thread_start = patch_thread_start()
+    try:
+        for thread in [_ThirdPartyThread(seen), Thread(target=lambda: seen.append("own"))]:
+            thread.start()
+            thread.join()
+    finally:
+        unpatch_thread_start()
+
+    thread = _ThirdPartyThread(seen)
+    thread.start()
+    thread.join()
+
+    assert seen == ["nb", "own", "en"]
+
+
+def test__patch_thread_start__must_be_reverted_in_reverse_order():
+    unpatch_first = patch_thread_start()
+    unpatch_second = patch_thread_start()
+
+    with pytest.raises(RuntimeError):
+        unpatch_first()
+
+    unpatch_second()
+    unpatch_first()
+
+
+def _get_locale() -> str:
+    return current.locale
+
+
+def _submit_in_request(executor: ThreadPoolExecutor, locale: str) -> str:
+    current.locale = locale
+    return executor.submit(_get_locale).result()
+
+
+@pytest.mark.parametrize(
+    "skip_thread_pool_workers, expected_locales", [(True, ["en", "en"]), (False, ["nb", "nb"])]
+)
+def test__patch_thread_start__skips_thread_pool_workers(skip_thread_pool_workers, expected_locales):
+    unpatch_thread_start = patch_thread_start(skip_thread_pool_workers=skip_thread_pool_workers)
+    try:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # The 1st request starts the worker thread, and the 2nd one comes from a fresh context.
+            locales = [
+                Context().run(_submit_in_request, executor, "nb"),
+                Context().run(executor.submit(_get_locale).result),
+            ]
+    finally:
+        unpatch_thread_start()
+
+    # Without skipping, the pooled worker leaks the context of the request that started it.
+    assert locales == expected_locales
@@ -0,0 +1,112 @@
+from typing import Any, List
+
+import contextvars_registry.integrations.wsgi
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.integrations.wsgi import (
+    ContextVarsMiddleware,
+    current_environ,
+    get_parsed_environ,
+)
+from werkzeug.test import create_environ
+
+
+class CurrentVars(ContextVarsRegistry):
+    user_id: int = 0
+
+
+current = CurrentVars()
+
+
+def _start_response(status, headers):
+    pass
+
+
+def test__streaming_middleware__runs_whole_response_iteration_in_request_context():
+    log: List[str] = []
+
+    def _streaming_app(environ, start_response):
+        current.user_id = 42
+        start_response("200 OK", [("Content-type", "text/plain; charset=utf-8")])
+
+        def _generate_body():
+            try:
+                for row in range(3):
+                    yield f"{row},{current.user_id},{current_environ.get()['PATH_INFO']}\n"
+            finally:
+                log.append(f"closed with user_id={current.user_id}")
+
+        return _generate_body()
+
+    app = ContextVarsMiddleware(_streaming_app, streaming=True)
+
+    response: Any = app(create_environ("/export.csv"), _start_response)
+    assert next(response) == "0,42,/export.csv\n"
+    assert list(response) == ["1,42,/export.csv\n", "2,42,/export.csv\n"]
+    response.close()
+
+    # close() works even when the body is not consumed
+    response = app(create_environ("/export.csv"), _start_response)
+    assert next(response) == "0,42,/export.csv\n"
+    response.close()
+
+    assert log == ["closed with user_id=42", "closed with user_id=42"]
+    assert current.user_id == 0
+
+
+def test__streaming_middleware__supports_responses_without_close_method():
+    def _app(environ, start_response):
+        start_response("200 OK", [("Content-type", "text/plain; charset=utf-8")])
+        return [b"OK"]
+
+    response: Any = ContextVarsMiddleware(_app, streaming=True)(create_environ(), _start_response)
+    assert list(response) == [b"OK"]
+    response.close()
+
+
+def test__get_parsed_environ__parses_each_part_once_per_request(monkeypatch):
+    parse_qs_calls: List[str] = []
+
+    def _parse_qs(query_string, **kwargs):
+        parse_qs_calls.append(query_string)
+        return {"query_string": [query_string]}
+
+    monkeypatch.setattr(contextvars_registry.integrations.wsgi, "parse_qs", _parse_qs)
+
+    def _app(environ, start_response):
+        parsed = get_parsed_environ()
+        assert get_parsed_environ().query is parsed.query
+
+        # A nested request (with another environ) in the same context gets its own object.
+        nested_environ = create_environ("/nested?x=1")
+        current_environ.set(nested_environ)
+        assert get_parsed_environ().query == {"query_string": ["x=1"]}
+        assert get_parsed_environ().environ is nested_environ
+        assert get_parsed_environ() is not parsed
+
+        return [parsed.headers, parsed.query, parsed.cookies]
+
+    environ = create_environ(
+        "/?page=2",
+        method="POST",
+        data=b"{}",
+        content_type="application/json",
+        headers={"Cookie": "a=1; b=2", "X-Request-Id": "42"},
+    )
+    response: Any = ContextVarsMiddleware(_app)(environ, _start_response)
+    headers, query, cookies = response
+
+    assert headers == {
+        "host": "localhost",
+        "content-type": "application/json",
+        "content-length": "2",
+        "cookie": "a=1; b=2",
+        "x-request-id": "42",
+    }
+    assert query == {"query_string": ["page=2"]}
+    assert cookies == {"a": "1", "b": "2"}
+    assert parse_qs_calls == ["page=2", "x=1"]
+
+    # the parsed environ doesn't outlive the request
+    with pytest.raises(LookupError):
+        get_parsed_environ()
@@ -0,0 +1,142 @@
+from contextvars import Context, ContextVar
+from typing import Any, Dict
+
+import pytest
+from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.context_var_descriptor import (
+    DELETED,
+    RESET_TO_DEFAULT,
+    DeleteStrictContextVarError,
+)
+from contextvars_registry.packed_context_var_descriptor import (
+    PackedContextVarDescriptor,
+    PackedRecord,
+)
+
+_MISSING = object()
+
+
+@pytest.mark.parametrize(
+    "descriptor_kwargs, default_value",
+    [
+        ({}, _MISSING),
+        ({"default": "UTC"}, "UTC"),
+        ({"deferred_default": lambda: "UTC"}, "UTC"),
+    ],
+)
+@bind_to_sandbox_context
+def test__packed_descriptor__behaves_like__regular_descriptor(descriptor_kwargs, default_value):
+    packed_var: ContextVar[PackedRecord] = ContextVar("packed_var", default=())
+    locale_var = PackedContextVarDescriptor(packed_var, slot=0, name="locale_var", default="en")
+    timezone_var = PackedContextVarDescriptor(
+        packed_var, slot=1, name="timezone_var", **descriptor_kwargs
+    )
+
+    def _get():
+        try:
+            return timezone_var.get()
+        except LookupError:
+            return _MISSING
+
+    has_default = "default" in descriptor_kwargs
+    has_deferred_default = "deferred_default" in descriptor_kwargs
+
+    # initial state: not set (the record is too short to have the slot)
+    assert packed_var.get() == ()
+    assert timezone_var.get_raw() is RESET_TO_DEFAULT
+    assert timezone_var.get_raw(_MISSING) is _MISSING
+    assert timezone_var.is_set() is False
+    assert timezone_var.is_set(on_default=True) is has_default
+    assert timezone_var.is_set(on_deferred_default=True) is has_deferred_default
+    assert timezone_var.is_gettable() is (default_value is not _MISSING)
+    assert timezone_var.get("GMT") == "GMT"
+    assert _get() == default_value
+
+    # set
+    token: Any = timezone_var.set("Europe/London")  # PackedToken, not contextvars.Token
+    assert _get() == timezone_var.get("GMT") == timezone_var.get_raw() == "Europe/London"
+    assert timezone_var.is_gettable() is True
+    assert timezone_var.is_set() is True
+
+    # other slots are not affected
+    locale_var.set("en_GB")
+    assert packed_var.get() == ("en_GB", "Europe/London")
+
+    # reset to default
+    timezone_var.reset_to_default()
+    assert timezone_var.get("GMT") == "GMT"
+    assert _get() == default_value
+
+    # deleted
+    timezone_var.delete()
+    assert _get() is _MISSING
+    assert timezone_var.get_raw() is DELETED
+    assert timezone_var.get("GMT") == "GMT"
+    assert timezone_var.is_gettable() is False
+    assert timezone_var.is_set(on_default=True, on_deferred_default=True) is False
+
+    # reset via token restores the value that was there before the .set() call
+    timezone_var.reset(token)
+    assert _get() == default_value
+    assert locale_var.get() == "en_GB"
+
+
+def test__packed_descriptor__deferred_default__is_called_once_per_context():
+    packed_var: ContextVar[PackedRecord] = ContextVar("packed_var", default=())
+    settings_var: PackedContextVarDescriptor[Dict[str, str]] = PackedContextVarDescriptor(
+        packed_var, slot=0, name="settings_var", deferred_default=dict
+    )
+
+    def _get_settings_twice():
+        settings_var.get()["key"] = "value"
+        return settings_var.get()
+
+    assert Context().run(_get_settings_twice) == {"key": "value"}
+    assert Context().run(settings_var.get) == {}
+
+
+def test__packed_descriptor__deferred_default_scope__is_respected():
+    packed_var: ContextVar[PackedRecord] = ContextVar("packed_var", default=())
+    settings_var: PackedContextVarDescriptor[Dict[str, str]] = PackedContextVarDescriptor(
+        packed_var,
+        slot=0,
+        name="settings_var",
+        deferred_default=dict,
+        deferred_default_scope="process",
+    )
+
+    settings = Context().run(settings_var.get)
+    assert Context().run(settings_var.get) is settings
+
+
+def test__packed_descriptor__token__resets_only_its_own_slot():
+    packed_var: ContextVar[PackedRecord] = ContextVar("packed_var", default=())
+    locale_var: PackedContextVarDescriptor[str] = PackedContextVarDescriptor(
+        packed_var, slot=0, name="locale_var"
+    )
+    timezone_var: PackedContextVarDescriptor[str] = PackedContextVarDescriptor(
+        packed_var, slot=1, name="timezone_var"
+    )
+
+    token = locale_var.set("en")
+    assert repr(token) == "<PackedToken var=<PackedContextVarDescriptor name='locale_var'>>"
+    timezone_var.set("UTC")
+    locale_var.reset(token)
+
+    assert packed_var.get() == (RESET_TO_DEFAULT, "UTC")
+
+    with pytest.raises(AssertionError):
+        timezone_var.reset(token)
+
+
+def test__strict_packed_descriptor__cannot_be_deleted():
+    packed_var: ContextVar[PackedRecord] = ContextVar("packed_var", default=())
+    timezone_var = PackedContextVarDescriptor(
+        packed_var, slot=0, name="timezone_var", default="UTC", strict=True
+    )
+
+    with pytest.raises(DeleteStrictContextVarError):
+        timezone_var.delete()
+    with pytest.raises(DeleteStrictContextVarError):
+        timezone_var.reset_to_default()
+    assert timezone_var.get() == "UTC"
@@ -0,0 +1,119 @@
+import asyncio
+import queue
+from contextvars import Context
+from threading import Barrier
+
+import pytest
+from contextvars_registry import ContextVarsRegistry
+from contextvars_registry.context_management import bind_to_sandbox_context
+from contextvars_registry.executors import ContextVarsThreadPoolExecutor
+from contextvars_registry.queues import AsyncContextQueue, ContextQueue
+
+
+class CurrentVars(ContextVarsRegistry):
+    request_id: int = 0
+
+
+current = CurrentVars()
+
+
+def _get_request_id(item: str) -> str:
+    result = f"{item}:{current.request_id}"
+    current.request_id = -1  # this change must not be seen by handlers of other items
+    return result
+
+
+@bind_to_sandbox_context
+def test__context_queue__captures_context_on_put():
+    items = ContextQueue()
+
+    current.request_id = 1
+    items.put("a")
+    items.put_nowait("b")
+    current.request_id = 2
+    items.put("c")
+
+    item_a, context_a = items.get_with_context()
+    item_b, context_b = items.get_with_context()
+    item_c, context_c = items.get_with_context(block=False)
+    assert (item_a, item_b, item_c) == ("a", "b", "c")
+
+    assert context_a.run(getattr, current, "request_id") == 1
+    assert context_b.run(getattr, current, "request_id") == 1
+    assert context_c.run(getattr, current, "request_id") == 2
+
+    # A value replaced with an equal (but not the same) object is seen by the consumer.
+    first_ids, second_ids = [1], [1]
+    current["request_ids"] = first_ids
+    items.put("d")
+    current["request_ids"] = second_ids
+    items.put("e")
+    assert items.get_with_context()[1].run(getattr, current, "request_ids") is first_ids
+    assert items.get_with_context()[1].run(getattr, current, "request_ids") is second_ids
+
+    with pytest.raises(queue.Empty):
+        items.get_with_context(block=False)
+
+
+@bind_to_sandbox_context
+def test__context_queue__get__returns_bare_items():
+    items = ContextQueue()
+    items.put("a")
+    items.put("b")
+    assert items.get() == "a"
+    assert items.get_nowait() == "b"
+    with pytest.raises(queue.Empty):
+        items.get(timeout=0.001)
+
+
+def test__context_queue__handle_next__runs_handlers_in_copies_of_shared_context():
+    items = ContextQueue()
+    started = Barrier(2)
+
+    def _produce(request_id: int) -> None:
+        current.request_id = request_id
+        items.put("a")
+        items.put("b")
+
+    def _consume() -> str:
+        def _handle(item: str) -> str:
+            started.wait()  # both consumers are inside of the same shared context at once
+            return _get_request_id(item)
+
+        return items.handle_next(_handle, timeout=10)
+
+    Context().run(_produce, 42)
+    with ContextVarsThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(_consume), executor.submit(_consume)]
+        assert sorted(future.result() for future in futures) == ["a:42", "b:42"]
+
+    assert current.request_id == 0
+
+
+def test__async_context_queue__captures_context_on_put():
+    async def _produce(items: AsyncContextQueue, request_id: int) -> None:
+        current.request_id = request_id
+        await items.put("a")
+        items.put_nowait("b")
+
+    async def _handle(item: str) -> str:
+        await asyncio.sleep(0)
+        return _get_request_id(item)
+
+    async def _main():
+        items = AsyncContextQueue()
+        await asyncio.gather(_produce(items, 1), _produce(items, 2))
+
+        item_a, context_a = await items.get_with_context()
+        item_b, context_b = items.get_nowait_with_context()
+        assert (item_a, item_b) == ("a", "b")
+        assert context_a.run(getattr, current, "request_id") == 1
+        assert context_b.run(getattr, current, "request_id") == 1
+
+        results = [await items.handle_next(_handle), await items.handle_next(_handle)]
+        assert current.request_id == 0
+
+        items.put_nowait("c")
+        return results, await items.get()
+
+    assert asyncio.run(_main()) == (["a:2", "b:2"], "c")
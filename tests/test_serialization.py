@@ -0,0 +1,184 @@
+import pickle
+import sys
+from contextvars import Context
+from typing import Iterator
+
+import contextvars_registry.serialization
+import pytest
+from contextvars_registry import ContextVarDescriptor, ContextVarsRegistry
+from contextvars_registry.context_management import bind_to_empty_context
+from contextvars_registry.context_var_descriptor import DELETED, RESET_TO_DEFAULT
+from contextvars_registry.serialization import (
+    EncodedDataError,
+    RegistrySchemaMismatchError,
+    decode_context_vars_registries,
+    encode_context_vars_registries,
+    restore_encoded_context_vars_registries,
+)
+
+
+class CurrentVars(ContextVarsRegistry):
+    user_id: int
+    timezone: str = "UTC"
+    locale_with_a_long_name: str = "en"
+
+
+class PackedVars(ContextVarsRegistry):
+    _registry_packed = True
+    request_id: int = 0
+    timezone: str = "UTC"
+
+
+class PackedManualVars(ContextVarsRegistry):
+    _registry_packed = True
+    request_id: int = 0
+    session_id = ContextVarDescriptor[str]()  # manually created (not packed), and has no default
+
+
+class EmptyVars(ContextVarsRegistry):
+    pass
+
+
+class NotRegistry:
+    pass
+
+
+current = CurrentVars()
+packed = PackedVars()
+
+
+@pytest.fixture(autouse=True)
+def _clear_resolved_classes_cache() -> Iterator[None]:
+    # pylint: disable=protected-access
+    yield
+    contextvars_registry.serialization._resolve_registry_class.cache_clear()
+
+
+def _fill_registries() -> None:
+    current.user_id = 42
+    del current.timezone
+    current["dynamic_var"] = "allocated on the fly"
+    packed.request_id = 1
+    del packed.timezone
+
+
+@bind_to_empty_context
+def test__encode__and__decode__round_trip():
+    _fill_registries()
+    data = encode_context_vars_registries([current, packed])
+
+    assert decode_context_vars_registries(data) == {
+        CurrentVars: {"user_id": 42, "timezone": DELETED, "dynamic_var": "allocated on the fly"},
+        PackedVars: {"request_id": 1, "timezone": DELETED},
+    }
+
+    # Declared variables are encoded as numeric IDs (not names).
+    assert b"locale_with_a_long_name" not in data
+    assert b"user_id" not in data
+    assert b"dynamic_var" in data
+
+    # Unset variables are skipped, unless requested explicitly.
+    assert decode_context_vars_registries(
+        encode_context_vars_registries([current], include_unset=True)
+    ) == {
+        CurrentVars: {
+            "user_id": 42,
+            "timezone": DELETED,
+            "locale_with_a_long_name": RESET_TO_DEFAULT,
+            "dynamic_var": "allocated on the fly",
+        }
+    }
+
+
+@pytest.mark.parametrize("buffer_type", [bytes, bytearray, memoryview])
+def test__restore_encoded__sets_variables_in_current_context(buffer_type):
+    context = Context()
+    context.run(_fill_registries)
+    data = context.run(encode_context_vars_registries, [current, packed])
+
+    context = Context()
+    context.run(restore_encoded_context_vars_registries, buffer_type(data))
+    assert context.run(dict, current) == {
+        "user_id": 42,
+        "locale_with_a_long_name": "en",
+        "dynamic_var": "allocated on the fly",
+    }
+    assert context.run(dict, packed) == {"request_id": 1}
+
+    # An empty payload changes nothing.
+    assert context.run(encode_context_vars_registries, []) == b"CV\x01\x00\x00" + pickle.dumps(
+        (), protocol=pickle.HIGHEST_PROTOCOL
+    )
+    context.run(restore_encoded_context_vars_registries, encode_context_vars_registries([]))
+    assert context.run(dict, packed) == {"request_id": 1}
+
+
+def test__encode__packed_registry_with_manually_created_var_without_default():
+    packed_manual = PackedManualVars()
+
+    context = Context()
+    data = context.run(encode_context_vars_registries, [packed_manual])
+    assert decode_context_vars_registries(data) == {PackedManualVars: {}}
+
+    context.run(packed_manual.__setitem__, "session_id", "abc")
+    data = context.run(encode_context_vars_registries, [packed_manual], include_unset=True)
+    assert decode_context_vars_registries(data) == {
+        PackedManualVars: {"request_id": RESET_TO_DEFAULT, "session_id": "abc"}
+    }
+
+    context = Context()
+    context.run(restore_encoded_context_vars_registries, data)
+    assert context.run(dict, packed_manual) == {"request_id": 0, "session_id": "abc"}
+
+
+def test__restore_encoded__allocates_dynamic_variables_missing_in_this_process(monkeypatch):
+    def _allocate_vars_and_encode() -> bytes:
+        registry = EmptyVars()
+        registry["allocated_var"] = 1
+        registry["deleted_var"] = 2
+        del registry["deleted_var"]
+        return encode_context_vars_registries([registry])
+
+    data = Context().run(_allocate_vars_and_encode)
+
+    # Simulate another process, where the class is fresh (variables are not allocated yet).
+    fresh_class = type("EmptyVars", (ContextVarsRegistry,), {"__module__": __name__})
+    monkeypatch.setattr(sys.modules[__name__], "EmptyVars", fresh_class)
+
+    context = Context()
+    context.run(restore_encoded_context_vars_registries, data)
+    assert context.run(dict, fresh_class()) == {"allocated_var": 1}
+
+
+def test__decode__detects_schema_mismatch(monkeypatch):
+    data = Context().run(encode_context_vars_registries, [current])
+
+    changed_class = type(
+        "CurrentVars", (ContextVarsRegistry,), {"__module__": __name__, "__annotations__": {}}
+    )
+    monkeypatch.setattr(sys.modules[__name__], "CurrentVars", changed_class)
+
+    with pytest.raises(RegistrySchemaMismatchError, match=f"{__name__}:CurrentVars"):
+        decode_context_vars_registries(data)
+
+
+def test__decode__rejects_malformed_data():
+    data = Context().run(encode_context_vars_registries, [current, packed])
+
+    with pytest.raises(EncodedDataError, match="unknown data format"):
+        decode_context_vars_registries(b"XX" + data[2:])
+
+    with pytest.raises(EncodedDataError, match="unsupported format version: 2"):
+        decode_context_vars_registries(data[:2] + b"\x02" + data[3:])
+
+    for truncated_data in [b"", data[:10], data[:-1]]:
+        with pytest.raises(EncodedDataError, match="truncated or corrupted"):
+            decode_context_vars_registries(truncated_data)
+
+    registry_path = f"{__name__}:CurrentVars".encode()
+    with pytest.raises(EncodedDataError, match="can't import registry class"):
+        decode_context_vars_registries(data.replace(registry_path, registry_path.upper()))
+
+    not_registry_path = f"{__name__}:NotRegistry".encode()
+    with pytest.raises(EncodedDataError, match="is not a ContextVarsRegistry subclass"):
+        decode_context_vars_registries(data.replace(registry_path, not_registry_path))